@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BaseConfig(AppConfig):
     name = "base"
+
+    def ready(self):
+        from base.core.distance_algorithms import (
+            load_distance_table,
+            set_distance_table,
+        )
+
+        if settings.DISTANCE_TABLE_PATH:
+            set_distance_table(load_distance_table(settings.DISTANCE_TABLE_PATH))
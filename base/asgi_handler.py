@@ -0,0 +1,90 @@
+import asyncio
+
+from asgiref.sync import ThreadSensitiveContext, async_to_sync
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import Resolver404, resolve
+from rest_framework.decorators import api_view, renderer_classes, throttle_classes
+from rest_framework.response import Response
+
+from base import async_views
+from base.renderers import COLUMNAR_RENDERER_CLASSES
+from base.urls import (
+    analyze_view_name,
+    batch_results_view_name,
+    register_view_name,
+    results_view_name,
+)
+
+ASYNC_VIEWS = {
+    results_view_name: async_views.results_view,
+    batch_results_view_name: async_views.batch_results_view,
+    analyze_view_name: async_views.analyze_meeting_view,
+    register_view_name: async_views.register_view,
+}
+
+
+# the throttles were checked by the async view
+@api_view(["POST"])
+@renderer_classes(COLUMNAR_RENDERER_CLASSES)
+@throttle_classes([])
+def async_view_result_view(request):
+    result = request._request.async_view_result
+    if isinstance(result, Exception):
+        raise result
+
+    data, status_code = result
+    return Response(data, status=status_code)
+
+
+class AsyncViewsASGIHandler(ASGIHandler):
+
+    """
+    Django 3.0 has no async views, so the POST requests of ASYNC_VIEWS go
+    through the middleware chain like the rest of the requests and the end
+    of the chain waits for the async view (see _get_response)
+
+    Each request has its own sync thread, the middleware and the database
+    calls of the async view run there while the NumPy work and the calls to
+    the university API run in the pools of base.async_views. At most
+    settings.ASYNC_VIEWS_MAX_REQUESTS requests hold a thread at once
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        # created in the event loop of the server by the first request
+        self.request_slots = None
+
+    async def __call__(self, scope, receive, send):
+        if self.request_slots is None:
+            self.request_slots = asyncio.Semaphore(settings.ASYNC_VIEWS_MAX_REQUESTS)
+
+        async with self.request_slots:
+            # otherwise a request waiting for its async view holds the only thread
+            async with ThreadSensitiveContext():
+                await super().__call__(scope, receive, send)
+
+    def _get_response(self, request):
+        async_view = self.get_async_view(request)
+        if async_view is None:
+            return super()._get_response(request)
+
+        try:
+            request.async_view_result = async_to_sync(async_view)(request)
+        except Exception as error:
+            request.async_view_result = error
+
+        return async_view_result_view(request).render()
+
+    @staticmethod
+    def get_async_view(request):
+        if request.method != "POST":
+            return None
+
+        try:
+            match = resolve(request.path_info, urlconf=settings.ROOT_URLCONF)
+        except Resolver404:
+            return None
+
+        return ASYNC_VIEWS.get(match.url_name)
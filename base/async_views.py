@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.views import APIView
+
+from base.renderers import COLUMNAR_RENDERER_CLASSES, ColumnarJSONRenderer
+from base.serializers import (
+    BatchResultsSerializer,
+    MeetingSerializer,
+    RegisterSerializer,
+    UsersSerializer,
+)
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name):
+
+    """
+    Return the bounded thread pool settings.ASYNC_VIEWS_WORKERS[name], the
+    NumPy work and the calls to the university API use different pools so
+    a slow upstream doesn't delay the results
+    """
+
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_VIEWS_WORKERS[name],
+                thread_name_prefix=f"async-views-{name}",
+            )
+        return _executors[name]
+
+
+async def run_in_executor(name, func, *args):
+    loop = asyncio.get_running_loop()
+    # the context keeps the timings of the request (see base.timing)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(name), functools.partial(context.run, func, *args)
+    )
+
+
+# the database is used from the thread of the request (see base.asgi_handler)
+database_sync_to_async = functools.partial(sync_to_async, thread_sensitive=True)
+
+
+def get_request_data(request):
+
+    """
+    Parse the request and check the throttles the same way the DRF views do,
+    returns the data and whether the columnar layout was requested
+    """
+
+    view = APIView()
+    view.renderer_classes = COLUMNAR_RENDERER_CLASSES
+    view.format_kwarg = None
+    drf_request = view.initialize_request(request)
+    view.check_throttles(drf_request)
+    renderer, _ = view.perform_content_negotiation(drf_request)
+    return drf_request.data, isinstance(renderer, ColumnarJSONRenderer)
+
+
+async def results_view(request):
+
+    """
+    Async version of views.results_view, returns the data and the status
+    """
+
+    data, columnar = await database_sync_to_async(get_request_data)(request)
+    users_serializers = UsersSerializer(data=data, context={"columnar": columnar})
+
+    if not await database_sync_to_async(users_serializers.is_valid)():
+        return users_serializers.errors, status.HTTP_400_BAD_REQUEST
+
+    results = await run_in_executor("compute", users_serializers.save)
+    return results, status.HTTP_200_OK
+
+
+async def batch_results_view(request):
+
+    """
+    Async version of views.batch_results_view, returns the data and the status
+    """
+
+    data, columnar = await database_sync_to_async(get_request_data)(request)
+    batch_results_serializer = BatchResultsSerializer(
+        data=data, context={"columnar": columnar}
+    )
+
+    if not await database_sync_to_async(batch_results_serializer.is_valid)():
+        return batch_results_serializer.errors, status.HTTP_400_BAD_REQUEST
+
+    results = await run_in_executor("compute", batch_results_serializer.save)
+    return results, status.HTTP_200_OK
+
+
+async def analyze_meeting_view(request):
+
+    """
+    Async version of views.analyze_meeting_view, returns the data and the status
+    """
+
+    data, columnar = await database_sync_to_async(get_request_data)(request)
+    meeting_serializer = MeetingSerializer(data=data, context={"columnar": columnar})
+
+    # the schedules are counted while the usernames are resolved
+    if not await database_sync_to_async(meeting_serializer.is_valid)():
+        return meeting_serializer.errors, status.HTTP_400_BAD_REQUEST
+
+    results = await run_in_executor("compute", meeting_serializer.save)
+    return results, status.HTTP_200_OK
+
+
+async def register_view(request):
+
+    """
+    Async version of views.register_view, returns the data and the status
+    """
+
+    data, _ = await database_sync_to_async(get_request_data)(request)
+    register_serializer = RegisterSerializer(data=data)
+
+    # the validation waits for the university API
+    if not await run_in_executor("upstream", register_serializer.is_valid):
+        return register_serializer.errors, status.HTTP_400_BAD_REQUEST
+
+    user_data = await database_sync_to_async(register_serializer.save)()
+    return user_data, status.HTTP_201_CREATED
+
+
+@receiver(setting_changed)
+def reset_executors(setting, **kwargs):
+    if setting == "ASYNC_VIEWS_WORKERS":
+        with _executors_lock:
+            for executor in _executors.values():
+                executor.shutdown(wait=False)
+            _executors.clear()
@@ -0,0 +1,185 @@
+import itertools
+import time
+import tracemalloc
+
+from base.core.analyze_meetings import get_schedule_meeting_data
+from base.core.distance_algorithms import (
+    from_string_to_bit_matrix,
+    get_distance_matrices_from_string_schedules,
+    get_distance_matrix_from_string_schedule,
+)
+from base.core.finder import (
+    DistanceMatrixComputer,
+    GapFinder,
+    StreamingDistanceMatrixComputer,
+)
+from base.core.gap_filters import (
+    filter_by_days,
+    limit_results,
+    sort_results,
+    sort_results_by_quality,
+)
+from base.core.schedule_generator import generate_string_schedules
+
+COHORT_SIZES = (2, 30, 1_000, 10_000, 100_000)
+
+
+class Benchmark:
+
+    """
+    A function to measure, setup prepares fresh arguments for each call
+    because some functions of the core modify their input
+
+    """
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda string_schedules: string_schedules)
+
+    def measure(self, string_schedules, repeat=3):
+        elapsed_times = []
+        for _ in range(repeat):
+            state = self.setup(string_schedules)
+            start = time.perf_counter()
+            self.run(state)
+            elapsed_times.append(time.perf_counter() - start)
+
+        # memory is measured apart, tracemalloc slows down the calls
+        state = self.setup(string_schedules)
+        tracemalloc.start()
+        try:
+            self.run(state)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "benchmark": self.name,
+            "cohort_size": len(string_schedules),
+            "seconds_per_call": min(elapsed_times),
+            "peak_memory": peak_memory,
+        }
+
+
+def get_distance_matrix_computer(string_schedules, options=None):
+    return DistanceMatrixComputer(
+        get_distance_matrices_from_string_schedules(string_schedules),
+        options=options,
+    )
+
+
+def compute_in_chunks(string_schedules, chunk_size=1_000):
+    streaming_computer = StreamingDistanceMatrixComputer(options={"compute_sd": True})
+    streaming_computer.add_chunks(
+        get_distance_matrices_from_string_schedules(
+            string_schedules[start : start + chunk_size]
+        )
+        for start in range(0, len(string_schedules), chunk_size)
+    )
+    streaming_computer.compute()
+
+
+def get_computed_gap_finder(string_schedules):
+    return GapFinder(get_distance_matrix_computer(string_schedules))
+
+
+def get_gap_results(string_schedules):
+    gap_finder = get_computed_gap_finder(string_schedules)
+    gap_finder.find_gaps()
+    return gap_finder.get_results()
+
+
+def get_matrix_computer_benchmarks():
+    benchmarks = []
+    for compute_sd, no_classes_day, ignore_weekend in itertools.product(
+        (False, True), repeat=3
+    ):
+        options = {
+            "compute_sd": compute_sd,
+            "no_classes_day": no_classes_day,
+            "ignore_weekend": ignore_weekend,
+        }
+        name = "DistanceMatrixComputer.compute[{}]".format(
+            ",".join(f"{key}={value}" for key, value in options.items())
+        )
+        benchmarks.append(
+            Benchmark(
+                name,
+                run=lambda computer: computer.compute(),
+                setup=lambda string_schedules, options=options: (
+                    get_distance_matrix_computer(string_schedules, options)
+                ),
+            )
+        )
+    return benchmarks
+
+
+def get_benchmarks():
+    return [
+        Benchmark(
+            "from_string_to_bit_matrix",
+            run=lambda string_schedules: list(
+                map(from_string_to_bit_matrix, string_schedules)
+            ),
+        ),
+        Benchmark(
+            "get_distance_matrix_from_string_schedule",
+            run=lambda string_schedules: list(
+                map(get_distance_matrix_from_string_schedule, string_schedules)
+            ),
+        ),
+        Benchmark(
+            "get_distance_matrices_from_string_schedules",
+            run=get_distance_matrices_from_string_schedules,
+        ),
+        *get_matrix_computer_benchmarks(),
+        Benchmark(
+            "StreamingDistanceMatrixComputer.compute",
+            run=compute_in_chunks,
+        ),
+        Benchmark(
+            "GapFinder.find_gaps",
+            run=lambda gap_finder: gap_finder.find_gaps(),
+            setup=get_computed_gap_finder,
+        ),
+        Benchmark(
+            "gap_filters.sort_results",
+            run=lambda results: sort_results(results, with_sd=False),
+            setup=get_gap_results,
+        ),
+        Benchmark(
+            "gap_filters.sort_results_by_quality",
+            run=sort_results_by_quality,
+            setup=get_gap_results,
+        ),
+        Benchmark(
+            "gap_filters.limit_results",
+            run=lambda results: limit_results(results, limit=5),
+            setup=get_gap_results,
+        ),
+        Benchmark(
+            "gap_filters.filter_by_days",
+            run=lambda results: filter_by_days(results, [0, 1]),
+            setup=get_gap_results,
+        ),
+        Benchmark("get_schedule_meeting_data", run=get_schedule_meeting_data),
+    ]
+
+
+def run_benchmarks(cohort_sizes=COHORT_SIZES, repeat=3, name_filter=None):
+
+    """
+    Measure every benchmark whose name contains name_filter at each cohort
+    size, generates one dict per benchmark and cohort size
+    """
+
+    benchmarks = [
+        benchmark
+        for benchmark in get_benchmarks()
+        if not name_filter or name_filter in benchmark.name
+    ]
+    for cohort_size in cohort_sizes:
+        string_schedules = generate_string_schedules(cohort_size)
+        for benchmark in benchmarks:
+            yield benchmark.measure(string_schedules, repeat=repeat)
@@ -1,55 +1,104 @@
 import numpy as np
 
-from base.core.constants import DAYS_PER_WEEK
-from base.core.distance_algorithms import from_string_to_bit_matrix
+from base.core.constants import UNINORTE_SCHEDULE_SIZE, WORKING_DAYS_PER_WEEK
+from base.core.distance_algorithms import from_schedules_to_bit_tensor
 
 
-def is_needed_to_ignore_hour(filter_schedule, i, j):
+def get_sum_meeting_matrix(string_schedules):
+    bit_tensor = from_schedules_to_bit_tensor(string_schedules)
+    return np.sum(bit_tensor, axis=0)
+
+
+def get_filter_mask(filter_schedule=None):
+
+    """
+    (14, 7) boolean mask of the hours to show, the weekend and the class
+    hours of the filter schedule are discarded
+    """
+
+    filter_mask = np.ones(UNINORTE_SCHEDULE_SIZE, dtype=bool)
+    filter_mask[:, WORKING_DAYS_PER_WEEK:] = False
+
     if filter_schedule:
-        pos = i * DAYS_PER_WEEK + j
-        return bool(int(filter_schedule[pos]))
+        filter_mask &= from_schedules_to_bit_tensor([filter_schedule])[0] == 0
 
-    return False
+    return filter_mask
 
 
-def get_sum_meeting_matrix(string_schedules):
-    bit_matrices = np.array(list(map(from_string_to_bit_matrix, string_schedules)))
-    return np.sum(bit_matrices, axis=0)
+def get_meeting_data_from_sum_matrix(
+    sum_matrix, total_students, filter_schedule=None, columnar=False
+):
+    # row-major order, the same order of iterating hours and then days
+    hour_indices, day_indices = np.nonzero(get_filter_mask(filter_schedule))
+
+    # the number of students available at each time
+    number_of_students = total_students - sum_matrix[hour_indices, day_indices]
+    availability = number_of_students / total_students
+
+    if columnar:
+        # parallel arrays instead of one dict per hour
+        results = {
+            "day_index": day_indices,
+            "hour_index": hour_indices,
+            "number_of_students": number_of_students,
+            "availability": availability,
+        }
+        return {"total_students": total_students, "results": results}
 
+    results = [
+        {
+            "day_index": day_index,
+            "hour_index": hour_index,
+            "number_of_students": students,
+            "availability": hour_availability,
+        }
+        for day_index, hour_index, students, hour_availability in zip(
+            day_indices.tolist(),
+            hour_indices.tolist(),
+            number_of_students.tolist(),
+            availability.tolist(),
+        )
+    ]
 
-def filter_results(result, filter_schedule):
+    return {"total_students": total_students, "results": results}
 
-    i = result["hour_index"]
-    j = result["day_index"]
 
-    if j > 4:
-        return False
+class MeetingAccumulator:
 
-    return not is_needed_to_ignore_hour(filter_schedule, i, j)
+    """
+    Number of students with class at each hour, the schedules can be added
+    in chunks and are not kept, so a big group of students fits in memory
+    """
+
+    def __init__(self):
+        self.sum_matrix = np.zeros(UNINORTE_SCHEDULE_SIZE, dtype="int64")
+        self.total_students = 0
+
+    def add(self, schedules):
+        if len(schedules) == 0:
+            return
+
+        self.sum_matrix += get_sum_meeting_matrix(schedules)
+        self.total_students += len(schedules)
+
+    def add_counts(self, slot_counts, total_students):
+
+        """
+        Add the number of students with class at each position of the
+        string schedule, counted somewhere else (e.g. by the database)
+        """
+
+        self.sum_matrix += np.asarray(slot_counts).reshape(UNINORTE_SCHEDULE_SIZE)
+        self.total_students += total_students
+
+    def get_meeting_data(self, filter_schedule=None, columnar=False):
+        return get_meeting_data_from_sum_matrix(
+            self.sum_matrix, self.total_students, filter_schedule, columnar
+        )
 
 
 def get_schedule_meeting_data(string_schedules, filter_schedule=None):
     sum_matrix = get_sum_meeting_matrix(string_schedules)
-    total_students = len(string_schedules)
-    hours, days = sum_matrix.shape
-    results = []
-    for i in range(hours):
-        for j in range(days):
-
-            # the number of students available at this time
-            number_of_students = total_students - sum_matrix[i][j]
-            availability = number_of_students / total_students
-            results.append(
-                {
-                    "day_index": j,
-                    "hour_index": i,
-                    "number_of_students": number_of_students,
-                    "availability": availability,
-                }
-            )
-
-    filtered_results = list(
-        filter(lambda result: filter_results(result, filter_schedule), results)
+    return get_meeting_data_from_sum_matrix(
+        sum_matrix, len(string_schedules), filter_schedule
     )
-
-    return {"total_students": total_students, "results": filtered_results}
@@ -2,7 +2,10 @@
 
 HOURS_PER_DAY = 14
 DAYS_PER_WEEK = 7
+# monday to friday, the remaining days are the weekend
+WORKING_DAYS_PER_WEEK = 5
 UNINORTE_SCHEDULE_SIZE = (HOURS_PER_DAY, DAYS_PER_WEEK)
+STRING_SCHEDULE_LENGTH = HOURS_PER_DAY * DAYS_PER_WEEK  # 98
 
 AVG_BOUNDRIES = (1, 13)
 SD_BOUNDRIES = (0, 6)
@@ -1,10 +1,26 @@
+import os
+
 import numpy as np
 
 from base.core.constants import (
     BIT_MATRIX_DATA_TYPE,
     DAYS_PER_WEEK,
+    HOURS_PER_DAY,
+    STRING_SCHEDULE_LENGTH,
     UNINORTE_SCHEDULE_SIZE,
 )
+from base.core.schedule import PACKED_SCHEDULE_SIZE, Schedule
+
+CLASS_HOUR_ASCII_CODE = ord("1")
+
+# every day is a column of 14 bits, so there are 2^14 possible days
+NUMBER_OF_DAY_PATTERNS = 2 ** HOURS_PER_DAY
+DAY_PATTERN_DATA_TYPE = "uint16"
+DISTANCE_TABLE_DATA_TYPE = "uint8"
+# distances are lower than 14, so a stored distance matrix needs 98 bytes
+PACKED_DISTANCE_MATRIX_DATA_TYPE = "uint8"
+
+_distance_table = None
 
 
 def indices_of_sub_arrays_of_zeros(arr):
@@ -73,26 +89,208 @@ def put_distance_to_day(start, end, day):
         day[start:end] = zeros
 
 
+def apply_distance_to_bit_tensor(bit_tensor):
+
+    """
+    Vectorized version of put_distance_to_day for a stack of bit matrices,
+    the tensor can be a single (14, 7) matrix or a (N, 14, 7) stack
+
+    The index of the previous and next class of each hour is found with a
+    forward and a backward cumulative scan over the hours axis, the distance
+    is the closest of both. Hours before the first class or after the last
+    class only have one side, and days without classes remain in zero
+
+    Example:
+    Given the day [0, 0, 1, 1, 0, 0, 0, 1]
+    previous class: [-, -, 2, 3, 3, 3, 3, 7]
+    next class:     [2, 2, 2, 3, 7, 7, 7, 7]
+    distance:       [2, 1, 0, 0, 1, 2, 1, 0]
+    """
+
+    hours = bit_tensor.shape[-2]
+    hour_indices = np.arange(hours).reshape(hours, 1)
+    # any distance greater or equal than this one means there is no class
+    no_class_distance = 2 * hours
+
+    has_class = bit_tensor != 0
+
+    previous_class = np.maximum.accumulate(
+        np.where(has_class, hour_indices, -no_class_distance), axis=-2
+    )
+    next_class = np.flip(
+        np.minimum.accumulate(
+            np.flip(np.where(has_class, hour_indices, 3 * hours), axis=-2),
+            axis=-2,
+        ),
+        axis=-2,
+    )
+
+    distance = np.minimum(hour_indices - previous_class, next_class - hour_indices)
+    distance[distance >= no_class_distance] = 0
+
+    bit_tensor[...] = distance
+
+
 def apply_distance_to_bit_matrix(bit_matrix):
+    apply_distance_to_bit_tensor(bit_matrix)
+
+
+def from_string_schedules_to_bit_tensor(string_schedules):
+
+    """
+    Decode a batch of string schedules into a (N, 14, 7) bit tensor
+
+    All schedules are joined and read as ASCII bytes, so the whole batch
+    is decoded with a single comparison against the code of "1"
+
+    Example:
+    Input: ["0100...", "1100..."]
+    Output: array of shape (2, 14, 7) where output[n] is the bit matrix
+    of the n-th schedule
+    """
+
+    string_schedules = list(string_schedules)
+    number_of_schedules = len(string_schedules)
+
+    # each one, a short schedule next to a long one would shift the rows
+    if any(len(schedule) != STRING_SCHEDULE_LENGTH for schedule in string_schedules):
+        raise ValueError(
+            f"Every string schedule must have {STRING_SCHEDULE_LENGTH} characters"
+        )
+
+    raw_schedules = "".join(string_schedules).encode("ascii")
+
+    ascii_codes = np.frombuffer(raw_schedules, dtype="uint8")
+    bit_tensor = (ascii_codes == CLASS_HOUR_ASCII_CODE).astype(BIT_MATRIX_DATA_TYPE)
+    return bit_tensor.reshape(number_of_schedules, *UNINORTE_SCHEDULE_SIZE)
+
+
+def from_packed_schedules_to_bit_tensor(packed_schedules):
+
+    """
+    Decode a batch of packed schedules (Schedule.to_bytes) into a (N, 14, 7)
+    bit tensor, the bits of each schedule are stored day by day
+    """
+
+    packed_schedules = list(packed_schedules)
+    raw_schedules = np.frombuffer(b"".join(packed_schedules), dtype="uint8")
+    bits = np.unpackbits(
+        raw_schedules.reshape(len(packed_schedules), PACKED_SCHEDULE_SIZE),
+        axis=1,
+        bitorder="little",
+    )[:, :STRING_SCHEDULE_LENGTH]
+
+    bits_by_day = bits.reshape(len(packed_schedules), DAYS_PER_WEEK, HOURS_PER_DAY)
+    return np.ascontiguousarray(
+        np.swapaxes(bits_by_day, 1, 2), dtype=BIT_MATRIX_DATA_TYPE
+    )
+
+
+def from_schedules_to_bit_tensor(schedules):
+
+    """
+    Decode a batch of schedules into a (N, 14, 7) bit tensor, the schedules
+    can be Schedule objects, string schedules or packed schedules
+    """
+
+    schedules = list(schedules)
+    if all(isinstance(schedule, str) for schedule in schedules):
+        return from_string_schedules_to_bit_tensor(schedules)
+
+    return from_packed_schedules_to_bit_tensor(map(to_packed_schedule, schedules))
+
 
-    transpose_bit_matrix = bit_matrix.T
-    for day in transpose_bit_matrix:
-        gaps = indices_of_sub_arrays_of_zeros(day)
-        for gap in gaps:
-            put_distance_to_day(*gap, day)
+def to_packed_schedule(schedule):
+    if isinstance(schedule, str):
+        return Schedule.from_string(schedule).to_bytes()
+    if isinstance(schedule, Schedule):
+        return schedule.to_bytes()
+    return bytes(schedule)
 
 
-def from_string_to_bit_matrix(string_schedule):
+def from_string_to_bit_matrix(schedule):
+    return from_schedules_to_bit_tensor([schedule])[0]
 
-    bit_matrix = np.zeros(shape=UNINORTE_SCHEDULE_SIZE, dtype=BIT_MATRIX_DATA_TYPE)
 
-    for i, c in enumerate(string_schedule):
-        if c == "1":
-            i_index = i // DAYS_PER_WEEK
-            j_index = i % DAYS_PER_WEEK
-            bit_matrix[i_index][j_index] = 1
+def build_distance_table():
+
+    """
+    Compute the distances of every possible day, the row k of the table is
+    the day whose hour i has a class when the bit i of k is set
+
+    Example:
+    k = 0b1100 is the day [0, 0, 1, 1, 0, ..., 0]
+    table[k] = [2, 1, 0, 0, 1, 2, ..., 10]
+    """
+
+    day_patterns = np.arange(NUMBER_OF_DAY_PATTERNS).reshape(-1, 1)
+    hour_bits = (day_patterns >> np.arange(HOURS_PER_DAY)) & 1
+
+    # each day is a (14, 1) matrix, so the hours stay in the second axis
+    day_tensor = hour_bits.astype(BIT_MATRIX_DATA_TYPE)[:, :, np.newaxis]
+    apply_distance_to_bit_tensor(day_tensor)
+
+    distance_table = day_tensor[:, :, 0].astype(DISTANCE_TABLE_DATA_TYPE)
+    distance_table.flags.writeable = False
+    return distance_table
+
+
+def load_distance_table(path):
+
+    """
+    Memory-map the distance table stored in path, building it first if the
+    file does not exist. The mapping is read-only, so all the processes that
+    load the same file share its pages
+    """
+
+    if not os.path.exists(path):
+        temporal_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporal_path, "wb") as table_file:
+            np.save(table_file, build_distance_table())
+        os.replace(temporal_path, path)
+
+    return np.load(path, mmap_mode="r")
+
+
+def set_distance_table(distance_table):
+    global _distance_table
+    _distance_table = distance_table
+
+
+def get_distance_table():
+    if _distance_table is None:
+        set_distance_table(build_distance_table())
+    return _distance_table
+
+
+def pack_bit_tensor_days(bit_tensor):
+
+    """
+    Pack each day (column) of a (N, 14, 7) bit tensor into a 14 bit integer,
+    the result is a (N, 7) array of day patterns
+    """
+
+    hour_weights = (1 << np.arange(HOURS_PER_DAY, dtype=DAY_PATTERN_DATA_TYPE)).reshape(
+        HOURS_PER_DAY, 1
+    )
+    return np.sum(
+        bit_tensor.astype(DAY_PATTERN_DATA_TYPE) * hour_weights,
+        axis=-2,
+        dtype=DAY_PATTERN_DATA_TYPE,
+    )
 
-    return bit_matrix
+
+def get_distance_matrices_from_day_patterns(day_patterns):
+
+    """
+    Gather the distances of each day from the distance table, returns
+    a (N, 14, 7) tensor given a (N, 7) array of day patterns
+    """
+
+    distances_by_day = get_distance_table()[day_patterns]
+    return np.ascontiguousarray(
+        np.swapaxes(distances_by_day, -1, -2), dtype=BIT_MATRIX_DATA_TYPE
+    )
 
 
 def get_distance_matrix_from_string_schedule(string_schedule):
@@ -109,6 +307,36 @@ def get_distance_matrix_from_string_schedule(string_schedule):
 
     """
 
-    bit_matrix = from_string_to_bit_matrix(string_schedule)
-    apply_distance_to_bit_matrix(bit_matrix)
-    return bit_matrix
+    return get_distance_matrices_from_string_schedules([string_schedule])[0]
+
+
+def get_distance_matrices_from_string_schedules(string_schedules):
+
+    """
+    Batch version of get_distance_matrix_from_string_schedule, returns
+    a (N, 14, 7) tensor with the distance matrix of each schedule. The
+    schedules can be either Schedule objects or string schedules
+    """
+
+    bit_tensor = from_schedules_to_bit_tensor(string_schedules)
+    return get_distance_matrices_from_day_patterns(pack_bit_tensor_days(bit_tensor))
+
+
+def pack_distance_matrix(distance_matrix):
+    return np.asarray(distance_matrix, dtype=PACKED_DISTANCE_MATRIX_DATA_TYPE).tobytes()
+
+
+def unpack_distance_matrices(packed_distance_matrices):
+
+    """
+    Decode a batch of packed distance matrices (pack_distance_matrix) into
+    a writable (N, 14, 7) tensor
+    """
+
+    packed_distance_matrices = list(packed_distance_matrices)
+    raw_distance_matrices = np.frombuffer(
+        b"".join(packed_distance_matrices), dtype=PACKED_DISTANCE_MATRIX_DATA_TYPE
+    )
+    return raw_distance_matrices.reshape(
+        len(packed_distance_matrices), *UNINORTE_SCHEDULE_SIZE
+    ).astype(BIT_MATRIX_DATA_TYPE)
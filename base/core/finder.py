@@ -5,10 +5,10 @@ from base.core.constants import (
     BIT_MATRIX_DATA_TYPE,
     DAYS,
     HOURS,
-    HOURS_PER_DAY,
     SD_BOUNDRIES,
+    UNINORTE_SCHEDULE_SIZE,
+    WORKING_DAYS_PER_WEEK,
 )
-from base.core.gap_filters import sort_results_by_quality
 
 DEFAULT_MATRIX_COMPUTER_OPTIONS = {
     "compute_sd": False,
@@ -17,15 +17,34 @@ DEFAULT_MATRIX_COMPUTER_OPTIONS = {
 }
 
 
+def get_matrix_computer_options(options=None):
+    if options:
+        return {**DEFAULT_MATRIX_COMPUTER_OPTIONS, **options}
+    return DEFAULT_MATRIX_COMPUTER_OPTIONS
+
+
+def set_to_one_no_classes_days(distance_matrices, ignore_weekend):
+    # (N, 7) mask of the days in which each user has no classes
+    no_classes_days = ~np.any(distance_matrices, axis=1)
+    if ignore_weekend:
+        no_classes_days[:, WORKING_DAYS_PER_WEEK:] = False
+
+    np.copyto(distance_matrices, 1, where=no_classes_days[:, np.newaxis, :])
+
+
 class DistanceMatrixComputer:
 
     """
     Compute sum, average and standard deviation of all distances matrices
 
+    The distance matrices are kept as a single (N, 14, 7) tensor
+
     """
 
     def __init__(self, distance_matrices, options=None):
-        self.distance_matrices = distance_matrices
+        self.distance_matrices = np.ascontiguousarray(
+            distance_matrices, dtype=BIT_MATRIX_DATA_TYPE
+        )
         self.sum_matrix = None
         self.avg_matrix = None
         self.deviation_matrix = None
@@ -33,10 +52,7 @@ class DistanceMatrixComputer:
         self.set_options(options)
 
     def set_options(self, options=None):
-        if options:
-            self.options = {**DEFAULT_MATRIX_COMPUTER_OPTIONS, **options}
-        else:
-            self.options = DEFAULT_MATRIX_COMPUTER_OPTIONS
+        self.options = get_matrix_computer_options(options)
 
     def compute(self):
         if self.options["no_classes_day"]:
@@ -53,32 +69,100 @@ class DistanceMatrixComputer:
             )
 
     def zerofication_of_matrices(self):
-        zero_indices = set()
-        for distance_matrix in self.distance_matrices:
-            current_zero_indices = np.where(distance_matrix == 0)
-            n = len(current_zero_indices[0])
-            for i in range(n):
-                zero_indices.add(
-                    (current_zero_indices[0][i], current_zero_indices[1][i])
-                )
-
-        for distance_matrix in self.distance_matrices:
-            for index_tuple in zero_indices:
-                distance_matrix[index_tuple[0]][index_tuple[1]] = 0
+        # a class of any user in one position discards the gap for everyone
+        any_class_mask = np.any(self.distance_matrices == 0, axis=0)
+        self.distance_matrices[:, any_class_mask] = 0
 
     def set_to_one_no_classes_days(self):
+        set_to_one_no_classes_days(
+            self.distance_matrices, self.options["ignore_weekend"]
+        )
+
+    def get_sum_matrix(self):
+        return self.sum_matrix
+
+    def get_avg_matrix(self):
+        return self.avg_matrix
+
+    def get_sd_matrix(self):
+        return self.deviation_matrix
+
+
+class StreamingDistanceMatrixComputer:
+
+    """
+    Incremental version of DistanceMatrixComputer
+
+    Distance matrices are added one by one or in chunks and only running
+    statistics are kept: the sum, the mean and the sum of squared
+    differences (M2) of Welford's algorithm, and a mask of the positions
+    where any user has a class. The memory doesn't depend on the number
+    of users and the results are the same of DistanceMatrixComputer
+
+    """
+
+    def __init__(self, distance_matrices=(), options=None):
+        self.count = 0
+        self.running_sum = np.zeros(UNINORTE_SCHEDULE_SIZE, dtype="int64")
+        self.running_mean = np.zeros(UNINORTE_SCHEDULE_SIZE, dtype="float64")
+        self.running_m2 = np.zeros(UNINORTE_SCHEDULE_SIZE, dtype="float64")
+        self.any_class_mask = np.zeros(UNINORTE_SCHEDULE_SIZE, dtype=bool)
+
+        self.sum_matrix = None
+        self.avg_matrix = None
+        self.deviation_matrix = None
+
+        self.set_options(options)
+
+        for distance_matrix in distance_matrices:
+            self.add(distance_matrix)
+
+    def set_options(self, options=None):
+        self.options = get_matrix_computer_options(options)
+
+    def add(self, distance_matrix):
+        self.add_chunk(np.asarray(distance_matrix)[np.newaxis])
+
+    def add_chunk(self, distance_matrices):
+        chunk = np.array(distance_matrices, dtype=BIT_MATRIX_DATA_TYPE)
+        chunk_count = len(chunk)
+        if chunk_count == 0:
+            return
+
+        if self.options["no_classes_day"]:
+            set_to_one_no_classes_days(chunk, self.options["ignore_weekend"])
+
+        self.any_class_mask |= np.any(chunk == 0, axis=0)
+        self.running_sum += np.sum(chunk, axis=0)
 
-        for distance_matrix in self.distance_matrices:
-            transpose_matrix = distance_matrix.T
-            for i, day in enumerate(transpose_matrix):
-                if self.options["ignore_weekend"] and i > 4:
-                    break
+        # combine the statistics of the chunk with the running ones
+        # (parallel version of Welford's algorithm by Chan et al.)
+        chunk_mean = np.mean(chunk, axis=0, dtype="float64")
+        chunk_m2 = np.sum((chunk - chunk_mean) ** 2, axis=0)
 
-                has_no_classes = not any(day)
-                if has_no_classes:
-                    transpose_matrix[i] = np.ones(
-                        HOURS_PER_DAY, dtype=BIT_MATRIX_DATA_TYPE
-                    )
+        total_count = self.count + chunk_count
+        delta = chunk_mean - self.running_mean
+        self.running_mean += delta * chunk_count / total_count
+        self.running_m2 += (
+            chunk_m2 + delta ** 2 * self.count * chunk_count / total_count
+        )
+        self.count = total_count
+
+    def add_chunks(self, chunks):
+        for chunk in chunks:
+            self.add_chunk(chunk)
+
+    def compute(self):
+        if self.count == 0:
+            raise ValueError("At least one distance matrix must be added")
+
+        # zerofication, positions with a class of any user are not gaps
+        self.sum_matrix = np.where(self.any_class_mask, 0, self.running_sum)
+        self.avg_matrix = (self.sum_matrix / self.count).astype("float32")
+
+        if self.options["compute_sd"]:
+            variance = np.where(self.any_class_mask, 0, self.running_m2 / self.count)
+            self.deviation_matrix = np.sqrt(variance).astype("float32")
 
     def get_sum_matrix(self):
         return self.sum_matrix
@@ -91,34 +175,118 @@ class DistanceMatrixComputer:
 
 
 def get_gap_quality_average(avg, min_avg, max_avg):
-    # start from 0
-    max_avg -= min_avg
-    avg -= min_avg
+    # start from 0, avg can also be an array of averages
+    max_avg = max_avg - min_avg
+    avg = avg - min_avg
 
     return 1 - (avg / max_avg)
 
 
 def get_gap_quality(avg, sd, min_avg, max_avg, min_sd, max_sd):
-    # start from 0
-    max_avg -= min_avg
-    avg -= min_avg
-    max_sd -= min_sd
-    sd -= min_sd
+    # start from 0, avg and sd can also be arrays
+    max_avg = max_avg - min_avg
+    avg = avg - min_avg
+    max_sd = max_sd - min_sd
+    sd = sd - min_sd
 
     return 1 - ((avg + sd) / (max_avg + max_sd))
 
 
+GAP_FIELDS = [
+    ("day_index", "int64"),
+    ("hour_index", "int64"),
+    ("avg", "float64"),
+    ("quality", "float64"),
+]
+GAP_WITH_SD_FIELDS = GAP_FIELDS + [("sd", "float64")]
+
+
+def gaps_to_dicts(gaps):
+
+    """
+    Convert a structured array of gaps (see GAP_FIELDS) into the list of
+    dicts returned by the API
+    """
+
+    with_sd = "sd" in gaps.dtype.names
+    results = []
+    for gap in gaps.tolist():
+        day_index, hour_index, avg, quality = gap[:4]
+        gap_item = {
+            "day": DAYS[day_index],
+            "hour": HOURS[hour_index],
+            "avg": avg,
+            "quality": quality,
+            "day_index": day_index,
+            "hour_index": hour_index,
+        }
+        if with_sd:
+            gap_item["sd"] = gap[4]
+        results.append(gap_item)
+
+    return results
+
+
+def gaps_to_columns(gaps):
+
+    """
+    Convert a structured array of gaps into parallel arrays, one per field,
+    the compact alternative to gaps_to_dicts. The names of the day and the
+    hour are left out, day_index and hour_index already give them
+    """
+
+    return {name: np.ascontiguousarray(gaps[name]) for name in gaps.dtype.names}
+
+
+def rank_by_quality(quality, limit=None):
+
+    """
+    Indices of the gaps sorted by descending quality, ties keep their
+    original order. When a limit is given only the best `limit` gaps are
+    selected (partial selection) and sorted, -1 means no limit and any other
+    limit below 1 selects nothing
+
+    Example:
+    Input: quality = [0.5, 0.9, 0.5, 0.7], limit = 3
+    Output: [1, 3, 0]
+    """
+
+    negated_quality = -quality
+    if limit is None or limit == -1 or limit >= len(quality):
+        return np.argsort(negated_quality, kind="stable")
+
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # the k-th best quality, all the gaps better than it are selected and
+    # the remaining places go to the first gaps with exactly that quality
+    kth_quality = np.partition(negated_quality, limit - 1)[limit - 1]
+    better_gaps = np.flatnonzero(negated_quality < kth_quality)
+    tied_gaps = np.flatnonzero(negated_quality == kth_quality)
+    selected_gaps = np.sort(
+        np.concatenate((better_gaps, tied_gaps[: limit - len(better_gaps)]))
+    )
+
+    return selected_gaps[np.argsort(negated_quality[selected_gaps], kind="stable")]
+
+
 class GapFinder:
 
     """
     Find all gaps from a series of string schedules
 
+    The results are kept in a structured array (see GAP_FIELDS), they
+    are only converted into dicts by get_results. The days to filter are
+    discarded before ranking and only the best `limit` gaps are sorted
+
     """
 
-    def __init__(self, distance_matrix_computer):
+    def __init__(self, distance_matrix_computer, limit=None, days_to_filter=None):
         self.distance_matrix_computer = distance_matrix_computer
+        self.limit = limit
+        self.days_to_filter = days_to_filter
         self.distance_matrix_computer.compute()
-        self.results = []
+        self.results = np.empty(0, dtype=GAP_FIELDS)
 
         self.compute_sd = self.distance_matrix_computer.options["compute_sd"]
 
@@ -127,38 +295,37 @@ class GapFinder:
         avg_matrix = self.distance_matrix_computer.get_avg_matrix()
         sd_matrix = self.distance_matrix_computer.get_sd_matrix()
 
-        for i, hour in enumerate(HOURS):
-            for j, day in enumerate(DAYS):
-                if avg_matrix[i][j] != 0:
+        gaps_mask = avg_matrix != 0
+        if self.days_to_filter:
+            gaps_mask[:, self.days_to_filter] = False
 
-                    avg = float(avg_matrix[i][j])
+        # row-major order, the same order of iterating hours and then days
+        hour_indices, day_indices = np.nonzero(gaps_mask)
+        avg = avg_matrix[hour_indices, day_indices].astype("float64")
 
-                    new_gap_item = {
-                        "day": day,
-                        "hour": hour,
-                        "avg": avg,
-                        "quality": get_gap_quality_average(avg, *AVG_BOUNDRIES),
-                        "day_index": j,
-                        "hour_index": i,
-                    }
-
-                    if sd_matrix is not None:
-                        sd = float(sd_matrix[i][j])
-                        new_gap_item.update(
-                            {
-                                "sd": sd,
-                                "quality": get_gap_quality(
-                                    avg, sd, *AVG_BOUNDRIES, *SD_BOUNDRIES
-                                ),
-                            }
-                        )
+        if sd_matrix is not None:
+            sd = sd_matrix[hour_indices, day_indices].astype("float64")
+            gaps = np.empty(len(avg), dtype=GAP_WITH_SD_FIELDS)
+            gaps["sd"] = sd
+            gaps["quality"] = get_gap_quality(avg, sd, *AVG_BOUNDRIES, *SD_BOUNDRIES)
+        else:
+            gaps = np.empty(len(avg), dtype=GAP_FIELDS)
+            gaps["quality"] = get_gap_quality_average(avg, *AVG_BOUNDRIES)
 
-                    self.results.append(new_gap_item)
+        gaps["day_index"] = day_indices
+        gaps["hour_index"] = hour_indices
+        gaps["avg"] = avg
 
-        self.results = sort_results_by_quality(self.results)
+        self.results = gaps[rank_by_quality(gaps["quality"], self.limit)]
 
     def apply_filter(self, func, *args, **kwargs):
         self.results = func(self.results, *args, **kwargs)
 
-    def get_results(self):
+    def get_columnar_results(self):
         return self.results
+
+    def get_results(self):
+        return gaps_to_dicts(self.results)
+
+    def get_results_by_column(self):
+        return gaps_to_columns(self.results)
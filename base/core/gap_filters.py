@@ -1,4 +1,19 @@
+import numpy as np
+
+# the filters accept the list of gap dicts or the structured array of gaps
+# used by GapFinder (see GAP_FIELDS in base.core.finder)
+
+
+def is_columnar(results):
+    return isinstance(results, np.ndarray)
+
+
 def sort_results(results, with_sd=False):
+    if is_columnar(results):
+        if with_sd:
+            return results[np.lexsort((results["sd"], results["avg"]))]
+        return results[np.argsort(results["avg"], kind="stable")]
+
     if with_sd:
         return sorted(results, key=lambda gap: (gap["avg"], gap["sd"]))
     else:
@@ -6,6 +21,10 @@ def sort_results(results, with_sd=False):
 
 
 def sort_results_by_quality(results):
+    if is_columnar(results):
+        # stable, so ties keep their order like sorted(..., reverse=True)
+        return results[np.argsort(-results["quality"], kind="stable")]
+
     return sorted(results, key=lambda gap: gap["quality"], reverse=True)
 
 
@@ -17,5 +36,7 @@ def limit_results(results, limit=-1):
 
 def filter_by_days(results, day_indices=None):
     if day_indices:
+        if is_columnar(results):
+            return results[~np.isin(results["day_index"], day_indices)]
         return list(filter(lambda e: e["day_index"] not in day_indices, results))
     return results
@@ -1,10 +1,12 @@
 import json
 
-import requests
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 
-from base.core.constants import DAYS_PER_WEEK
+from base.core.schedule import Schedule
+from base.core.upstream_client import CircuitBreaker, UpstreamClient
 
 
 def get_schedule_data_function():
@@ -28,6 +30,7 @@ class ClassHoursGetter:
 class StringScheduleProcessor:
     def __init__(self, class_hours_getter):
         self.class_hours_getter = class_hours_getter
+        self.schedule = None
         self.string_schedule = ""
         self.error_message = ""
 
@@ -42,24 +45,58 @@ class StringScheduleProcessor:
             self.error_message = "Lo sentimos, ha ocurrido un error inesperado"
 
     def find_ss_from_class_hours(self):
-        ss_list = [0 for _ in range(98)]
-        for day_hour in self.class_hours:
-            hour_index, day_index = day_hour
-            pos = hour_index * DAYS_PER_WEEK + day_index
-            ss_list[pos] = 1
-        self.string_schedule = "".join(map(str, ss_list))
+        self.schedule = Schedule.from_class_hours(self.class_hours)
+        self.string_schedule = self.schedule.to_string()
 
     def is_string_schedule_retrieved(self):
         return self.string_schedule != ""
 
 
+_upstream_client = None
+
+
+def get_upstream_pool_size():
+
+    """
+    Threads of a process that can call the upstream at the same time, the
+    upstream pool of the async views and the registration jobs
+    """
+
+    return settings.ASYNC_VIEWS_WORKERS["upstream"] + settings.REGISTRATION_JOBS_WORKERS
+
+
+def get_upstream_client():
+    global _upstream_client
+
+    if _upstream_client is None:
+        options = dict(settings.UPSTREAM_CLIENT)
+        options.setdefault("pool_size", get_upstream_pool_size())
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=options.pop("failure_threshold"),
+            reset_timeout=options.pop("reset_timeout"),
+        )
+        _upstream_client = UpstreamClient(
+            settings.UNINORTE_SCHEDULE_API, circuit_breaker=circuit_breaker, **options
+        )
+
+    return _upstream_client
+
+
+@receiver(setting_changed)
+def reset_upstream_client(setting, **kwargs):
+    global _upstream_client
+
+    if setting in (
+        "UPSTREAM_CLIENT",
+        "UNINORTE_SCHEDULE_API",
+        "ASYNC_VIEWS_WORKERS",
+        "REGISTRATION_JOBS_WORKERS",
+    ):
+        _upstream_client = None
+
+
 def get_schedule_data_from_uni_api(username, password):
-    url = settings.UNINORTE_SCHEDULE_API
-    response = requests.post(
-        url,
-        data={"username": username, "password": password},
-    )
-    return response.status_code, json.loads(response.text)
+    return get_upstream_client().post({"username": username, "password": password})
 
 
 def get_schedule_data_for_development(username, password):
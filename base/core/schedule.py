@@ -0,0 +1,96 @@
+from base.core.constants import DAYS_PER_WEEK, HOURS_PER_DAY, STRING_SCHEDULE_LENGTH
+
+PACKED_SCHEDULE_SIZE = 13  # bytes needed for 98 bits
+DAY_MASK = (1 << HOURS_PER_DAY) - 1
+
+
+class Schedule:
+
+    """
+    Compact representation of a schedule as a 98 bit integer
+
+    The schedule is stored day by day, the bit day_index * 14 + hour_index
+    is set when there is a class at that hour, so each day is a 14 bit
+    integer (day pattern) and a string schedule can be rebuilt at any time
+
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        if not 0 <= bits < 1 << STRING_SCHEDULE_LENGTH:
+            raise ValueError(f"A schedule has only {STRING_SCHEDULE_LENGTH} bits")
+        self.bits = bits
+
+    @classmethod
+    def from_string(cls, string_schedule):
+        if len(string_schedule) != STRING_SCHEDULE_LENGTH:
+            raise ValueError(
+                f"A string schedule must have {STRING_SCHEDULE_LENGTH} characters"
+            )
+
+        bits = 0
+        for day_index in range(DAYS_PER_WEEK):
+            # the hours of a day are every seventh character, the first hour
+            # must be the least significant bit
+            day = string_schedule[day_index::DAYS_PER_WEEK][::-1]
+            bits |= int(day, 2) << (day_index * HOURS_PER_DAY)
+
+        return cls(bits)
+
+    @classmethod
+    def from_class_hours(cls, class_hours):
+        bits = 0
+        for hour_index, day_index in class_hours:
+            if not (0 <= hour_index < HOURS_PER_DAY and 0 <= day_index < DAYS_PER_WEEK):
+                raise ValueError(f"Invalid class hour {(hour_index, day_index)}")
+            bits |= 1 << (day_index * HOURS_PER_DAY + hour_index)
+
+        return cls(bits)
+
+    @classmethod
+    def from_bytes(cls, packed_schedule):
+        return cls(int.from_bytes(bytes(packed_schedule), "little"))
+
+    def to_bytes(self):
+        return self.bits.to_bytes(PACKED_SCHEDULE_SIZE, "little")
+
+    def to_string(self):
+        days = [format(day, f"0{HOURS_PER_DAY}b")[::-1] for day in self.days]
+        return "".join(map("".join, zip(*days)))
+
+    def day_mask(self, day_index):
+        return (self.bits >> (day_index * HOURS_PER_DAY)) & DAY_MASK
+
+    @property
+    def days(self):
+        return tuple(self.day_mask(day_index) for day_index in range(DAYS_PER_WEEK))
+
+    def has_class(self, hour_index, day_index):
+        return bool(self.day_mask(day_index) >> hour_index & 1)
+
+    def class_hours_count(self):
+        return bin(self.bits).count("1")
+
+    def free_slots_count(self):
+        return STRING_SCHEDULE_LENGTH - self.class_hours_count()
+
+    def __or__(self, other):
+        return Schedule(self.bits | other.bits)
+
+    def __and__(self, other):
+        return Schedule(self.bits & other.bits)
+
+    def __eq__(self, other):
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __str__(self):
+        return self.to_string()
+
+    def __repr__(self):
+        return f"Schedule({self.to_string()!r})"
@@ -0,0 +1,23 @@
+import numpy as np
+
+from base.core.constants import STRING_SCHEDULE_LENGTH
+
+# same proportion of class hours used by data_factories.get_random_schedule
+CLASS_HOUR_PROBABILITY = 0.25
+
+
+def generate_string_schedules(cohort_size, seed=10):
+
+    """
+    Random string schedules, the same seed always gives the same schedules.
+    The benchmarks, the warm-up of the workers and the tests use them
+    """
+
+    rng = np.random.default_rng(seed)
+    bits = rng.random((cohort_size, STRING_SCHEDULE_LENGTH)) < CLASS_HOUR_PROBABILITY
+    raw_schedules = np.where(bits, ord("1"), ord("0")).astype("uint8").tobytes()
+    content = raw_schedules.decode("ascii")
+    return [
+        content[start : start + STRING_SCHEDULE_LENGTH]
+        for start in range(0, len(content), STRING_SCHEDULE_LENGTH)
+    ]
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# status code returned when the upstream can't be reached, the register
+# process turns every status different from 200 and 401 into an error
+UNAVAILABLE_STATUS_CODE = 503
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class CircuitBreaker:
+
+    """
+    Stop calling the upstream after failure_threshold consecutive failures,
+    once reset_timeout seconds have passed a single trial call is allowed,
+    if it works the circuit is closed again
+
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+
+            if self.clock() - self.opened_at >= self.reset_timeout:
+                # half open, only this call goes through and if it fails the
+                # circuit is opened again
+                self.opened_at = self.clock()
+                self.failures = self.failure_threshold - 1
+                return True
+
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+    def is_open(self):
+        return self.opened_at is not None
+
+
+class UpstreamClient:
+
+    """
+    Client of the schedule API of the university, the connections are kept
+    in a pool and every call is bounded by the timeouts and the retries
+
+    Only connection errors and 502, 503 and 504 responses are retried, a
+    read timeout is not retried because the upstream is already slow
+
+    """
+
+    def __init__(
+        self,
+        url,
+        connect_timeout=3.05,
+        read_timeout=10,
+        max_retries=2,
+        backoff_factor=0.3,
+        pool_size=10,
+        circuit_breaker=None,
+        sleep=time.sleep,
+    ):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.sleep = sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, data):
+
+        """
+        Return the status code and the json data of the response, when the
+        upstream is down the status code is UNAVAILABLE_STATUS_CODE
+        """
+
+        if not self.circuit_breaker.allow_request():
+            return UNAVAILABLE_STATUS_CODE, {}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.sleep(self.backoff_factor * 2 ** (attempt - 1))
+
+            try:
+                response = self.session.post(self.url, data=data, timeout=self.timeout)
+            except requests.exceptions.ConnectionError:
+                continue
+            except requests.exceptions.RequestException:
+                break
+
+            if response.status_code in RETRY_STATUS_CODES:
+                continue
+
+            if response.status_code >= 500:
+                break
+
+            self.circuit_breaker.record_success()
+            return response.status_code, self.get_json_data(response)
+
+        self.circuit_breaker.record_failure()
+        return UNAVAILABLE_STATUS_CODE, {}
+
+    @staticmethod
+    def get_json_data(response):
+        try:
+            return json.loads(response.text)
+        except ValueError:
+            return {}
+
+    def close(self):
+        self.session.close()
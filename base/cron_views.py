@@ -7,27 +7,63 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from base.models import UninorteUser
+from base.registration_jobs import clean_registration_jobs
+from base.results_cache import get_results_cache, invalidate_users_results
+from base.schedule_store import get_schedule_store, invalidate_users_schedules
 
 
 @api_view(["POST"])
 def delete_unverified_users_view(request):
 
     """
-    Delete unverified users, those who registration process was manual
+    Delete unverified users, those who registration process was manual,
+    and clean the stale and expired registration jobs
 
     """
 
     secret_code = request.data.get("secret_code", "")
 
     if secret_code == settings.DEL_UNVERIFIED_SECRET_CODE:
-        amount, _ = (
-            UninorteUser.objects.filter(verified=False)
-            .filter(created_at__lte=timezone.now() - timedelta(weeks=1))
-            .delete()
+        unverified_users = UninorteUser.objects.filter(verified=False).filter(
+            created_at__lte=timezone.now() - timedelta(weeks=1)
         )
+        usernames = list(unverified_users.values_list("username", flat=True))
+        amount, _ = unverified_users.delete()
+        invalidate_users_results(usernames)
+        invalidate_users_schedules(usernames)
 
         return Response(
-            {"message": f"Successfully deleted {amount} unverified users"},
+            {
+                "message": f"Successfully deleted {amount} unverified users",
+                "registration_jobs": clean_registration_jobs(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    return Response(
+        {"message": "invalid secret code"},
+        status=status.HTTP_401_UNAUTHORIZED,
+    )
+
+
+@api_view(["POST"])
+def cache_stats_view(request):
+
+    """
+    Return the hit and miss counters of the caches of this process
+
+    """
+
+    secret_code = request.data.get("secret_code", "")
+
+    if secret_code == settings.DEL_UNVERIFIED_SECRET_CODE:
+        results_cache = get_results_cache()
+        schedule_store = get_schedule_store()
+        return Response(
+            {
+                "results_cache": results_cache.stats() if results_cache else None,
+                "schedule_store": schedule_store.stats() if schedule_store else None,
+            },
             status=status.HTTP_200_OK,
         )
 
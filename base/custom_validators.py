@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.validators import FileExtensionValidator as ExtensionValidator
+from django.core.validators import RegexValidator
+from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
 
@@ -9,3 +11,10 @@ class FileExtensionValidator(ExtensionValidator):
             super().__call__(value)
         except DjangoValidationError as vd:
             raise ValidationError(vd.message % vd.params, code=vd.code)
+
+
+# 14 hours by 7 days, 1 is a class hour. Schedule.from_string only accepts
+# these strings, so they are checked before a user is saved
+string_schedule_validator = RegexValidator(
+    r"^[01]{98}$", message=_("El horario debe tener 98 caracteres entre 0 y 1")
+)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from base.benchmarks import COHORT_SIZES, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "measure time per call and peak memory of the base.core functions"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=list(COHORT_SIZES),
+            help="cohort sizes (number of generated schedules) to measure",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="number of calls per benchmark, the best time is reported",
+        )
+
+        parser.add_argument(
+            "--filter",
+            type=str,
+            default=None,
+            help="only run the benchmarks whose name contains this text",
+        )
+
+    def handle(self, *args, **options):
+
+        header = f"{'benchmark':<95} {'size':>8} {'ms/call':>12} {'peak KiB':>12}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for result in run_benchmarks(
+            cohort_sizes=options["sizes"],
+            repeat=options["repeat"],
+            name_filter=options["filter"],
+        ):
+            self.stdout.write(
+                f"{result['benchmark']:<95} "
+                f"{result['cohort_size']:>8} "
+                f"{result['seconds_per_call'] * 1000:>12.3f} "
+                f"{result['peak_memory'] / 1024:>12.1f}"
+            )
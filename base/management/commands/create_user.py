@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 
+from base.custom_validators import string_schedule_validator
 from base.models import UninorteUser
 
 
@@ -22,10 +23,11 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         try:
+            string_schedule_validator(options["string_schedule"])
             UninorteUser.objects.create(
                 username=options["username"],
                 schedule=options["string_schedule"],
-                schedule=options["verified"],
+                verified=options["verified"],
             )
         except Exception as e:
             self.stdout.write(str(e))
@@ -4,6 +4,9 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from base.models import UninorteUser
+from base.registration_jobs import clean_registration_jobs
+from base.results_cache import invalidate_users_results
+from base.schedule_store import invalidate_users_schedules
 
 
 class Command(BaseCommand):
@@ -11,9 +14,17 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
 
-        amount, _ = (
-            UninorteUser.objects.filter(verified=False)
-            .filter(created_at__lte=timezone.now() - timedelta(weeks=1))
-            .delete()
+        unverified_users = UninorteUser.objects.filter(verified=False).filter(
+            created_at__lte=timezone.now() - timedelta(weeks=1)
         )
+        usernames = list(unverified_users.values_list("username", flat=True))
+        amount, _ = unverified_users.delete()
+        invalidate_users_results(usernames)
+        invalidate_users_schedules(usernames)
         self.stdout.write(f"Successfully deleted {amount} unverified users")
+
+        registration_jobs = clean_registration_jobs()
+        self.stdout.write(
+            "Marked {failed} stale registration jobs as failed and deleted "
+            "{deleted} expired ones".format(**registration_jobs)
+        )
@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from base.mock_upstream import (
+    AUTHENTICATIONS_PATH,
+    LATENCY_DISTRIBUTIONS,
+    MockUpstreamOptions,
+    create_mock_upstream_server,
+)
+
+
+class Command(BaseCommand):
+    help = "run a local stand-in of the schedule API of the university"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--host", type=str, default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8001)
+
+        parser.add_argument(
+            "--latency",
+            choices=sorted(LATENCY_DISTRIBUTIONS),
+            default="constant",
+            help="distribution of the latency of each response",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=200,
+            help="value, center, mean or median of the latency distribution",
+        )
+        parser.add_argument(
+            "--latency-spread",
+            type=float,
+            default=0,
+            help="half width in ms of the uniform distribution or sigma of the lognormal",
+        )
+
+        parser.add_argument(
+            "--unauthorized-rate",
+            type=float,
+            default=0,
+            help="fraction of requests answered with 401",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0,
+            help="fraction of requests answered with 500, 502 or 503",
+        )
+        parser.add_argument(
+            "--timeout-rate",
+            type=float,
+            default=0,
+            help="fraction of requests that wait --timeout-seconds before answering",
+        )
+        parser.add_argument("--timeout-seconds", type=float, default=30)
+
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="seed of the generated schedules and of the injected failures",
+        )
+        parser.add_argument("--verbose-requests", action="store_true")
+
+    def handle(self, *args, **options):
+
+        try:
+            mock_options = MockUpstreamOptions(
+                latency=options["latency"],
+                latency_ms=options["latency_ms"],
+                latency_spread=options["latency_spread"],
+                unauthorized_rate=options["unauthorized_rate"],
+                error_rate=options["error_rate"],
+                timeout_rate=options["timeout_rate"],
+                timeout_seconds=options["timeout_seconds"],
+                seed=options["seed"],
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        server = create_mock_upstream_server(
+            options["host"],
+            options["port"],
+            mock_options,
+            verbose=options["verbose_requests"],
+        )
+
+        host, port = server.server_address[:2]
+        self.stdout.write(
+            f"Serving the mock upstream, use UNINORTE_SCHEDULE_API="
+            f"http://{host}:{port}{AUTHENTICATIONS_PATH}"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
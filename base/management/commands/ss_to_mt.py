@@ -31,7 +31,7 @@ class Command(BaseCommand):
         string_schedule = options["string_schedule"]
         if options["username"]:
             user = UninorteUser.objects.get(username=options["username"])
-            string_schedule = user.schedule
+            string_schedule = user.get_schedule().to_string()
 
         if string_schedule:
             bit_matrix = from_string_to_bit_matrix(string_schedule)
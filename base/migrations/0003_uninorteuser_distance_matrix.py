@@ -0,0 +1,69 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def get_packed_distance_matrix(string_schedule):
+
+    """
+    Frozen copy of the distance transform and pack_distance_matrix of
+    base.core.distance_algorithms, so this migration keeps working when
+    that module changes. Each free hour gets the distance to the closest
+    class of its day, days without classes remain in zero
+    """
+
+    distances = []
+    for position, hour_class in enumerate(string_schedule):
+        hour_index, day_index = divmod(position, 7)
+        class_hours = [
+            other_hour_index
+            for other_hour_index in range(14)
+            if string_schedule[other_hour_index * 7 + day_index] == "1"
+        ]
+        if hour_class == "1" or not class_hours:
+            distances.append(0)
+        else:
+            distances.append(
+                min(abs(hour_index - class_hour) for class_hour in class_hours)
+            )
+
+    return bytes(distances)
+
+
+def backfill_distance_matrices(apps, schema_editor):
+    UninorteUser = apps.get_model("base", "UninorteUser")
+
+    users = (
+        UninorteUser.objects.filter(distance_matrix__isnull=True)
+        .only("username", "schedule")
+        .order_by("pk")
+    )
+    # keyset batches, only one batch of users is in memory at a time
+    last_pk = None
+    while True:
+        batch = users if last_pk is None else users.filter(pk__gt=last_pk)
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            break
+
+        for user in batch:
+            user.distance_matrix = get_packed_distance_matrix(user.schedule)
+
+        UninorteUser.objects.bulk_update(batch, ["distance_matrix"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0002_auto_20211226_1954'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uninorteuser',
+            name='distance_matrix',
+            field=models.BinaryField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_distance_matrices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def get_packed_schedule(string_schedule):
+
+    """
+    Frozen copy of Schedule.from_string(...).to_bytes() of
+    base.core.schedule, so this migration keeps working when that module
+    changes. The bit day_index * 14 + hour_index is set when there is a
+    class, stored little endian in 13 bytes
+    """
+
+    bits = 0
+    for position, hour_class in enumerate(string_schedule):
+        if hour_class == "1":
+            hour_index, day_index = divmod(position, 7)
+            bits |= 1 << (day_index * 14 + hour_index)
+
+    return bits.to_bytes(13, "little")
+
+
+def backfill_packed_schedules(apps, schema_editor):
+    UninorteUser = apps.get_model("base", "UninorteUser")
+
+    users = (
+        UninorteUser.objects.filter(packed_schedule__isnull=True)
+        .only("username", "schedule")
+        .order_by("pk")
+    )
+    # keyset batches, only one batch of users is in memory at a time
+    last_pk = None
+    while True:
+        batch = users if last_pk is None else users.filter(pk__gt=last_pk)
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            break
+
+        for user in batch:
+            user.packed_schedule = get_packed_schedule(user.schedule)
+
+        UninorteUser.objects.bulk_update(batch, ["packed_schedule"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_uninorteuser_distance_matrix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uninorteuser',
+            name='packed_schedule',
+            field=models.BinaryField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_packed_schedules, migrations.RunPython.noop),
+    ]
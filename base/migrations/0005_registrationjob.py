@@ -0,0 +1,26 @@
+# Generated by Django 3.0.3 on 2026-10-18 07:58
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_uninorteuser_packed_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=30)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed')], default='pending', max_length=10)),
+                ('schedule', models.CharField(blank=True, max_length=98)),
+                ('error_message', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
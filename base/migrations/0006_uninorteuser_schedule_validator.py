@@ -0,0 +1,19 @@
+# Generated by Django 3.0.3 on 2026-10-18 08:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0005_registrationjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uninorteuser',
+            name='schedule',
+            field=models.CharField(max_length=98, validators=[django.core.validators.RegexValidator('^[01]{98}$', message='El horario debe tener 98 caracteres entre 0 y 1')]),
+        ),
+    ]
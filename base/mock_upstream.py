@@ -0,0 +1,174 @@
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from base.core.constants import HOURS
+
+AUTHENTICATIONS_PATH = "/api/v1/authentications"
+
+# letters used by the university API, the register process maps them to
+# the day index
+UPSTREAM_DAYS = ("L", "M", "I", "J", "V", "S")
+
+FIRST_CLASS_MINUTE = 6 * 60 + 30  # 6:30 AM
+ERROR_STATUS_CODES = (500, 502, 503)
+
+
+def format_time(minutes):
+    hour, minute = divmod(minutes, 60)
+    suffix = "PM" if hour >= 12 else "AM"
+    if hour > 12:
+        hour -= 12
+    return f"{hour}:{minute:02d} {suffix}"
+
+
+def generate_uninorte_schedule(rng):
+
+    """
+    Random schedule with the shape of the university API, the sessions of
+    one hour end at :29 and those of two hours at :28 like the real ones
+    """
+
+    data = []
+    for _ in range(rng.randint(3, 7)):
+        sessions = []
+        for _ in range(rng.randint(1, 3)):
+            hours = rng.choice((1, 2))
+            start_index = rng.randrange(len(HOURS) - hours + 1)
+            start_minute = FIRST_CLASS_MINUTE + start_index * 60
+            sessions.append(
+                {
+                    "day": rng.choice(UPSTREAM_DAYS),
+                    "start_time": HOURS[start_index],
+                    "end_time": format_time(start_minute + hours * 60 - hours),
+                }
+            )
+        data.append({"sessions": sessions})
+
+    return {"data": data}
+
+
+LATENCY_DISTRIBUTIONS = {
+    # latency_ms is the value, the center, the mean or the median
+    "constant": lambda rng, latency_ms, spread: latency_ms,
+    "uniform": lambda rng, latency_ms, spread: rng.uniform(
+        max(0, latency_ms - spread), latency_ms + spread
+    ),
+    "exponential": lambda rng, latency_ms, spread: (
+        rng.expovariate(1 / latency_ms) if latency_ms else 0
+    ),
+    "lognormal": lambda rng, latency_ms, spread: latency_ms
+    * rng.lognormvariate(0, spread),
+}
+
+
+class MockUpstreamOptions:
+
+    """
+    Behavior of the mock, the rates are probabilities of each request and
+    a timeout holds the response for timeout_seconds
+
+    """
+
+    def __init__(
+        self,
+        latency="constant",
+        latency_ms=0,
+        latency_spread=0,
+        unauthorized_rate=0,
+        error_rate=0,
+        timeout_rate=0,
+        timeout_seconds=30,
+        seed=None,
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {latency}")
+        if unauthorized_rate + error_rate + timeout_rate > 1:
+            raise ValueError("The sum of the rates can't be greater than 1")
+
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.unauthorized_rate = unauthorized_rate
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def get_latency(self):
+        latency_ms = LATENCY_DISTRIBUTIONS[self.latency](
+            self.rng, self.latency_ms, self.latency_spread
+        )
+        return latency_ms / 1000
+
+    def get_outcome(self):
+        value = self.rng.random()
+        if value < self.timeout_rate:
+            return "timeout"
+        value -= self.timeout_rate
+        if value < self.unauthorized_rate:
+            return "unauthorized"
+        value -= self.unauthorized_rate
+        if value < self.error_rate:
+            return "error"
+        return "ok"
+
+    def get_schedule_data(self, username):
+        # the same user always gets the same schedule
+        return generate_uninorte_schedule(random.Random(f"{self.seed}:{username}"))
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path.rstrip("/") != AUTHENTICATIONS_PATH:
+            return self.send_json(404, {"detail": "Not found"})
+
+        content_length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(content_length).decode("utf-8"))
+        username = form.get("username", [""])[0]
+        if not username or not form.get("password"):
+            return self.send_json(400, {"detail": "username and password required"})
+
+        options = self.server.options
+        outcome = options.get_outcome()
+        if outcome == "timeout":
+            time.sleep(options.timeout_seconds)
+        else:
+            time.sleep(options.get_latency())
+
+        if outcome == "unauthorized":
+            self.send_json(401, {"detail": "Invalid credentials"})
+        elif outcome == "error":
+            status_code = options.rng.choice(ERROR_STATUS_CODES)
+            self.send_json(status_code, {"detail": "Upstream error"})
+        else:
+            self.send_json(200, options.get_schedule_data(username))
+
+    def send_json(self, status_code, data):
+        body = json.dumps(data).encode("utf-8")
+        try:
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            # the client gave up waiting
+            pass
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_mock_upstream_server(
+    host="127.0.0.1", port=8001, options=None, verbose=False
+):
+    server = ThreadingHTTPServer((host, port), MockUpstreamHandler)
+    server.daemon_threads = True
+    server.options = options or MockUpstreamOptions()
+    server.verbose = verbose
+    return server
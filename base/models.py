@@ -1,9 +1,20 @@
+import uuid
+
 from django.db import models
 
+from base.core.distance_algorithms import (
+    get_distance_matrix_from_string_schedule,
+    pack_distance_matrix,
+)
+from base.core.schedule import Schedule
+from base.custom_validators import string_schedule_validator
+
 
 class UninorteUser(models.Model):
     username = models.CharField(max_length=30, primary_key=True)
-    schedule = models.CharField(max_length=98)  # 14x7 = 98
+    schedule = models.CharField(
+        max_length=98, validators=[string_schedule_validator]
+    )  # 14x7 = 98
     created_at = models.DateField(auto_now_add=True)
 
     # register by password means that you're verified
@@ -11,4 +22,70 @@ class UninorteUser(models.Model):
     # and your record will be deleted on a week
     verified = models.BooleanField(default=False)
 
+    # distance matrix of the schedule, computed on every save so
+    # the results don't need to compute it again (see pack_distance_matrix)
+    distance_matrix = models.BinaryField(null=True, editable=False)
+
+    # the schedule packed in 13 bytes (see Schedule.to_bytes), the string
+    # schedule is still written and read while the clients move to it
+    packed_schedule = models.BinaryField(null=True, editable=False)
+
+    objects = models.Manager()
+
+    def save(self, *args, **kwargs):
+        self.distance_matrix = self.compute_packed_distance_matrix()
+        self.packed_schedule = Schedule.from_string(self.schedule).to_bytes()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "schedule" in update_fields:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "distance_matrix",
+                "packed_schedule",
+            }
+
+        super().save(*args, **kwargs)
+
+    def compute_packed_distance_matrix(self):
+        return pack_distance_matrix(
+            get_distance_matrix_from_string_schedule(self.schedule)
+        )
+
+    def get_packed_distance_matrix(self):
+        if self.distance_matrix is None:
+            return self.compute_packed_distance_matrix()
+        return self.distance_matrix
+
+    def get_schedule(self):
+        if self.packed_schedule is None:
+            return Schedule.from_string(self.schedule)
+        return Schedule.from_bytes(self.packed_schedule)
+
+
+class RegistrationJob(models.Model):
+
+    """
+    Registration that runs in the background, the password is only kept
+    in memory while the job runs and it is never stored
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, PENDING),
+        (RUNNING, RUNNING),
+        (SUCCEEDED, SUCCEEDED),
+        (FAILED, FAILED),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    username = models.CharField(max_length=30)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    schedule = models.CharField(max_length=98, blank=True)
+    error_message = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = models.Manager()
@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection
+from django.dispatch import receiver
+from django.utils import timezone
+
+from base.models import RegistrationJob
+from base.serializers import RegisterSerializer
+
+logger = logging.getLogger(__name__)
+
+UNEXPECTED_ERROR_MESSAGE = "Lo sentimos, ha ocurrido un error inesperado"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# jobs submitted by this process that are still queued or running
+_active_job_ids = set()
+_active_job_ids_lock = threading.Lock()
+_heartbeat = None
+
+
+def get_executor():
+
+    """
+    Return the thread pool of the registration jobs, None when
+    settings.REGISTRATION_JOBS_WORKERS is 0 and the jobs run inline
+
+    """
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is None and settings.REGISTRATION_JOBS_WORKERS:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REGISTRATION_JOBS_WORKERS,
+                thread_name_prefix="registration-job",
+            )
+            start_heartbeat()
+
+    return _executor
+
+
+def start_heartbeat():
+    global _heartbeat
+
+    if _heartbeat is None:
+        _heartbeat = threading.Thread(
+            target=run_heartbeat, name="registration-jobs-heartbeat", daemon=True
+        )
+        _heartbeat.start()
+
+
+def run_heartbeat():
+    while True:
+        time.sleep(settings.REGISTRATION_JOBS_HEARTBEAT)
+        try:
+            touch_active_registration_jobs()
+        except Exception:
+            # the next beat tries again, before the jobs become stale
+            logger.exception("Could not refresh the registration jobs")
+        finally:
+            connection.close()
+
+
+def touch_active_registration_jobs():
+
+    """
+    Refresh updated_at of the jobs of this process that wait in the queue or
+    run, so fail_stale_registration_jobs doesn't take them as lost. Returns
+    the number of jobs
+    """
+
+    with _active_job_ids_lock:
+        job_ids = list(_active_job_ids)
+
+    if not job_ids:
+        return 0
+
+    return RegistrationJob.objects.filter(
+        id__in=job_ids,
+        status__in=[RegistrationJob.PENDING, RegistrationJob.RUNNING],
+    ).update(updated_at=timezone.now())
+
+
+def get_error_message(errors):
+    for messages in errors.values():
+        if messages:
+            return str(messages[0])
+    return UNEXPECTED_ERROR_MESSAGE
+
+
+def run_registration_job(job_id, password):
+
+    """
+    Fetch the schedule of the user from the university API and register it,
+    the outcome is stored in the job. A job already marked as failed by
+    fail_stale_registration_jobs is left as it is
+    """
+
+    started = RegistrationJob.objects.filter(
+        id=job_id, status=RegistrationJob.PENDING
+    ).update(status=RegistrationJob.RUNNING, updated_at=timezone.now())
+    if not started:
+        return
+
+    job = RegistrationJob.objects.get(id=job_id)
+
+    register_serializer = RegisterSerializer(
+        data={
+            "username": job.username,
+            "password": password,
+            "password_confirmation": password,
+        }
+    )
+
+    try:
+        if register_serializer.is_valid():
+            job.schedule = register_serializer.save()["schedule"]
+            job.status = RegistrationJob.SUCCEEDED
+        else:
+            job.error_message = get_error_message(register_serializer.errors)
+            job.status = RegistrationJob.FAILED
+    except Exception:
+        job.error_message = UNEXPECTED_ERROR_MESSAGE
+        job.status = RegistrationJob.FAILED
+
+    RegistrationJob.objects.filter(id=job_id, status=RegistrationJob.RUNNING).update(
+        status=job.status,
+        schedule=job.schedule,
+        error_message=job.error_message,
+        updated_at=timezone.now(),
+    )
+
+
+def run_registration_job_in_thread(job_id, password):
+    try:
+        run_registration_job(job_id, password)
+    finally:
+        with _active_job_ids_lock:
+            _active_job_ids.discard(job_id)
+        # each worker thread has its own connection
+        connection.close()
+
+
+def submit_registration_job(job, password):
+    executor = get_executor()
+    if executor is None:
+        run_registration_job(job.id, password)
+    else:
+        with _active_job_ids_lock:
+            _active_job_ids.add(job.id)
+        executor.submit(run_registration_job_in_thread, job.id, password)
+
+
+def fail_stale_registration_jobs(stale_after=None):
+
+    """
+    Mark as failed the pending and running jobs that were not updated in
+    stale_after seconds (settings.REGISTRATION_JOBS_STALE_AFTER by default),
+    the process that had them stopped its heartbeat because it was restarted
+    or crashed. Returns the number of jobs
+    """
+
+    if stale_after is None:
+        stale_after = settings.REGISTRATION_JOBS_STALE_AFTER
+
+    now = timezone.now()
+    return RegistrationJob.objects.filter(
+        status__in=[RegistrationJob.PENDING, RegistrationJob.RUNNING],
+        updated_at__lte=now - timedelta(seconds=stale_after),
+    ).update(
+        status=RegistrationJob.FAILED,
+        error_message=UNEXPECTED_ERROR_MESSAGE,
+        updated_at=now,
+    )
+
+
+def delete_expired_registration_jobs():
+
+    """
+    Delete the finished jobs older than settings.REGISTRATION_JOBS_TTL
+    seconds, returns the number of jobs
+    """
+
+    amount, _ = RegistrationJob.objects.filter(
+        status__in=[RegistrationJob.SUCCEEDED, RegistrationJob.FAILED],
+        updated_at__lte=timezone.now()
+        - timedelta(seconds=settings.REGISTRATION_JOBS_TTL),
+    ).delete()
+    return amount
+
+
+def clean_registration_jobs():
+    return {
+        "failed": fail_stale_registration_jobs(),
+        "deleted": delete_expired_registration_jobs(),
+    }
+
+
+@receiver(setting_changed)
+def reset_executor(setting, **kwargs):
+    global _executor
+
+    if setting == "REGISTRATION_JOBS_WORKERS":
+        with _executor_lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,75 @@
+import numpy as np
+import orjson
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from base.timing import stage
+
+
+class NumpyJSONEncoder(JSONEncoder):
+
+    """
+    JSONEncoder of DRF that also writes NumPy arrays and scalars
+    """
+
+    def default(self, obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return super().default(obj)
+
+
+_numpy_json_encoder = NumpyJSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    """
+    JSON renderer that writes NumPy arrays and scalars as they are with
+    orjson. Indented output (browsable API or the indent parameter) is left
+    to JSONRenderer
+    """
+
+    encoder_class = NumpyJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with stage("render"):
+            return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(
+            data,
+            default=_numpy_json_encoder.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+
+    """
+    Selected with ?format=columnar or the media type in the Accept header,
+    the views answer with parallel arrays instead of a list of dicts
+    """
+
+    media_type = "application/vnd.findyourgap.columnar+json"
+    format = "columnar"
+
+
+# renderers of the views that support the columnar layout
+COLUMNAR_RENDERER_CLASSES = (
+    FastJSONRenderer,
+    ColumnarJSONRenderer,
+    BrowsableAPIRenderer,
+)
+
+
+def is_columnar_request(request):
+    return isinstance(getattr(request, "accepted_renderer", None), ColumnarJSONRenderer)
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class LRUResultsCacheBackend:
+
+    """
+    In-process cache, the least recently used entry is evicted when the
+    cache is full and entries expire after ttl seconds
+
+    """
+
+    def __init__(self, max_size=512, ttl=300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        # username -> keys of the entries where the user is a member
+        self.keys_by_user = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value, usernames = entry
+            if expires_at <= self.clock():
+                self._delete(key)
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, usernames):
+        with self.lock:
+            if key in self.entries:
+                self._delete(key)
+
+            self.entries[key] = (self.clock() + self.ttl, value, set(usernames))
+            for username in usernames:
+                self.keys_by_user.setdefault(username, set()).add(key)
+
+            while len(self.entries) > self.max_size:
+                self._delete(next(iter(self.entries)))
+
+    def invalidate_users(self, usernames):
+        with self.lock:
+            for username in usernames:
+                for key in self.keys_by_user.get(username, set()).copy():
+                    self._delete(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_user.clear()
+
+    def size(self):
+        return len(self.entries)
+
+    def _delete(self, key):
+        _, _, usernames = self.entries.pop(key)
+        for username in usernames:
+            user_keys = self.keys_by_user.get(username)
+            if user_keys is not None:
+                user_keys.discard(key)
+                if not user_keys:
+                    del self.keys_by_user[username]
+
+
+class DjangoResultsCacheBackend:
+
+    """
+    Cache shared by all the processes through a Django cache, besides the
+    entries it keeps for each user the list of keys where the user is a member
+
+    """
+
+    def __init__(self, alias="default", ttl=300, key_prefix="results"):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    def get(self, key):
+        return self.cache.get(self.get_entry_key(key))
+
+    def set(self, key, value, usernames):
+        entry_key = self.get_entry_key(key)
+        self.cache.set(entry_key, value, self.ttl)
+
+        for username in set(usernames):
+            user_key = self.get_user_key(username)
+            user_entry_keys = self.cache.get(user_key, [])
+            if entry_key not in user_entry_keys:
+                user_entry_keys.append(entry_key)
+            self.cache.set(user_key, user_entry_keys, self.ttl)
+
+    def invalidate_users(self, usernames):
+        for username in usernames:
+            user_key = self.get_user_key(username)
+            self.cache.delete_many([*self.cache.get(user_key, []), user_key])
+
+    def clear(self):
+        self.cache.clear()
+
+    def size(self):
+        # unknown, the cache does not expose it
+        return None
+
+    def get_entry_key(self, key):
+        return f"{self.key_prefix}:entry:{key}"
+
+    def get_user_key(self, username):
+        return f"{self.key_prefix}:user:{username}"
+
+
+class ResultsCache:
+
+    """
+    Cache of the gaps found for a group of users
+
+    The key is built with the sorted usernames, the schedule of each one of
+    them and the options of the request, so a user that changes the schedule
+    never gets old results. The entries of a user are also invalidated
+    when the user registers again or is deleted
+
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(usernames, string_schedules, options):
+        members = sorted(zip(usernames, string_schedules))
+        content = json.dumps(
+            {"members": members, "options": options}, sort_keys=True
+        ).encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, usernames, string_schedules, options):
+        value = self.backend.get(self.get_key(usernames, string_schedules, options))
+
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    def set(self, usernames, string_schedules, options, value):
+        self.backend.set(
+            self.get_key(usernames, string_schedules, options), value, usernames
+        )
+
+    def invalidate_users(self, usernames):
+        self.backend.invalidate_users(usernames)
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0,
+            "size": self.backend.size(),
+        }
+
+
+_results_cache = None
+
+
+def get_results_cache():
+
+    """
+    Return the ResultsCache configured in settings.RESULTS_CACHE, None
+    when the cache is disabled
+
+    """
+
+    global _results_cache
+
+    if _results_cache is None and settings.RESULTS_CACHE:
+        backend_class = import_string(settings.RESULTS_CACHE["BACKEND"])
+        backend = backend_class(**settings.RESULTS_CACHE.get("OPTIONS", {}))
+        _results_cache = ResultsCache(backend)
+
+    return _results_cache
+
+
+def invalidate_users_results(usernames):
+    results_cache = get_results_cache()
+    if results_cache is not None:
+        results_cache.invalidate_users(usernames)
+
+
+@receiver(setting_changed)
+def reset_results_cache(setting, **kwargs):
+    global _results_cache
+
+    if setting == "RESULTS_CACHE":
+        _results_cache = None
@@ -0,0 +1,190 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from base.models import UninorteUser
+
+
+class ScheduleStore:
+
+    """
+    In-process LRU of the schedule and the packed distance matrix of each
+    user, the users that are not in memory are read from the database
+
+    Every write path must invalidate the users it changes, a generation
+    counter avoids storing rows read before an invalidation. The entries
+    expire after ttl seconds, and with versions_cache (the alias of a Django
+    cache shared by the processes, e.g. memcached) an invalidation in any
+    process also reaches the stores of the others: each user has a version
+    in that cache and an entry is only used while its version is current
+
+    """
+
+    def __init__(
+        self, max_size=10_000, ttl=300, clock=time.monotonic, versions_cache=None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.versions_cache = caches[versions_cache] if versions_cache else None
+        # username -> (expires_at, version, (schedule, packed distance matrix))
+        self.entries = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_many(self, usernames):
+
+        """
+        Return a dict username -> (schedule, packed distance matrix) with the
+        users that exist, those not found are missing from the dict
+        """
+
+        usernames = set(usernames)
+        # read before the database, so a row is never newer than its version
+        versions = self.get_versions(usernames)
+
+        found = {}
+        missing_usernames = []
+        with self.lock:
+            now = self.clock()
+            for username in usernames:
+                entry = self.entries.get(username)
+                if (
+                    entry is None
+                    or entry[0] <= now
+                    or entry[1] != versions.get(username)
+                ):
+                    missing_usernames.append(username)
+                else:
+                    self.entries.move_to_end(username)
+                    found[username] = entry[2]
+
+            self.hits += len(found)
+            self.misses += len(missing_usernames)
+            generation = self.generation
+
+        if not missing_usernames:
+            return found
+
+        rows = UninorteUser.objects.filter(username__in=missing_usernames).values_list(
+            "username", "schedule", "distance_matrix"
+        )
+        loaded = {}
+        for username, schedule, distance_matrix in rows:
+            if distance_matrix is not None:
+                distance_matrix = bytes(distance_matrix)
+            loaded[username] = (schedule, distance_matrix)
+        found.update(loaded)
+
+        with self.lock:
+            # expired users that were deleted meanwhile
+            for username in missing_usernames:
+                if username not in loaded:
+                    self.entries.pop(username, None)
+
+            if generation == self.generation:
+                expires_at = self.clock() + self.ttl
+                for username, entry in loaded.items():
+                    self.entries[username] = (
+                        expires_at,
+                        versions.get(username),
+                        entry,
+                    )
+                    self.entries.move_to_end(username)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+
+        return found
+
+    def get(self, username):
+        return self.get_many([username]).get(username)
+
+    def invalidate(self, usernames):
+        with self.lock:
+            self.generation += 1
+            for username in usernames:
+                self.entries.pop(username, None)
+
+        if self.versions_cache is not None:
+            # the versions outlive the entries stored before them
+            self.versions_cache.set_many(
+                {
+                    self.get_version_key(username): uuid.uuid4().hex
+                    for username in usernames
+                },
+                2 * self.ttl,
+            )
+
+    def get_versions(self, usernames):
+        if self.versions_cache is None:
+            return {}
+
+        versions = self.versions_cache.get_many(
+            [self.get_version_key(username) for username in usernames]
+        )
+        return {
+            username: versions.get(self.get_version_key(username))
+            for username in usernames
+        }
+
+    @staticmethod
+    def get_version_key(username):
+        return f"schedule_store:version:{username}"
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def size(self):
+        return len(self.entries)
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0,
+            "size": self.size(),
+        }
+
+
+_schedule_store = None
+
+
+def get_schedule_store():
+
+    """
+    Return the ScheduleStore configured in settings.SCHEDULE_STORE, None
+    when the store is disabled
+
+    """
+
+    global _schedule_store
+
+    if _schedule_store is None and settings.SCHEDULE_STORE:
+        _schedule_store = ScheduleStore(**settings.SCHEDULE_STORE)
+
+    return _schedule_store
+
+
+def invalidate_users_schedules(usernames):
+    schedule_store = get_schedule_store()
+    if schedule_store is not None:
+        schedule_store.invalidate(usernames)
+
+
+@receiver(setting_changed)
+def reset_schedule_store(setting, **kwargs):
+    global _schedule_store
+
+    if setting == "SCHEDULE_STORE":
+        _schedule_store = None
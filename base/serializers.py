@@ -1,35 +1,58 @@
+import functools
+
+import numpy as np
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
-from base.core.analyze_meetings import get_schedule_meeting_data
-from base.core.constants import DAYS
-from base.core.distance_algorithms import get_distance_matrix_from_string_schedule
+from base.core.analyze_meetings import MeetingAccumulator
+from base.core.constants import DAYS, STRING_SCHEDULE_LENGTH
+from base.core.distance_algorithms import unpack_distance_matrices
 from base.core.finder import (
     DEFAULT_MATRIX_COMPUTER_OPTIONS,
     DistanceMatrixComputer,
     GapFinder,
 )
-from base.core.gap_filters import filter_by_days, limit_results
 from base.core.register_user import (
     APIUserRegister,
     ManualRegisterGetter,
     StringScheduleProcessor,
 )
-from base.custom_validators import FileExtensionValidator
-from base.models import UninorteUser
+from base.custom_validators import FileExtensionValidator, string_schedule_validator
+from base.models import RegistrationJob, UninorteUser
+from base.results_cache import get_results_cache, invalidate_users_results
+from base.schedule_store import invalidate_users_schedules
+from base.slot_counters import get_slot_counter
+from base.timing import stage
+from base.user_resolver import resolve_usernames
 
 
-def get_string_schedules_from_username(usernames):
-    users_not_found = []
-    string_schedules = []
+def iter_chunks(usernames, chunk_size):
+    chunk = []
     for username in usernames:
-        try:
-            user = UninorteUser.objects.get(username=username)
-            string_schedules.append(user.schedule)
-        except UninorteUser.DoesNotExist:
-            users_not_found.append(username)
-    return string_schedules, users_not_found
+        chunk.append(username)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def iter_usernames_from_file(file):
+
+    """
+    Generates the usernames of the file line by line, skipping empty lines
+    and duplicates
+    """
+
+    seen_usernames = set()
+    for raw_line in file:
+        for username in raw_line.decode("utf-8").splitlines():
+            if username and username not in seen_usernames:
+                seen_usernames.add(username)
+                yield username
 
 
 class RegisterSerializer(serializers.Serializer):
@@ -44,7 +67,10 @@ class RegisterSerializer(serializers.Serializer):
     password_confirmation = serializers.CharField(max_length=80)
 
     string_schedule = serializers.CharField(
-        min_length=98, max_length=98, required=False
+        min_length=98,
+        max_length=98,
+        required=False,
+        validators=[string_schedule_validator],
     )
 
     def validate(self, data):
@@ -76,6 +102,8 @@ class RegisterSerializer(serializers.Serializer):
             username=validate_data["username"],
             defaults={"schedule": validate_data["string_schedule"], "verified": True},
         )
+        invalidate_users_results([validate_data["username"]])
+        invalidate_users_schedules([validate_data["username"]])
 
         data = {
             "username": validate_data["username"],
@@ -85,6 +113,45 @@ class RegisterSerializer(serializers.Serializer):
         return data
 
 
+class RegisterJobSerializer(serializers.Serializer):
+
+    """
+    Same input of RegisterSerializer, but the schedule is fetched later by
+    a registration job
+
+    """
+
+    username = serializers.CharField(min_length=1, max_length=30)
+    password = serializers.CharField(max_length=80, write_only=True)
+    password_confirmation = serializers.CharField(max_length=80, write_only=True)
+
+    def validate(self, data):
+        if data["password"] != data["password_confirmation"]:
+            raise serializers.ValidationError(_("Las contraseñas no coinciden"))
+
+        return data
+
+    def create(self, validated_data):
+        return RegistrationJob.objects.create(username=validated_data["username"])
+
+
+class RegistrationJobSerializer(serializers.ModelSerializer):
+
+    job_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = RegistrationJob
+        fields = (
+            "job_id",
+            "username",
+            "status",
+            "schedule",
+            "error_message",
+            "created_at",
+            "updated_at",
+        )
+
+
 class UsersSerializer(serializers.Serializer):
 
     usernames = serializers.ListField(
@@ -122,56 +189,190 @@ class UsersSerializer(serializers.Serializer):
         max_length=7,
     )
 
+    # set by validate_usernames
+    resolved_users = None
+
     def validate_usernames(self, usernames):
-        users_not_found = []
-        for username in usernames:
-            try:
-                UninorteUser.objects.get(username=username)
-            except UninorteUser.DoesNotExist:
-                users_not_found.append(username)
+        resolved_users = resolve_usernames(usernames, with_distance_matrix=True)
 
-        if users_not_found:
+        if resolved_users.users_not_found:
             raise serializers.ValidationError(
-                _(
-                    "Los siguientes usuarios no se encontraron {users}".format(
-                        users=", ".join(users_not_found)
-                    )
-                )
+                get_users_not_found_message(resolved_users)
             )
 
+        self.resolved_users = resolved_users
         return usernames
 
+    def validate(self, data):
+        data["resolved_users"] = self.resolved_users
+        return data
+
     def create(self, validated_data):
-        string_schedules = []
-        for username in validated_data["usernames"]:
-            user = UninorteUser.objects.get(username=username)
-            string_schedules.append(user.schedule)
+        resolved_users = validated_data["resolved_users"]
+        return get_gap_results(
+            validated_data,
+            resolved_users.get_string_schedules(),
+            lambda: unpack_distance_matrices(
+                resolved_users.get_packed_distance_matrices()
+            ),
+            columnar=self.context.get("columnar", False),
+        )
 
-        distance_matrices = list(
-            map(get_distance_matrix_from_string_schedule, string_schedules)
+
+def get_users_not_found_message(resolved_users):
+    return _(
+        "Los siguientes usuarios no se encontraron {users}".format(
+            users=", ".join(resolved_users.users_not_found)
         )
+    )
+
+
+def get_gap_results(validated_data, string_schedules, get_distance_matrices, columnar):
+
+    """
+    Find the gaps of the group of users in validated_data (the fields of
+    UsersSerializer), get_distance_matrices is only called when the results
+    are not cached
+    """
+
+    usernames = validated_data["usernames"]
+    matrix_computer_options = {
+        "compute_sd": validated_data["compute_sd"],
+        "no_classes_day": validated_data["no_classes_day"],
+        "ignore_weekend": validated_data["ignore_weekend"],
+    }
+    days_to_filter = sorted(validated_data.get("days_to_filter", []))
+    limit = validated_data.get("limit")
+
+    results_cache = get_results_cache()
+    cache_options = {
+        **matrix_computer_options,
+        "days_to_filter": days_to_filter,
+        "limit": limit,
+        "columnar": columnar,
+    }
+    if results_cache is not None:
+        results = results_cache.get(usernames, string_schedules, cache_options)
+        if results is not None:
+            return results
+
+    with stage("unpack"):
+        distance_matrices = get_distance_matrices()
+
+    with stage("compute"):
         distance_matrix_computer = DistanceMatrixComputer(
-            distance_matrices,
-            options={
-                "compute_sd": validated_data["compute_sd"],
-                "no_classes_day": validated_data["no_classes_day"],
-                "ignore_weekend": validated_data["ignore_weekend"],
-            },
+            distance_matrices, options=matrix_computer_options
+        )
+        gap_finder = GapFinder(
+            distance_matrix_computer, limit=limit, days_to_filter=days_to_filter
         )
 
-        gap_finder = GapFinder(distance_matrix_computer)
+    with stage("find_gaps"):
         gap_finder.find_gaps()
 
-        if "days_to_filter" in validated_data:
-            gap_finder.apply_filter(filter_by_days, validated_data["days_to_filter"])
-        if "limit" in validated_data:
-            gap_finder.apply_filter(limit_results, limit=validated_data["limit"])
+    with stage("format"):
+        if columnar:
+            gaps = gap_finder.get_results_by_column()
+            results = {"count": len(gap_finder.results), "gaps": gaps}
+        else:
+            gaps = gap_finder.get_results()
+            results = {"count": len(gaps), "gaps": gaps}
+
+    if results_cache is not None:
+        results_cache.set(usernames, string_schedules, cache_options, results)
+
+    return results
 
-        gaps = gap_finder.get_results()
 
-        results = {"count": len(gaps), "gaps": gap_finder.get_results()}
+class BatchGroupSerializer(UsersSerializer):
 
-        return results
+    """
+    A group of BatchResultsSerializer, the users of all the groups are
+    resolved together
+    """
+
+    name = serializers.CharField(min_length=1, max_length=50)
+
+    def validate_usernames(self, usernames):
+        return usernames
+
+    def validate(self, data):
+        return data
+
+
+class BatchResultsSerializer(serializers.Serializer):
+
+    groups = BatchGroupSerializer(many=True, allow_empty=False)
+
+    # set by validate_groups
+    resolved_users = None
+
+    def validate_groups(self, groups):
+        if len(groups) > settings.BATCH_RESULTS_MAX_GROUPS:
+            raise serializers.ValidationError(
+                _("No soportamos más de {max_groups} grupos.").format(
+                    max_groups=settings.BATCH_RESULTS_MAX_GROUPS
+                )
+            )
+
+        names = [group["name"] for group in groups]
+        if len(set(names)) != len(names):
+            raise serializers.ValidationError(
+                _("Los nombres de los grupos deben ser únicos.")
+            )
+
+        # each user is fetched once, even if it is a member of many groups
+        usernames = dict.fromkeys(
+            username for group in groups for username in group["usernames"]
+        )
+        resolved_users = resolve_usernames(usernames, with_distance_matrix=True)
+
+        if resolved_users.users_not_found:
+            raise serializers.ValidationError(
+                get_users_not_found_message(resolved_users)
+            )
+
+        self.resolved_users = resolved_users
+        return groups
+
+    def validate(self, data):
+        data["resolved_users"] = self.resolved_users
+        return data
+
+    def create(self, validated_data):
+        resolved_users = validated_data["resolved_users"]
+        columnar = self.context.get("columnar", False)
+
+        # the distance matrix of each user is unpacked once, the groups take
+        # their rows of the shared tensor
+        distance_matrices = None
+        user_indices = {
+            username: user_index
+            for user_index, username in enumerate(resolved_users.usernames)
+        }
+
+        def get_group_distance_matrices(usernames):
+            nonlocal distance_matrices
+            if distance_matrices is None:
+                distance_matrices = unpack_distance_matrices(
+                    resolved_users.get_packed_distance_matrices()
+                )
+            return distance_matrices[[user_indices[username] for username in usernames]]
+
+        groups_results = {}
+        for group in validated_data["groups"]:
+            usernames = group["usernames"]
+            groups_results[group["name"]] = get_gap_results(
+                group,
+                [
+                    resolved_users.get_string_schedule(username)
+                    for username in usernames
+                ],
+                functools.partial(get_group_distance_matrices, usernames),
+                columnar=columnar,
+            )
+
+        return {"groups": groups_results}
 
 
 class MeetingSerializer(serializers.Serializer):
@@ -200,25 +401,28 @@ class MeetingSerializer(serializers.Serializer):
         min_length=1, max_length=30, required=False
     )
 
+    # set by validate_username_to_filter
+    schedule_to_filter = None
+
     def validate_usernames_file(self, file):
-        MAX_FILE_SIZE = 10_000
+        max_file_size = settings.ANALYZE_MAX_FILE_SIZE
         # file is not required, so it may be empty
-        if file and file.size > MAX_FILE_SIZE:
+        if file and file.size > max_file_size:
             raise serializers.ValidationError(
                 _(
-                    "El tamaño del archivo es demasiado grande, Asegúrate de que pese menos de 10KB"
-                )
+                    "El tamaño del archivo es demasiado grande, Asegúrate de que pese menos de {size}KB"
+                ).format(size=max_file_size // 1_000)
             )
         return file
 
     def validate_username_to_filter(self, username):
-        try:
-            if username:
-                UninorteUser.objects.get(username=username)
-        except UninorteUser.DoesNotExist:
+        resolved_users = resolve_usernames([username])
+        if resolved_users.users_not_found:
             raise serializers.ValidationError(
                 _("El usuario para filtrar el horario no existe")
             )
+
+        self.schedule_to_filter = resolved_users.get_string_schedules()[0]
         return username
 
     def validate(self, data):
@@ -227,53 +431,67 @@ class MeetingSerializer(serializers.Serializer):
                 _("Al menos debes proporcionar una forma para obtener los usuarios")
             )
 
-        final_ss = []
+        slot_counts = np.zeros(STRING_SCHEDULE_LENGTH, dtype="int64")
+        total_students = 0
         users_not_found = []
+        chunk_size = settings.ANALYZE_USERNAMES_CHUNK_SIZE
+
+        slot_counter = get_slot_counter()
+
+        def add_usernames(usernames):
+            nonlocal slot_counts, total_students
+            # one query per chunk of usernames, only the counts are kept
+            for chunk in iter_chunks(usernames, chunk_size):
+                with stage("count_slots"):
+                    (
+                        chunk_slot_counts,
+                        chunk_total_students,
+                        chunk_users_not_found,
+                    ) = slot_counter.count(chunk)
+                slot_counts += chunk_slot_counts
+                total_students += chunk_total_students
+                users_not_found.extend(chunk_users_not_found)
+
         if "usernames_file" in data:
-            file = data["usernames_file"]
             try:
-                content = file.read().decode("utf-8")
-                lines = content.splitlines()
-                # delete empty lines and duplicates
-                lines_without_of_spaces = [line for line in lines if line]
-                usernames = set(lines_without_of_spaces)
-
-                # ss = string schedules
-                ss, users_not_found1 = get_string_schedules_from_username(usernames)
-                final_ss.extend(ss)
-                users_not_found.extend(users_not_found1)
+                add_usernames(iter_usernames_from_file(data["usernames_file"]))
             except UnicodeDecodeError:
                 raise serializers.ValidationError(
                     _("Parece que el archivo proporcionado no es texto")
                 )
 
         if "extra_usernames" in data:
-            extra_users = data["extra_usernames"]
-            extra_ss, users_not_found2 = get_string_schedules_from_username(extra_users)
-            final_ss.extend(extra_ss)
-            users_not_found.extend(users_not_found2)
+            add_usernames(data["extra_usernames"])
 
-        if len(final_ss) < 2:
+        if total_students < 2:
             raise serializers.ValidationError(
                 _(
                     "Algunos usuarios no se encontraron, por ende no se puede realizar el análisis"
                 )
             )
 
-        data["final_ss"] = final_ss
+        data["slot_counts"] = slot_counts
+        data["total_students"] = total_students
+        data["schedule_to_filter"] = self.schedule_to_filter
         data["users_not_found"] = users_not_found
 
         return data
 
+    def get_meeting_accumulator(self, validated_data):
+        meeting_accumulator = MeetingAccumulator()
+        meeting_accumulator.add_counts(
+            validated_data["slot_counts"], validated_data["total_students"]
+        )
+        return meeting_accumulator
+
     def create(self, validated_data):
-        final_ss = validated_data["final_ss"]
-        if "username_to_filter" in validated_data:
-            ss_to_filter = UninorteUser.objects.get(
-                username=validated_data["username_to_filter"]
-            ).schedule
-        else:
-            ss_to_filter = None
-        return get_schedule_meeting_data(final_ss, ss_to_filter)
+        meeting_accumulator = self.get_meeting_accumulator(validated_data)
+
+        with stage("meeting_data"):
+            return meeting_accumulator.get_meeting_data(
+                validated_data["schedule_to_filter"],
+                columnar=self.context.get("columnar", False),
+            )
 
 
 class ManualRegisterSerializer(serializers.Serializer):
@@ -334,6 +552,8 @@ class ManualRegisterSerializer(serializers.Serializer):
             username=username,
             schedule=string_schedule,
         )
+        invalidate_users_results([username])
+        invalidate_users_schedules([username])
 
         data = {
             "username": username,
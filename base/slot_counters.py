@@ -0,0 +1,103 @@
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from base.core.analyze_meetings import get_sum_meeting_matrix
+from base.core.constants import STRING_SCHEDULE_LENGTH
+from base.models import UninorteUser
+from base.user_resolver import resolve_usernames
+
+
+class PythonSlotCounter:
+
+    """
+    Read the packed schedules of the users and count the class hours of
+    each position with NumPy
+    """
+
+    def count(self, usernames):
+
+        """
+        Return the number of users with class at each one of the 98
+        positions of the string schedule, the number of users found and the
+        users not found in the given order
+        """
+
+        resolved_users = resolve_usernames(usernames, packed=True)
+        schedules = resolved_users.get_schedules()
+        if schedules:
+            slot_counts = get_sum_meeting_matrix(schedules).reshape(-1)
+        else:
+            slot_counts = np.zeros(STRING_SCHEDULE_LENGTH, dtype="int64")
+
+        return slot_counts, len(schedules), resolved_users.users_not_found
+
+
+class PostgresSlotCounter:
+
+    """
+    Let Postgres count the class hours of each position in a single query,
+    only the counts and the usernames not found are sent back. A username
+    repeated in the request is counted as many times as in PythonSlotCounter
+    """
+
+    def get_query(self):
+        table = UninorteUser._meta.db_table
+        return f"""
+            WITH selected_users AS (
+                SELECT {table}.schedule
+                FROM unnest(%(usernames)s::varchar[]) AS requested(username)
+                JOIN {table} ON {table}.username = requested.username
+            )
+            SELECT
+                ARRAY(
+                    SELECT DISTINCT requested.username
+                    FROM unnest(%(usernames)s::varchar[]) AS requested(username)
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {table}
+                        WHERE {table}.username = requested.username
+                    )
+                ),
+                (SELECT count(*) FROM selected_users),
+                ARRAY(
+                    SELECT count(*) FILTER (
+                        WHERE substr(selected_users.schedule, slot, 1) = '1'
+                    )
+                    FROM generate_series(1, {STRING_SCHEDULE_LENGTH}) AS slot
+                    CROSS JOIN selected_users
+                    GROUP BY slot
+                    ORDER BY slot
+                )
+        """
+
+    def count(self, usernames):
+        usernames = list(usernames)
+        with connection.cursor() as cursor:
+            cursor.execute(self.get_query(), {"usernames": usernames})
+            missing_usernames, total_users, slot_counts = cursor.fetchone()
+
+        # the positions are missing when no user was found
+        if total_users == 0:
+            slot_counts = np.zeros(STRING_SCHEDULE_LENGTH, dtype="int64")
+
+        missing_usernames = set(missing_usernames)
+        users_not_found = [
+            username for username in usernames if username in missing_usernames
+        ]
+        return np.array(slot_counts, dtype="int64"), total_users, users_not_found
+
+
+def get_slot_counter():
+
+    """
+    Return the slot counter of settings.ANALYZE_AGGREGATION_BACKEND, the
+    database backend falls back to Python on databases other than Postgres
+    """
+
+    if (
+        settings.ANALYZE_AGGREGATION_BACKEND == "database"
+        and connection.vendor == "postgresql"
+    ):
+        return PostgresSlotCounter()
+
+    return PythonSlotCounter()
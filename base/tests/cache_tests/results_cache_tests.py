@@ -0,0 +1,180 @@
+import unittest
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from base.models import UninorteUser
+from base.results_cache import (
+    DjangoResultsCacheBackend,
+    LRUResultsCacheBackend,
+    ResultsCache,
+    get_results_cache,
+    reset_results_cache,
+)
+from base.serializers import RegisterSerializer, UsersSerializer
+from base.tests.test_utils import FakeClock, TestsMixin
+from base.urls import cache_stats_view_name
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+OPTIONS = {"compute_sd": False, "limit": None}
+
+LRU_RESULTS_CACHE = {
+    "BACKEND": "base.results_cache.LRUResultsCacheBackend",
+    "OPTIONS": {"max_size": 10, "ttl": 60},
+}
+
+
+class TestLRUResultsCacheBackend(unittest.TestCase):
+    def test_max_size(self):
+
+        backend = LRUResultsCacheBackend(max_size=2, ttl=60)
+        backend.set("a", 1, ["u1"])
+        backend.set("b", 2, ["u2"])
+        # "a" is now the most recently used one
+        self.assertEqual(backend.get("a"), 1)
+        backend.set("c", 3, ["u3"])
+
+        self.assertEqual(backend.size(), 2)
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), 3)
+
+    def test_ttl(self):
+
+        clock = FakeClock()
+        backend = LRUResultsCacheBackend(max_size=2, ttl=60, clock=clock)
+        backend.set("a", 1, ["u1"])
+
+        clock.now = 59
+        self.assertEqual(backend.get("a"), 1)
+        clock.now = 60
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.size(), 0)
+
+    def test_invalidate_users(self):
+
+        backend = LRUResultsCacheBackend()
+        backend.set("a", 1, ["u1", "u2"])
+        backend.set("b", 2, ["u2", "u3"])
+        backend.set("c", 3, ["u3", "u4"])
+
+        backend.invalidate_users(["u2"])
+
+        self.assertIsNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), 3)
+        self.assertNotIn("u1", backend.keys_by_user)
+
+
+class TestDjangoResultsCacheBackend(unittest.TestCase):
+    def test_invalidate_users(self):
+
+        backend = DjangoResultsCacheBackend(key_prefix="test_results")
+        backend.clear()
+        backend.set("a", 1, ["u1", "u2"])
+        backend.set("b", 2, ["u3"])
+
+        self.assertEqual(backend.get("a"), 1)
+        backend.invalidate_users(["u1"])
+
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.get("b"), 2)
+
+
+class TestResultsCache(unittest.TestCase):
+    def test_get_key(self):
+
+        key = ResultsCache.get_key(["u1", "u2"], ["01", "10"], OPTIONS)
+
+        self.assertEqual(key, ResultsCache.get_key(["u2", "u1"], ["10", "01"], OPTIONS))
+        self.assertNotEqual(
+            key, ResultsCache.get_key(["u1", "u2"], ["01", "11"], OPTIONS)
+        )
+        self.assertNotEqual(
+            key,
+            ResultsCache.get_key(["u1", "u2"], ["01", "10"], {**OPTIONS, "limit": 2}),
+        )
+
+    def test_stats(self):
+
+        results_cache = ResultsCache(LRUResultsCacheBackend())
+
+        self.assertIsNone(results_cache.get(["u1", "u2"], ["01", "10"], OPTIONS))
+        results_cache.set(["u1", "u2"], ["01", "10"], OPTIONS, {"count": 0})
+        self.assertEqual(
+            results_cache.get(["u1", "u2"], ["01", "10"], OPTIONS), {"count": 0}
+        )
+
+        self.assertDictEqual(
+            results_cache.stats(),
+            {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1},
+        )
+
+
+@override_settings(RESULTS_CACHE=LRU_RESULTS_CACHE)
+class TestUsersSerializerWithResultsCache(TestCase, TestsMixin):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def setUp(self):
+        reset_results_cache(setting="RESULTS_CACHE")
+
+    def get_results(self):
+        users_serializers = UsersSerializer(
+            data={"usernames": ["my_user_1", "my_user_2"]}
+        )
+        self.assertTrue(users_serializers.is_valid())
+        return users_serializers.save()
+
+    def test_results_are_cached(self):
+
+        results = self.get_results()
+        self.assertEqual(get_results_cache().stats()["misses"], 1)
+
+        self.assertEqual(self.get_results(), results)
+        self.assertEqual(get_results_cache().stats()["hits"], 1)
+
+    @override_settings(
+        SCHEDULE_DATA_FUNCTION="base.tests.test_utils.get_schedule_data_1"
+    )
+    def test_register_invalidates_results(self):
+
+        self.get_results()
+
+        register_serializer = RegisterSerializer(
+            data={
+                "username": "my_user_1",
+                "password": "password",
+                "password_confirmation": "password",
+            }
+        )
+        self.assertTrue(register_serializer.is_valid())
+        register_serializer.save()
+
+        self.assertEqual(get_results_cache().stats()["size"], 0)
+        self.get_results()
+        self.assertEqual(get_results_cache().stats()["misses"], 2)
+
+    def test_cache_stats_view(self):
+
+        self.init()
+        self.get_results()
+
+        self.post(
+            reverse(cache_stats_view_name),
+            data={"secret_code": "DEV-CODE"},
+            status_code=status.HTTP_200_OK,
+        )
+        self.assertEqual(self.json_response["results_cache"]["misses"], 1)
+
+        self.post(
+            reverse(cache_stats_view_name),
+            data={"secret_code": "invalid"},
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
@@ -0,0 +1,162 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from base.models import UninorteUser
+from base.schedule_store import ScheduleStore, get_schedule_store, reset_schedule_store
+from base.serializers import ManualRegisterSerializer, UsersSerializer
+from base.tests.test_utils import FakeClock, TestsMixin
+from base.urls import cache_stats_view_name
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+
+class TestScheduleStore(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def test_read_through(self):
+
+        schedule_store = ScheduleStore()
+
+        with self.assertNumQueries(1):
+            users = schedule_store.get_many(["my_user_1", "my_user_2", "random"])
+        self.assertSetEqual(set(users), {"my_user_1", "my_user_2"})
+        self.assertEqual(users["my_user_1"][0], string_schedule1)
+
+        with self.assertNumQueries(0):
+            users = schedule_store.get_many(["my_user_2", "my_user_1"])
+        self.assertEqual(users["my_user_2"][0], string_schedule2)
+
+        self.assertDictEqual(
+            schedule_store.stats(),
+            {"hits": 2, "misses": 3, "hit_ratio": 0.4, "size": 2},
+        )
+
+    def test_max_size_and_ttl(self):
+
+        clock = FakeClock()
+        schedule_store = ScheduleStore(max_size=1, ttl=10, clock=clock)
+
+        schedule_store.get("my_user_1")
+        schedule_store.get("my_user_2")
+        self.assertEqual(schedule_store.size(), 1)
+        with self.assertNumQueries(0):
+            schedule_store.get("my_user_2")
+
+        clock.now = 10
+        with self.assertNumQueries(1):
+            schedule_store.get("my_user_2")
+
+    def test_invalidate(self):
+
+        schedule_store = ScheduleStore()
+        schedule_store.get("my_user_1")
+
+        UninorteUser.objects.filter(username="my_user_1").update(
+            schedule=string_schedule2
+        )
+        schedule_store.invalidate(["my_user_1"])
+
+        self.assertEqual(schedule_store.get("my_user_1")[0], string_schedule2)
+
+    def test_invalidate_other_processes(self):
+
+        caches["default"].clear()
+        # one store per process, both use the same cache for the versions
+        schedule_store = ScheduleStore(versions_cache="default")
+        other_schedule_store = ScheduleStore(versions_cache="default")
+        schedule_store.get("my_user_1")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(schedule_store.get("my_user_1")[0], string_schedule1)
+
+        UninorteUser.objects.filter(username="my_user_1").update(
+            schedule=string_schedule2
+        )
+        other_schedule_store.invalidate(["my_user_1"])
+
+        self.assertEqual(schedule_store.get("my_user_1")[0], string_schedule2)
+        with self.assertNumQueries(0):
+            self.assertEqual(schedule_store.get("my_user_1")[0], string_schedule2)
+
+
+@override_settings(SCHEDULE_STORE={"max_size": 10}, RESULTS_CACHE=None)
+class TestSerializersWithScheduleStore(TestCase, TestsMixin):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def setUp(self):
+        reset_schedule_store(setting="SCHEDULE_STORE")
+
+    def get_results(self):
+        users_serializers = UsersSerializer(
+            data={"usernames": ["my_user_1", "my_user_2"]}
+        )
+        self.assertTrue(users_serializers.is_valid())
+        return users_serializers.save()
+
+    def test_results_read_the_store(self):
+
+        results = self.get_results()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_results(), results)
+
+    def test_manual_register_invalidates_store(self):
+
+        users_serializers = UsersSerializer(data={"usernames": ["my_user_1", "new"]})
+        self.assertFalse(users_serializers.is_valid())
+
+        serializer = ManualRegisterSerializer(
+            data={"username": "new", "list_of_indices": [[0, 0], [1, 0]]}
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        users_serializers = UsersSerializer(data={"usernames": ["my_user_1", "new"]})
+        self.assertTrue(users_serializers.is_valid())
+
+    def test_user_detail_reads_the_store(self):
+
+        self.init()
+        self.get_results()
+
+        with self.assertNumQueries(0):
+            self.get(
+                reverse("uninorteuser-detail", kwargs={"username": "my_user_1"}),
+                status_code=status.HTTP_200_OK,
+            )
+        self.assertDictEqual(
+            self.json_response, {"username": "my_user_1", "schedule": string_schedule1}
+        )
+
+        self.get(
+            reverse("uninorteuser-detail", kwargs={"username": "random"}),
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_cache_stats_view(self):
+
+        self.init()
+        self.get_results()
+
+        self.post(
+            reverse(cache_stats_view_name),
+            data={"secret_code": "DEV-CODE"},
+            status_code=status.HTTP_200_OK,
+        )
+        self.assertEqual(self.json_response["schedule_store"]["misses"], 2)
+        self.assertIsNone(self.json_response["results_cache"])
+
+
+class TestScheduleStoreSettings(TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_schedule_store())
@@ -0,0 +1,21 @@
+from io import StringIO
+from unittest import TestCase
+
+from django.core.management import call_command
+
+from base.benchmarks import get_benchmarks
+
+
+class BenchmarkCore(TestCase):
+    def test_benchmarks_run(self):
+
+        out = StringIO()
+        call_command(
+            "benchmark_core", "--sizes", "2", "30", "--repeat", "1", stdout=out
+        )
+        output = out.getvalue()
+
+        for benchmark in get_benchmarks():
+            self.assertIn(benchmark.name, output)
+        # one line per benchmark and cohort size plus the header
+        self.assertEqual(len(output.splitlines()), 2 * len(get_benchmarks()) + 2)
@@ -0,0 +1,120 @@
+import random
+import threading
+import unittest
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from base.core.register_user import APIUserRegister
+from base.core.upstream_client import UNAVAILABLE_STATUS_CODE, UpstreamClient
+from base.mock_upstream import (
+    AUTHENTICATIONS_PATH,
+    ERROR_STATUS_CODES,
+    LATENCY_DISTRIBUTIONS,
+    MockUpstreamOptions,
+    create_mock_upstream_server,
+    generate_uninorte_schedule,
+)
+
+CREDENTIALS = {"username": "some_username", "password": "password"}
+
+
+def start_mock_upstream(test_case, **kwargs):
+    server = create_mock_upstream_server(
+        port=0, options=MockUpstreamOptions(seed=10, **kwargs)
+    )
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+
+    host, port = server.server_address
+    return f"http://{host}:{port}{AUTHENTICATIONS_PATH}"
+
+
+class TestMockUpstream(unittest.TestCase):
+    def post(self, url, **kwargs):
+        client = UpstreamClient(url, max_retries=0, backoff_factor=0, **kwargs)
+        self.addCleanup(client.close)
+        return client.post(CREDENTIALS)
+
+    def test_generated_schedule_shape(self):
+
+        schedule_data = generate_uninorte_schedule(random.Random(1))
+
+        self.assertTrue(3 <= len(schedule_data["data"]) <= 7)
+        for subject in schedule_data["data"]:
+            for session in subject["sessions"]:
+                self.assertSetEqual(set(session), {"day", "start_time", "end_time"})
+                self.assertRegex(session["end_time"], r"^\d{1,2}:2[89] (AM|PM)$")
+
+    def test_same_schedule_per_user(self):
+
+        url = start_mock_upstream(self)
+
+        status_code, schedule_data = self.post(url)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(self.post(url), (200, schedule_data))
+
+    def test_failure_rates(self):
+
+        status_code, _ = self.post(start_mock_upstream(self, unauthorized_rate=1))
+        self.assertEqual(status_code, 401)
+
+        status_code, _ = self.post(start_mock_upstream(self, error_rate=1))
+        self.assertIn(status_code, ERROR_STATUS_CODES)
+
+        status_code, _ = self.post(
+            start_mock_upstream(self, timeout_rate=1, timeout_seconds=0.5),
+            read_timeout=0.1,
+        )
+        self.assertEqual(status_code, UNAVAILABLE_STATUS_CODE)
+
+    def test_latency_distributions(self):
+
+        for latency in LATENCY_DISTRIBUTIONS:
+            options = MockUpstreamOptions(
+                latency=latency, latency_ms=100, latency_spread=0.5, seed=1
+            )
+            for _ in range(20):
+                self.assertGreaterEqual(options.get_latency(), 0)
+
+        options = MockUpstreamOptions(
+            latency="uniform", latency_ms=100, latency_spread=50
+        )
+        for _ in range(20):
+            self.assertTrue(0.05 <= options.get_latency() <= 0.15)
+
+    def test_invalid_options(self):
+
+        with self.assertRaises(ValueError):
+            MockUpstreamOptions(latency="random")
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "mock_upstream", "--error-rate", "0.6", "--timeout-rate", "0.6"
+            )
+
+
+class TestAPIUserRegisterWithMockUpstream(SimpleTestCase):
+    def test_get_class_hours(self):
+
+        url = start_mock_upstream(self)
+        schedule_data = MockUpstreamOptions(seed=10).get_schedule_data(
+            CREDENTIALS["username"]
+        )
+
+        with override_settings(
+            SCHEDULE_DATA_FUNCTION="base.core.register_user.get_schedule_data_from_uni_api",
+            UNINORTE_SCHEDULE_API=url,
+        ):
+            aur = APIUserRegister(CREDENTIALS)
+            class_hours = aur.get_class_hours()
+
+        self.assertEqual(aur.uninorte_schedule, schedule_data)
+        number_of_sessions = sum(
+            len(subject["sessions"]) for subject in schedule_data["data"]
+        )
+        self.assertGreaterEqual(len(class_hours), number_of_sessions)
+        for hour_index, day_index in class_hours:
+            self.assertTrue(0 <= hour_index < 14 and 0 <= day_index < 6)
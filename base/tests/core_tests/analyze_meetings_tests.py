@@ -3,15 +3,46 @@ import unittest
 import numpy as np
 
 from base.core.analyze_meetings import (
+    MeetingAccumulator,
+    get_filter_mask,
     get_schedule_meeting_data,
     get_sum_meeting_matrix,
-    is_needed_to_ignore_hour,
 )
+from base.core.schedule_generator import generate_string_schedules
 
 string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
 string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
 
 
+def get_schedule_meeting_data_by_cell(string_schedules, filter_schedule=None):
+    # reference implementation, one dict per cell
+    sum_matrix = get_sum_meeting_matrix(string_schedules)
+    total_students = len(string_schedules)
+    results = []
+    for i in range(14):
+        for j in range(7):
+            number_of_students = total_students - sum_matrix[i][j]
+            results.append(
+                {
+                    "day_index": j,
+                    "hour_index": i,
+                    "number_of_students": number_of_students,
+                    "availability": number_of_students / total_students,
+                }
+            )
+
+    # the weekend and the class hours of the filter schedule are left out
+    return [
+        result
+        for result in results
+        if result["day_index"] < 5
+        and not (
+            filter_schedule
+            and filter_schedule[result["hour_index"] * 7 + result["day_index"]] == "1"
+        )
+    ]
+
+
 class TesAnalyzeMeetings(unittest.TestCase):
     def test_get_sum_meeting_matrix(self):
 
@@ -61,7 +92,7 @@ class TesAnalyzeMeetings(unittest.TestCase):
         self.assertEqual(hour3["availability"], 1)
         self.assertEqual(hour3["number_of_students"], 2)
 
-    def test_is_needed_to_ignore_hour(self):
+    def test_get_filter_mask(self):
 
         schedule = np.array(
             [
@@ -78,23 +109,26 @@ class TesAnalyzeMeetings(unittest.TestCase):
                 [0, 0, 0, 0, 0, 0, 0],
                 [0, 1, 0, 0, 0, 0, 1],
                 [0, 0, 1, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 1, 0, 0],
             ]
         )
 
-        filter_schedule = "11010011000000100000000000000000000000001000000000000000001100000000000000000010000100100000000000"
-
-        result = np.where(schedule == 1)
-        idxs = list(zip(result[0], result[1]))
+        filter_schedule = "".join(str(bit) for bit in schedule.reshape(-1))
+        working_days = np.zeros((14, 7), dtype=bool)
+        working_days[:, :5] = True
 
-        for idx in idxs:
-            self.assertTrue(is_needed_to_ignore_hour(filter_schedule, idx[0], idx[1]))
+        self.assertTrue(np.array_equal(get_filter_mask(), working_days))
 
-        result = np.where(schedule == 0)
-        idxs = list(zip(result[0], result[1]))
+        filter_mask = get_filter_mask(filter_schedule)
+        self.assertTrue(np.array_equal(filter_mask, working_days & (schedule == 0)))
 
-        for idx in idxs:
-            self.assertFalse(is_needed_to_ignore_hour(filter_schedule, idx[0], idx[1]))
+        # first and last hour of the day, friday and the weekend
+        self.assertFalse(filter_mask[0, 0])
+        self.assertTrue(filter_mask[0, 2])
+        self.assertFalse(filter_mask[13, 4])
+        self.assertTrue(filter_mask[13, 3])
+        self.assertTrue(filter_mask[1, 4])
+        self.assertFalse(filter_mask[:, 5:].any())
 
     def test_get_schedule_meeting_data_with_filter(self):
 
@@ -138,3 +172,52 @@ class TesAnalyzeMeetings(unittest.TestCase):
             (result["hour_index"], result["day_index"]) for result in results
         )
         self.assertSetEqual(found_idxs, idxs)
+
+    def test_get_schedule_meeting_data_matches_reference_implementation(self):
+
+        string_schedules = generate_string_schedules(50)
+        filter_schedule = generate_string_schedules(1, seed=1)[0]
+
+        for current_filter in (None, filter_schedule):
+            data = get_schedule_meeting_data(string_schedules, current_filter)
+            expected_results = get_schedule_meeting_data_by_cell(
+                string_schedules, current_filter
+            )
+
+            self.assertEqual(data["total_students"], 50)
+            self.assertListEqual(data["results"], expected_results)
+
+    def test_meeting_accumulator(self):
+
+        string_schedules = generate_string_schedules(50)
+        filter_schedule = generate_string_schedules(1, seed=1)[0]
+
+        meeting_accumulator = MeetingAccumulator()
+        meeting_accumulator.add([])
+        for start in range(0, 50, 16):
+            meeting_accumulator.add(string_schedules[start : start + 16])
+
+        self.assertEqual(meeting_accumulator.total_students, 50)
+        self.assertDictEqual(
+            meeting_accumulator.get_meeting_data(filter_schedule),
+            get_schedule_meeting_data(string_schedules, filter_schedule),
+        )
+
+    def test_columnar_meeting_data(self):
+
+        string_schedules = generate_string_schedules(20)
+        filter_schedule = generate_string_schedules(1, seed=1)[0]
+
+        meeting_accumulator = MeetingAccumulator()
+        meeting_accumulator.add(string_schedules)
+
+        data = meeting_accumulator.get_meeting_data(filter_schedule)
+        columnar_data = meeting_accumulator.get_meeting_data(
+            filter_schedule, columnar=True
+        )
+
+        self.assertEqual(columnar_data["total_students"], data["total_students"])
+        for name, column in columnar_data["results"].items():
+            self.assertListEqual(
+                column.tolist(), [result[name] for result in data["results"]]
+            )
@@ -1,17 +1,111 @@
+import os
+import tempfile
 import unittest
 
 import numpy as np
 
 from base.core.distance_algorithms import (
     apply_distance_to_bit_matrix,
+    apply_distance_to_bit_tensor,
+    build_distance_table,
+    from_string_schedules_to_bit_tensor,
     from_string_to_bit_matrix,
+    get_distance_matrices_from_string_schedules,
+    get_distance_matrix_from_string_schedule,
     indices_of_sub_arrays_of_zeros,
+    load_distance_table,
+    pack_bit_tensor_days,
+    pack_distance_matrix,
     put_distance_to_day,
+    unpack_distance_matrices,
 )
 
 string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
 string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
 
+bit_matrix1 = np.array(
+    [
+        [0, 1, 0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 1, 0, 0],
+        [0, 0, 1, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 1, 1, 0, 1, 0, 0],
+        [0, 1, 1, 0, 1, 0, 0],
+        [1, 0, 1, 0, 0, 0, 0],
+        [1, 1, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+    ]
+)
+
+bit_matrix2 = np.array(
+    [
+        [0, 1, 0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 1, 0, 0],
+        [0, 1, 1, 1, 0, 0, 0],
+        [0, 1, 0, 1, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 1, 0, 1, 0, 0, 0],
+        [1, 1, 0, 1, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+    ]
+)
+
+distance_matrix1 = np.array(
+    [
+        [10, 0, 2, 0, 1, 0, 0],
+        [9, 0, 1, 0, 0, 0, 0],
+        [8, 1, 0, 0, 0, 0, 0],
+        [7, 0, 1, 0, 1, 0, 0],
+        [6, 1, 2, 0, 2, 0, 0],
+        [5, 2, 3, 0, 3, 0, 0],
+        [4, 2, 2, 0, 2, 0, 0],
+        [3, 1, 1, 0, 1, 0, 0],
+        [2, 0, 0, 0, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 2, 0, 0],
+        [1, 1, 1, 0, 3, 0, 0],
+        [2, 2, 2, 0, 4, 0, 0],
+    ]
+)
+
+distance_matrix2 = np.array(
+    [
+        [9, 0, 1, 1, 1, 0, 0],
+        [8, 0, 0, 0, 0, 0, 0],
+        [7, 0, 0, 0, 1, 0, 0],
+        [6, 0, 1, 0, 2, 0, 0],
+        [5, 1, 2, 0, 3, 0, 0],
+        [4, 2, 1, 1, 4, 0, 0],
+        [3, 2, 0, 2, 5, 0, 0],
+        [2, 1, 0, 1, 6, 0, 0],
+        [1, 0, 1, 0, 7, 0, 0],
+        [0, 0, 2, 0, 8, 0, 0],
+        [0, 0, 3, 1, 9, 0, 0],
+        [1, 1, 4, 0, 10, 0, 0],
+        [2, 2, 5, 1, 11, 0, 0],
+        [3, 3, 6, 2, 12, 0, 0],
+    ]
+)
+
+
+def apply_distance_to_bit_matrix_by_day(bit_matrix):
+    # reference implementation, one day at a time
+    for day in bit_matrix.T:
+        for gap in list(indices_of_sub_arrays_of_zeros(day)):
+            put_distance_to_day(*gap, day)
+
 
 class TestDistanceAlgorithms(unittest.TestCase):
     def test_indices_of_sub_arrays_of_zeros(self):
@@ -132,3 +226,107 @@ class TestDistanceAlgorithms(unittest.TestCase):
             ]
         )
         self.assertTrue(np.array_equal(bit_matrix, expected_matrix))
+
+    def test_from_string_schedules_to_bit_tensor(self):
+
+        bit_tensor = from_string_schedules_to_bit_tensor(
+            [string_schedule1, string_schedule2]
+        )
+        self.assertEqual(bit_tensor.shape, (2, 14, 7))
+        self.assertTrue(np.array_equal(bit_tensor[0], bit_matrix1))
+        self.assertTrue(np.array_equal(bit_tensor[1], bit_matrix2))
+
+        bit_tensor = from_string_schedules_to_bit_tensor([])
+        self.assertEqual(bit_tensor.shape, (0, 14, 7))
+
+        with self.assertRaises(ValueError):
+            from_string_schedules_to_bit_tensor([string_schedule1, "0101"])
+
+        # the total length is right, but the rows would be misaligned
+        with self.assertRaises(ValueError):
+            from_string_schedules_to_bit_tensor(
+                [string_schedule1[:-1], string_schedule2 + "0"]
+            )
+
+    def test_get_distance_matrices_from_string_schedules(self):
+
+        distance_tensor = get_distance_matrices_from_string_schedules(
+            [string_schedule1, string_schedule2]
+        )
+        self.assertTrue(np.array_equal(distance_tensor[0], distance_matrix1))
+        self.assertTrue(np.array_equal(distance_tensor[1], distance_matrix2))
+
+    def test_apply_distance_to_bit_tensor(self):
+
+        rng = np.random.default_rng(10)
+        bit_tensor = (rng.random((200, 14, 7)) < 0.25).astype("int16")
+        # days without classes and days full of classes
+        bit_tensor[0] = 0
+        bit_tensor[1] = 1
+        bit_tensor[2, :, 0] = 0
+        bit_tensor[2, 0, 0] = 1
+        bit_tensor[2, :, 1] = 0
+        bit_tensor[2, 13, 1] = 1
+
+        expected_tensor = bit_tensor.copy()
+        for bit_matrix in expected_tensor:
+            apply_distance_to_bit_matrix_by_day(bit_matrix)
+
+        apply_distance_to_bit_tensor(bit_tensor)
+        self.assertTrue(np.array_equal(bit_tensor, expected_tensor))
+
+    def test_pack_bit_tensor_days(self):
+
+        bit_tensor = from_string_schedules_to_bit_tensor([string_schedule1])
+        day_patterns = pack_bit_tensor_days(bit_tensor)
+
+        self.assertEqual(day_patterns.shape, (1, 7))
+        # monday has classes at 4:30 PM (10) and 5:30 PM (11)
+        self.assertEqual(day_patterns[0][0], (1 << 10) | (1 << 11))
+        self.assertEqual(day_patterns[0][3], 0)
+
+    def test_build_distance_table(self):
+
+        distance_table = build_distance_table()
+        self.assertEqual(distance_table.shape, (16384, 14))
+        self.assertFalse(distance_table.flags.writeable)
+
+        for day_pattern in range(16384):
+            day = np.array(
+                [(day_pattern >> i) & 1 for i in range(14)], dtype="int16"
+            ).reshape(14, 1)
+            apply_distance_to_bit_matrix_by_day(day)
+            self.assertListEqual(
+                list(distance_table[day_pattern]), list(day.reshape(14))
+            )
+
+    def test_load_distance_table(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "distance_table.npy")
+
+            distance_table = load_distance_table(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertTrue(np.array_equal(distance_table, build_distance_table()))
+            self.assertFalse(distance_table.flags.writeable)
+
+            # second time is just a read of the file
+            distance_table = load_distance_table(path)
+            self.assertTrue(np.array_equal(distance_table, build_distance_table()))
+            del distance_table
+
+    def test_pack_distance_matrix(self):
+
+        distance_matrix1 = get_distance_matrix_from_string_schedule(string_schedule1)
+        distance_matrix2 = get_distance_matrix_from_string_schedule(string_schedule2)
+
+        packed_distance_matrix = pack_distance_matrix(distance_matrix1)
+        self.assertEqual(len(packed_distance_matrix), 98)
+
+        distance_tensor = unpack_distance_matrices(
+            [packed_distance_matrix, pack_distance_matrix(distance_matrix2)]
+        )
+        self.assertEqual(distance_tensor.dtype, distance_matrix1.dtype)
+        self.assertTrue(distance_tensor.flags.writeable)
+        self.assertTrue(np.array_equal(distance_tensor[0], distance_matrix1))
+        self.assertTrue(np.array_equal(distance_tensor[1], distance_matrix2))
@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+
+from base.core.finder import GAP_WITH_SD_FIELDS
 from base.core.gap_filters import (
     filter_by_days,
     limit_results,
@@ -136,3 +139,30 @@ class TestGapFilters(unittest.TestCase):
         results = filter_by_days(test_gaps, day_indices=[2])
         filtered_results = set(map(lambda e: e["hour_index"], results))
         self.assertSetEqual(filtered_results, set([11, 12, 6]))
+
+    def test_filters_with_columnar_results(self):
+
+        test_gaps = np.array(
+            [
+                (0, 6, 1.0, 0.75, 1.5),
+                (2, 3, 2.5, 0.75, 2.0),
+                (1, 1, 1.0, 0.9, 2.0),
+                (1, 12, 4.0, 0.25, 0.5),
+            ],
+            dtype=GAP_WITH_SD_FIELDS,
+        )
+
+        results = sort_results_by_quality(test_gaps)
+        self.assertListEqual(list(results["hour_index"]), [1, 6, 3, 12])
+
+        results = sort_results(test_gaps, with_sd=False)
+        self.assertListEqual(list(results["hour_index"]), [6, 1, 3, 12])
+
+        results = sort_results(test_gaps, with_sd=True)
+        self.assertListEqual(list(results["hour_index"]), [6, 1, 3, 12])
+
+        results = limit_results(test_gaps, limit=2)
+        self.assertListEqual(list(results["hour_index"]), [6, 3])
+
+        results = filter_by_days(test_gaps, day_indices=[1, 0])
+        self.assertListEqual(list(results["hour_index"]), [3])
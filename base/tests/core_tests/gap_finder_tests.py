@@ -1,18 +1,52 @@
 import unittest
 
-from base.core.constants import AVG_BOUNDRIES, SD_BOUNDRIES
-from base.core.distance_algorithms import get_distance_matrix_from_string_schedule
+import numpy as np
+
+from base.core.constants import AVG_BOUNDRIES, DAYS, HOURS, SD_BOUNDRIES
+from base.core.distance_algorithms import (
+    get_distance_matrices_from_string_schedules,
+    get_distance_matrix_from_string_schedule,
+)
 from base.core.finder import (
     DistanceMatrixComputer,
     GapFinder,
     get_gap_quality,
     get_gap_quality_average,
+    rank_by_quality,
 )
+from base.core.gap_filters import filter_by_days, limit_results
+from base.core.schedule_generator import generate_string_schedules
 
 string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
 string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
 
 
+def find_gaps_by_cell(avg_matrix, sd_matrix):
+    # reference implementation, one dict per cell
+    results = []
+    for i, hour in enumerate(HOURS):
+        for j, day in enumerate(DAYS):
+            if avg_matrix[i][j] != 0:
+                avg = float(avg_matrix[i][j])
+                gap_item = {
+                    "day": day,
+                    "hour": hour,
+                    "avg": avg,
+                    "quality": get_gap_quality_average(avg, *AVG_BOUNDRIES),
+                    "day_index": j,
+                    "hour_index": i,
+                }
+                if sd_matrix is not None:
+                    sd = float(sd_matrix[i][j])
+                    gap_item["sd"] = sd
+                    gap_item["quality"] = get_gap_quality(
+                        avg, sd, *AVG_BOUNDRIES, *SD_BOUNDRIES
+                    )
+                results.append(gap_item)
+
+    return sorted(results, key=lambda gap: gap["quality"], reverse=True)
+
+
 class TestGapFinder(unittest.TestCase):
     def test_find_gaps(self):
         distance_matrices = list(
@@ -99,3 +133,97 @@ class TestGapFinder(unittest.TestCase):
         self.assertAlmostEqual(
             get_gap_quality(13, 6, *AVG_BOUNDRIES, *SD_BOUNDRIES), 0, delta=0.001
         )
+
+    def test_find_gaps_matches_reference_implementation(self):
+
+        for compute_sd in (False, True):
+            for cohort_size in (2, 5, 30):
+                distance_matrices = get_distance_matrices_from_string_schedules(
+                    generate_string_schedules(cohort_size, seed=cohort_size)
+                )
+                distance_matrix_computer = DistanceMatrixComputer(
+                    distance_matrices, options={"compute_sd": compute_sd}
+                )
+
+                gap_finder = GapFinder(distance_matrix_computer)
+                gap_finder.find_gaps()
+
+                expected_results = find_gaps_by_cell(
+                    distance_matrix_computer.get_avg_matrix(),
+                    distance_matrix_computer.get_sd_matrix(),
+                )
+                results = gap_finder.get_results()
+
+                self.assertListEqual(results, expected_results)
+                for result, expected_result in zip(results, expected_results):
+                    self.assertListEqual(list(result), list(expected_result))
+
+    def test_rank_by_quality(self):
+
+        quality = np.array([0.5, 0.9, 0.5, 0.7, 0.5])
+
+        self.assertListEqual(list(rank_by_quality(quality)), [1, 3, 0, 2, 4])
+        self.assertListEqual(list(rank_by_quality(quality, limit=3)), [1, 3, 0])
+        self.assertListEqual(list(rank_by_quality(quality, limit=4)), [1, 3, 0, 2])
+        self.assertListEqual(list(rank_by_quality(quality, limit=1)), [1])
+        self.assertListEqual(list(rank_by_quality(quality, limit=10)), [1, 3, 0, 2, 4])
+        self.assertListEqual(list(rank_by_quality(quality, limit=-1)), [1, 3, 0, 2, 4])
+
+    def test_rank_by_quality_without_places(self):
+
+        quality = np.array([0.5, 0.9, 0.5, 0.7, 0.1])
+        for limit in (0, -2, -10):
+            selected_gaps = rank_by_quality(quality, limit=limit)
+            self.assertEqual(len(selected_gaps), 0)
+            self.assertEqual(selected_gaps.dtype, np.intp)
+
+        self.assertEqual(len(rank_by_quality(np.array([]), limit=0)), 0)
+
+    def test_find_gaps_with_limit_and_days_to_filter(self):
+
+        distance_matrices = get_distance_matrices_from_string_schedules(
+            generate_string_schedules(3)
+        )
+
+        for compute_sd in (False, True):
+            for limit in (2, 5, 13, 200):
+                for days_to_filter in (None, [0], [1, 4]):
+                    options = {"compute_sd": compute_sd}
+
+                    gap_finder = GapFinder(
+                        DistanceMatrixComputer(distance_matrices, options=options)
+                    )
+                    gap_finder.find_gaps()
+                    gap_finder.apply_filter(filter_by_days, days_to_filter)
+                    gap_finder.apply_filter(limit_results, limit=limit)
+
+                    top_k_gap_finder = GapFinder(
+                        DistanceMatrixComputer(distance_matrices, options=options),
+                        limit=limit,
+                        days_to_filter=days_to_filter,
+                    )
+                    top_k_gap_finder.find_gaps()
+
+                    self.assertListEqual(
+                        top_k_gap_finder.get_results(), gap_finder.get_results()
+                    )
+
+    def test_get_results_by_column(self):
+
+        distance_matrices = get_distance_matrices_from_string_schedules(
+            generate_string_schedules(3)
+        )
+        gap_finder = GapFinder(
+            DistanceMatrixComputer(distance_matrices, options={"compute_sd": True}),
+            limit=10,
+        )
+        gap_finder.find_gaps()
+
+        results = gap_finder.get_results()
+        columns = gap_finder.get_results_by_column()
+
+        self.assertSetEqual(set(columns), set(results[0]) - {"day", "hour"})
+        for name, column in columns.items():
+            self.assertListEqual(
+                column.tolist(), [gap_item[name] for gap_item in results]
+            )
@@ -1,14 +1,45 @@
+import itertools
 import unittest
 
 import numpy as np
 
-from base.core.distance_algorithms import get_distance_matrix_from_string_schedule
-from base.core.finder import DistanceMatrixComputer
+from base.core.distance_algorithms import (
+    get_distance_matrices_from_string_schedules,
+    get_distance_matrix_from_string_schedule,
+)
+from base.core.finder import (
+    DistanceMatrixComputer,
+    GapFinder,
+    StreamingDistanceMatrixComputer,
+)
+from base.core.schedule_generator import generate_string_schedules
 
 string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
 string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
 
 
+def compute_matrices_by_user(distance_matrices, options):
+    # reference implementation, one matrix and one day at a time
+    distance_matrices = [matrix.copy() for matrix in distance_matrices]
+
+    if options["no_classes_day"]:
+        for distance_matrix in distance_matrices:
+            for i, day in enumerate(distance_matrix.T):
+                if options["ignore_weekend"] and i > 4:
+                    break
+                if not any(day):
+                    day[:] = 1
+
+    zero_indices = set()
+    for distance_matrix in distance_matrices:
+        zero_indices.update(zip(*np.where(distance_matrix == 0)))
+    for distance_matrix in distance_matrices:
+        for i, j in zero_indices:
+            distance_matrix[i][j] = 0
+
+    return distance_matrices
+
+
 class TestMatrixComputer(unittest.TestCase):
     def test_set_to_one_no_classes_days_default_options(self):
         distance_matrix = get_distance_matrix_from_string_schedule(string_schedule1)
@@ -211,3 +242,96 @@ class TestMatrixComputer(unittest.TestCase):
         dc.compute()
 
         self.assertTrue(np.array_equal(dc.get_sd_matrix(), expected_matrix))
+
+    def test_compute_matches_reference_implementation(self):
+
+        distance_matrices = get_distance_matrices_from_string_schedules(
+            generate_string_schedules(30)
+        )
+        # some users without classes on some days
+        distance_matrices[0, :, 1] = 0
+        distance_matrices[1, :, 5] = 0
+
+        for compute_sd, no_classes_day, ignore_weekend in itertools.product(
+            (False, True), repeat=3
+        ):
+            options = {
+                "compute_sd": compute_sd,
+                "no_classes_day": no_classes_day,
+                "ignore_weekend": ignore_weekend,
+            }
+            expected_matrices = compute_matrices_by_user(distance_matrices, options)
+
+            dc = DistanceMatrixComputer(distance_matrices.copy(), options=options)
+            dc.compute()
+
+            self.assertTrue(np.array_equal(dc.distance_matrices, expected_matrices))
+            self.assertTrue(
+                np.array_equal(dc.get_sum_matrix(), np.sum(expected_matrices, axis=0))
+            )
+            self.assertTrue(
+                np.array_equal(
+                    dc.get_avg_matrix(),
+                    np.mean(expected_matrices, axis=0, dtype="float32"),
+                )
+            )
+
+    def test_streaming_computer_matches_computer(self):
+
+        distance_matrices = get_distance_matrices_from_string_schedules(
+            generate_string_schedules(1000)
+        )
+        distance_matrices[0, :, 1] = 0
+
+        for compute_sd, no_classes_day in itertools.product((False, True), repeat=2):
+            options = {"compute_sd": compute_sd, "no_classes_day": no_classes_day}
+
+            dc = DistanceMatrixComputer(distance_matrices.copy(), options=options)
+            dc.compute()
+
+            streaming_dc = StreamingDistanceMatrixComputer(options=options)
+            streaming_dc.add(distance_matrices[0])
+            streaming_dc.add_chunks(
+                distance_matrices[start : start + 300] for start in range(1, 1000, 300)
+            )
+            streaming_dc.compute()
+
+            self.assertEqual(streaming_dc.count, 1000)
+            self.assertTrue(
+                np.array_equal(streaming_dc.get_sum_matrix(), dc.get_sum_matrix())
+            )
+            self.assertTrue(
+                np.array_equal(streaming_dc.get_avg_matrix(), dc.get_avg_matrix())
+            )
+            if compute_sd:
+                self.assertTrue(
+                    np.allclose(streaming_dc.get_sd_matrix(), dc.get_sd_matrix())
+                )
+            else:
+                self.assertIsNone(streaming_dc.get_sd_matrix())
+
+    def test_streaming_computer_with_gap_finder(self):
+
+        distance_matrices = list(
+            map(
+                get_distance_matrix_from_string_schedule,
+                [string_schedule1, string_schedule2],
+            )
+        )
+
+        gap_finder = GapFinder(DistanceMatrixComputer(distance_matrices))
+        gap_finder.find_gaps()
+
+        streaming_gap_finder = GapFinder(
+            StreamingDistanceMatrixComputer(iter(distance_matrices))
+        )
+        streaming_gap_finder.find_gaps()
+
+        self.assertListEqual(
+            streaming_gap_finder.get_results(), gap_finder.get_results()
+        )
+
+    def test_streaming_computer_without_matrices(self):
+
+        with self.assertRaises(ValueError):
+            StreamingDistanceMatrixComputer().compute()
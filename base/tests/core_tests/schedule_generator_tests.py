@@ -0,0 +1,15 @@
+import unittest
+
+from base.core.schedule_generator import generate_string_schedules
+
+
+class TestScheduleGenerator(unittest.TestCase):
+    def test_generate_string_schedules(self):
+
+        string_schedules = generate_string_schedules(30)
+        self.assertEqual(len(string_schedules), 30)
+        for string_schedule in string_schedules:
+            self.assertEqual(len(string_schedule), 98)
+            self.assertTrue(set(string_schedule) <= {"0", "1"})
+
+        self.assertListEqual(string_schedules, generate_string_schedules(30))
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from base.core.analyze_meetings import get_sum_meeting_matrix
+from base.core.distance_algorithms import (
+    from_packed_schedules_to_bit_tensor,
+    from_string_to_bit_matrix,
+    get_distance_matrices_from_string_schedules,
+)
+from base.core.schedule import Schedule
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+
+class TestSchedule(unittest.TestCase):
+    def test_string_conversion(self):
+
+        schedule = Schedule.from_string(string_schedule1)
+        self.assertEqual(schedule.to_string(), string_schedule1)
+        self.assertEqual(str(Schedule.from_string(string_schedule2)), string_schedule2)
+
+        self.assertEqual(Schedule().to_string(), "0" * 98)
+        self.assertEqual(Schedule.from_string("1" * 98).to_string(), "1" * 98)
+
+        with self.assertRaises(ValueError):
+            Schedule.from_string("0101")
+
+    def test_from_class_hours(self):
+
+        schedule = Schedule.from_class_hours([(0, 1), (1, 1), (10, 0), (11, 0)])
+
+        self.assertTrue(schedule.has_class(0, 1))
+        self.assertTrue(schedule.has_class(11, 0))
+        self.assertFalse(schedule.has_class(0, 0))
+        self.assertEqual(schedule.day_mask(0), (1 << 10) | (1 << 11))
+        self.assertEqual(schedule.day_mask(1), 0b11)
+        self.assertEqual(schedule.day_mask(2), 0)
+
+        with self.assertRaises(ValueError):
+            Schedule.from_class_hours([(14, 0)])
+
+    def test_operations(self):
+
+        schedule1 = Schedule.from_string(string_schedule1)
+        schedule2 = Schedule.from_string(string_schedule2)
+
+        union = schedule1 | schedule2
+        intersection = schedule1 & schedule2
+
+        bit_matrix1 = from_string_to_bit_matrix(string_schedule1)
+        bit_matrix2 = from_string_to_bit_matrix(string_schedule2)
+
+        self.assertTrue(
+            np.array_equal(
+                from_string_to_bit_matrix(union), np.maximum(bit_matrix1, bit_matrix2)
+            )
+        )
+        self.assertTrue(
+            np.array_equal(
+                from_string_to_bit_matrix(intersection), bit_matrix1 * bit_matrix2
+            )
+        )
+
+        self.assertEqual(schedule1.class_hours_count(), string_schedule1.count("1"))
+        self.assertEqual(schedule1.free_slots_count(), string_schedule1.count("0"))
+
+        self.assertEqual(schedule1, Schedule.from_string(string_schedule1))
+        self.assertNotEqual(schedule1, schedule2)
+        self.assertEqual(len({schedule1, Schedule.from_string(string_schedule1)}), 1)
+
+    def test_bytes_conversion(self):
+
+        schedule = Schedule.from_string(string_schedule2)
+        packed_schedule = schedule.to_bytes()
+
+        self.assertEqual(len(packed_schedule), 13)
+        self.assertEqual(Schedule.from_bytes(packed_schedule), schedule)
+
+        bit_tensor = from_packed_schedules_to_bit_tensor(
+            [Schedule.from_string(string_schedule1).to_bytes(), packed_schedule]
+        )
+        self.assertTrue(
+            np.array_equal(bit_tensor[0], from_string_to_bit_matrix(string_schedule1))
+        )
+        self.assertTrue(
+            np.array_equal(bit_tensor[1], from_string_to_bit_matrix(string_schedule2))
+        )
+
+    def test_core_algorithms_accept_schedules(self):
+
+        schedules = [
+            Schedule.from_string(string_schedule1),
+            Schedule.from_string(string_schedule2),
+        ]
+        string_schedules = [string_schedule1, string_schedule2]
+
+        self.assertTrue(
+            np.array_equal(
+                get_distance_matrices_from_string_schedules(schedules),
+                get_distance_matrices_from_string_schedules(string_schedules),
+            )
+        )
+        self.assertTrue(
+            np.array_equal(
+                get_sum_meeting_matrix(schedules),
+                get_sum_meeting_matrix(string_schedules),
+            )
+        )
+
+        # packed schedules as they are read from the database
+        self.assertTrue(
+            np.array_equal(
+                get_sum_meeting_matrix(
+                    [memoryview(schedules[0].to_bytes()), string_schedule2]
+                ),
+                get_sum_meeting_matrix(string_schedules),
+            )
+        )
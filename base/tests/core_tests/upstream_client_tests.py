@@ -0,0 +1,216 @@
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from base.core.register_user import (
+    APIUserRegister,
+    RegisterUserError,
+    get_upstream_client,
+)
+from base.core.upstream_client import (
+    UNAVAILABLE_STATUS_CODE,
+    CircuitBreaker,
+    UpstreamClient,
+)
+from base.tests.test_utils import FakeClock
+
+SCHEDULE_DATA = {"data": []}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    """
+    Answer with the next (status code, delay) of the server responses
+    """
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests += 1
+
+        responses = self.server.responses
+        status_code, delay = responses.pop(0) if len(responses) > 1 else responses[0]
+        time.sleep(delay)
+
+        body = json.dumps(SCHEDULE_DATA).encode("utf-8")
+        try:
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            # the client gave up (read timeout)
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServerMixin:
+    def start_server(self, responses):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.responses = responses
+        self.server.requests = 0
+        self.server.daemon_threads = True
+
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/api/v1/authentications"
+
+
+def get_closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+class TestUpstreamClient(unittest.TestCase, StandInServerMixin):
+    def get_client(self, url, **kwargs):
+        client = UpstreamClient(url, backoff_factor=0, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_success(self):
+
+        client = self.get_client(self.start_server([(200, 0)]))
+
+        self.assertEqual(client.post({"username": "u"}), (200, SCHEDULE_DATA))
+        self.assertEqual(client.post({"username": "u"}), (200, SCHEDULE_DATA))
+        self.assertEqual(self.server.requests, 2)
+
+    def test_unauthorized_is_not_retried(self):
+
+        client = self.get_client(self.start_server([(401, 0)]))
+
+        status_code, _ = client.post({"username": "u"})
+        self.assertEqual(status_code, 401)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_retries(self):
+
+        client = self.get_client(
+            self.start_server([(503, 0), (502, 0), (200, 0)]), max_retries=2
+        )
+
+        self.assertEqual(client.post({"username": "u"}), (200, SCHEDULE_DATA))
+        self.assertEqual(self.server.requests, 3)
+
+    def test_bounded_retries(self):
+
+        client = self.get_client(self.start_server([(503, 0)]), max_retries=2)
+
+        self.assertEqual(client.post({"username": "u"}), (UNAVAILABLE_STATUS_CODE, {}))
+        self.assertEqual(self.server.requests, 3)
+
+    def test_read_timeout(self):
+
+        client = self.get_client(self.start_server([(200, 0.5)]), read_timeout=0.1)
+
+        start = time.perf_counter()
+        self.assertEqual(client.post({"username": "u"}), (UNAVAILABLE_STATUS_CODE, {}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_connection_error(self):
+
+        client = self.get_client(get_closed_port_url(), max_retries=1)
+        self.assertEqual(client.post({"username": "u"}), (UNAVAILABLE_STATUS_CODE, {}))
+
+    def test_circuit_breaker(self):
+
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=10, clock=clock
+        )
+        client = self.get_client(
+            self.start_server([(503, 0), (503, 0), (200, 0)]),
+            max_retries=0,
+            circuit_breaker=circuit_breaker,
+        )
+
+        client.post({"username": "u"})
+        client.post({"username": "u"})
+        self.assertTrue(circuit_breaker.is_open())
+
+        # fails fast without calling the upstream
+        self.assertEqual(client.post({"username": "u"}), (UNAVAILABLE_STATUS_CODE, {}))
+        self.assertEqual(self.server.requests, 2)
+
+        clock.now = 10
+        self.assertEqual(client.post({"username": "u"}), (200, SCHEDULE_DATA))
+        self.assertFalse(circuit_breaker.is_open())
+
+    def test_half_open_failure(self):
+
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=10, clock=clock
+        )
+
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        clock.now = 10
+
+        self.assertTrue(circuit_breaker.allow_request())
+        # only one trial call
+        self.assertFalse(circuit_breaker.allow_request())
+
+        circuit_breaker.record_failure()
+        clock.now = 15
+        self.assertFalse(circuit_breaker.allow_request())
+
+
+class TestAPIUserRegisterWithUpstream(SimpleTestCase, StandInServerMixin):
+    def find_full_uninorte_schedule(self, url):
+        with override_settings(
+            SCHEDULE_DATA_FUNCTION="base.core.register_user.get_schedule_data_from_uni_api",
+            UNINORTE_SCHEDULE_API=url,
+        ):
+            aur = APIUserRegister({"username": "u", "password": "p"})
+            aur.find_full_uninorte_schedule()
+            return aur
+
+    def test_200_full_uninorte_schedule(self):
+
+        aur = self.find_full_uninorte_schedule(self.start_server([(200, 0)]))
+        self.assertEqual(aur.uninorte_schedule, SCHEDULE_DATA)
+
+    @override_settings(
+        ASYNC_VIEWS_WORKERS={"compute": 4, "upstream": 32},
+        REGISTRATION_JOBS_WORKERS=4,
+    )
+    def test_pool_size(self):
+
+        # a connection for each thread that can call the upstream
+        adapter = get_upstream_client().session.get_adapter("https://upstream.test")
+        self.assertEqual(adapter._pool_maxsize, 36)
+
+    @override_settings(
+        UPSTREAM_CLIENT={
+            "connect_timeout": 1,
+            "read_timeout": 1,
+            "max_retries": 0,
+            "backoff_factor": 0,
+            "pool_size": 1,
+            "failure_threshold": 1,
+            "reset_timeout": 30,
+        }
+    )
+    def test_upstream_down(self):
+
+        with self.assertRaises(RegisterUserError) as cm:
+            self.find_full_uninorte_schedule(get_closed_port_url())
+
+        self.assertEqual(str(cm.exception), "Lo sentimos, un error inesperado ocurrió")
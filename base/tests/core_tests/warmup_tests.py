@@ -0,0 +1,34 @@
+import os
+import runpy
+import unittest
+from unittest import mock
+
+from django.conf import settings
+
+from base.core import distance_algorithms
+from base.warmup import warm_up
+
+GUNICORN_CONF_PATH = os.path.join(settings.BASE_DIR, "gunicorn.conf.py")
+
+
+class TestWarmUp(unittest.TestCase):
+    def test_warm_up(self):
+
+        with mock.patch.object(distance_algorithms, "_distance_table", None):
+            self.assertGreater(warm_up(), 0)
+            self.assertIsNotNone(distance_algorithms._distance_table)
+
+    def test_gunicorn_conf(self):
+
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("GUNICORN_WORKERS", None)
+            conf = runpy.run_path(GUNICORN_CONF_PATH)
+
+        self.assertEqual(conf["workers"], conf["cpu_count"] * 2 + 1)
+        self.assertTrue(conf["preload_app"])
+        self.assertGreater(conf["max_requests"], 0)
+
+        with mock.patch.dict(os.environ, {"GUNICORN_WORKERS": "3"}):
+            conf = runpy.run_path(GUNICORN_CONF_PATH)
+
+        self.assertEqual(conf["workers"], 3)
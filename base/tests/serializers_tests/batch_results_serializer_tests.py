@@ -0,0 +1,100 @@
+from django.test import TestCase, override_settings
+
+from base.core.schedule_generator import generate_string_schedules
+from base.models import UninorteUser
+from base.serializers import BatchResultsSerializer, UsersSerializer
+
+
+@override_settings(RESULTS_CACHE=None)
+class TestBatchResultsSerializer(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for user_index, string_schedule in enumerate(generate_string_schedules(6)):
+            UninorteUser.objects.create(
+                username=f"my_user_{user_index}", schedule=string_schedule
+            )
+
+    def get_groups(self):
+        return [
+            {"name": "lab 1", "usernames": ["my_user_0", "my_user_1", "my_user_2"]},
+            {
+                "name": "lab 2",
+                "usernames": ["my_user_2", "my_user_3", "my_user_0"],
+                "compute_sd": True,
+                "limit": 5,
+            },
+            {
+                "name": "lab 3",
+                "usernames": ["my_user_4", "my_user_5"],
+                "ignore_weekend": False,
+                "days_to_filter": [0, 2],
+            },
+        ]
+
+    def test_results_match_users_serializer(self):
+
+        groups = self.get_groups()
+        batch_results_serializer = BatchResultsSerializer(data={"groups": groups})
+        self.assertTrue(batch_results_serializer.is_valid())
+        results = batch_results_serializer.save()
+
+        self.assertListEqual(list(results["groups"]), ["lab 1", "lab 2", "lab 3"])
+        for group in groups:
+            users_serializer = UsersSerializer(
+                data={key: value for key, value in group.items() if key != "name"}
+            )
+            self.assertTrue(users_serializer.is_valid())
+            self.assertDictEqual(
+                results["groups"][group["name"]], users_serializer.save()
+            )
+
+    def test_users_are_fetched_once(self):
+
+        batch_results_serializer = BatchResultsSerializer(
+            data={"groups": self.get_groups()}
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(batch_results_serializer.is_valid())
+            batch_results_serializer.save()
+
+    def test_missing_users_message(self):
+
+        groups = self.get_groups()
+        groups[1]["usernames"].append("omy")
+        groups[2]["usernames"].append("my_user")
+
+        batch_results_serializer = BatchResultsSerializer(data={"groups": groups})
+        self.assertFalse(batch_results_serializer.is_valid())
+        self.assertListEqual(
+            batch_results_serializer.errors["groups"],
+            ["Los siguientes usuarios no se encontraron omy, my_user"],
+        )
+
+    def test_invalid_groups(self):
+
+        groups = self.get_groups()
+        groups[1]["name"] = "lab 1"
+        batch_results_serializer = BatchResultsSerializer(data={"groups": groups})
+        self.assertFalse(batch_results_serializer.is_valid())
+        self.assertTrue("groups" in batch_results_serializer.errors)
+
+        groups = self.get_groups()
+        groups[0]["usernames"] = ["my_user_0"]
+        batch_results_serializer = BatchResultsSerializer(data={"groups": groups})
+        self.assertFalse(batch_results_serializer.is_valid())
+        self.assertTrue("usernames" in batch_results_serializer.errors["groups"][0])
+
+        batch_results_serializer = BatchResultsSerializer(data={"groups": []})
+        self.assertFalse(batch_results_serializer.is_valid())
+
+    @override_settings(BATCH_RESULTS_MAX_GROUPS=2)
+    def test_max_groups(self):
+
+        batch_results_serializer = BatchResultsSerializer(
+            data={"groups": self.get_groups()}
+        )
+        self.assertFalse(batch_results_serializer.is_valid())
+        self.assertListEqual(
+            batch_results_serializer.errors["groups"],
+            ["No soportamos más de 2 grupos."],
+        )
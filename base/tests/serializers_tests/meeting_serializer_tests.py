@@ -1,5 +1,7 @@
-from django.test import TestCase
+import numpy as np
+from django.test import TestCase, override_settings
 
+from base.core.analyze_meetings import get_sum_meeting_matrix
 from base.data_factories import get_random_user
 from base.models import UninorteUser
 from base.serializers import MeetingSerializer
@@ -29,8 +31,19 @@ class TestMeetingSerializer(TestCase):
         meeting_serializer = MeetingSerializer(data=data)
         self.assertTrue(meeting_serializer.is_valid())
 
-        validated_data = meeting_serializer.validated_data
-        self.assertSetEqual(set(validated_data["final_ss"]), self.set_of_schedules)
+        # only the summed counts are kept, not the schedules
+        self.assertEqual(meeting_serializer.validated_data["slot_counts"].shape, (98,))
+
+        meeting_accumulator = meeting_serializer.get_meeting_accumulator(
+            meeting_serializer.validated_data
+        )
+        self.assertEqual(meeting_accumulator.total_students, 3)
+        self.assertTrue(
+            np.array_equal(
+                meeting_accumulator.sum_matrix,
+                get_sum_meeting_matrix(list(self.set_of_schedules)),
+            )
+        )
 
         usernames_file.close()
 
@@ -54,6 +67,7 @@ class TestMeetingSerializer(TestCase):
 
         usernames_file.close()
 
+    @override_settings(ANALYZE_MAX_FILE_SIZE=10_000)
     def test_big_file(self):
 
         usernames_file = create_inmemory_file(content=b"u" * 20000)
@@ -109,9 +123,32 @@ class TestMeetingSerializer(TestCase):
 
         meeting_serializer = MeetingSerializer(data=data)
         self.assertTrue(meeting_serializer.is_valid())
+        self.assertEqual(meeting_serializer.validated_data["total_students"], 3)
+
+    @override_settings(ANALYZE_USERNAMES_CHUNK_SIZE=2)
+    def test_usernames_resolved_in_chunks(self):
+
+        usernames_file = create_inmemory_file(
+            content=b"my_user_0\r\nrandom_1\n\nmy_user_1\nmy_user_2\nrandom_2\n"
+        )
+
+        data = {
+            "usernames_file": usernames_file,
+            "extra_usernames": ["my_user_0", "random_3"],
+        }
+
+        meeting_serializer = MeetingSerializer(data=data)
+        with self.assertNumQueries(4):
+            self.assertTrue(meeting_serializer.is_valid())
+
         validated_data = meeting_serializer.validated_data
-        self.assertEqual(len(validated_data["final_ss"]), 3)
-        self.assertSetEqual(set(validated_data["final_ss"]), self.set_of_schedules)
+        self.assertListEqual(
+            validated_data["users_not_found"], ["random_1", "random_2", "random_3"]
+        )
+        # extra usernames are counted even if they are in the file
+        self.assertEqual(validated_data["total_students"], 4)
+
+        usernames_file.close()
 
     def test_invalid_username_to_filter(self):
 
@@ -124,6 +161,16 @@ class TestMeetingSerializer(TestCase):
         self.assertFalse(meeting_serializer.is_valid())
         self.assertTrue("username_to_filter" in meeting_serializer.errors)
 
+    def test_invalid_username_to_filter_with_other_errors(self):
+
+        data = {"extra_usernames": "my_user_0", "username_to_filter": "random"}
+
+        meeting_serializer = MeetingSerializer(data=data)
+        self.assertFalse(meeting_serializer.is_valid())
+        self.assertSetEqual(
+            set(meeting_serializer.errors), {"extra_usernames", "username_to_filter"}
+        )
+
     def test_hours_filtered_by_user(self):
 
         data = {
@@ -141,3 +188,29 @@ class TestMeetingSerializer(TestCase):
         for result in results:
             current_index_tuple = (result["hour_index"], result["day_index"])
             self.assertTrue(current_index_tuple not in filtered_index)
+
+    def test_user_to_filter_is_fetched_once(self):
+
+        data = {
+            "extra_usernames": ["my_user_0", "my_user_1"],
+            "username_to_filter": self.user_to_filter.username,
+        }
+
+        meeting_serializer = MeetingSerializer(data=data)
+        with self.assertNumQueries(2):
+            self.assertTrue(meeting_serializer.is_valid())
+            meeting_serializer.save()
+
+    def test_users_without_packed_schedule(self):
+
+        data = {"extra_usernames": ["my_user_0", "my_user_1", "my_user_2"]}
+
+        meeting_serializer = MeetingSerializer(data=data)
+        self.assertTrue(meeting_serializer.is_valid())
+        expected_results = meeting_serializer.save()
+
+        UninorteUser.objects.filter(username="my_user_1").update(packed_schedule=None)
+
+        meeting_serializer = MeetingSerializer(data=data)
+        self.assertTrue(meeting_serializer.is_valid())
+        self.assertDictEqual(meeting_serializer.save(), expected_results)
@@ -97,3 +97,23 @@ class TestRegisterSerializer(TestCase, InstanceAssertionsMixin):
         self.assert_instance_exists(UninorteUser, username="some_username")
         self.assertEqual(user.schedule, string_schedule2)
         self.assertTrue(user.verified)
+
+    def test_string_schedule(self):
+
+        data = {
+            "username": "some_username",
+            "password": "password",
+            "password_confirmation": "password",
+            "string_schedule": string_schedule2,
+        }
+
+        users_serializers = RegisterSerializer(data=data)
+        self.assertTrue(users_serializers.is_valid())
+
+        # 98 characters, but not only 0 and 1
+        for string_schedule in ("0" * 97 + "2", "0" * 97 + "ñ", "1" * 97 + " "):
+            users_serializers = RegisterSerializer(
+                data={**data, "string_schedule": string_schedule}
+            )
+            self.assertFalse(users_serializers.is_valid())
+            self.assertTrue("string_schedule" in users_serializers.errors)
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from base.core.analyze_meetings import get_sum_meeting_matrix
+from base.data_factories import get_random_user
+from base.models import UninorteUser
+from base.slot_counters import PostgresSlotCounter, PythonSlotCounter, get_slot_counter
+
+USERNAMES = ["my_user_0", "random_1", "my_user_1", "my_user_0", "my_user_2", "random_2"]
+
+
+class TestSlotCounters(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.schedules = [get_random_user(user_id=i).schedule for i in range(3)]
+
+    def test_python_slot_counter(self):
+
+        slot_counts, total_users, users_not_found = PythonSlotCounter().count(USERNAMES)
+
+        expected_sum_matrix = get_sum_meeting_matrix(
+            [self.schedules[0], self.schedules[1], self.schedules[0], self.schedules[2]]
+        )
+        self.assertTrue(np.array_equal(slot_counts.reshape(14, 7), expected_sum_matrix))
+        self.assertEqual(total_users, 4)
+        self.assertListEqual(users_not_found, ["random_1", "random_2"])
+
+    def test_no_users_found(self):
+
+        slot_counts, total_users, users_not_found = PythonSlotCounter().count(
+            ["random_1"]
+        )
+
+        self.assertEqual(slot_counts.sum(), 0)
+        self.assertEqual(total_users, 0)
+        self.assertListEqual(users_not_found, ["random_1"])
+
+    @override_settings(ANALYZE_AGGREGATION_BACKEND="python")
+    def test_python_backend_setting(self):
+        self.assertIsInstance(get_slot_counter(), PythonSlotCounter)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "the query needs Postgres")
+    def test_postgres_slot_counter_matches_python(self):
+
+        UninorteUser.objects.filter(username="my_user_1").update(packed_schedule=None)
+
+        for usernames in (USERNAMES, ["random_1"], ["my_user_2"]):
+            python_counts, python_total, python_not_found = PythonSlotCounter().count(
+                usernames
+            )
+            counts, total, not_found = PostgresSlotCounter().count(usernames)
+
+            self.assertTrue(np.array_equal(counts, python_counts))
+            self.assertEqual(total, python_total)
+            self.assertListEqual(not_found, python_not_found)
@@ -1,5 +1,10 @@
+import numpy as np
 from django.test import TestCase
 
+from base.core.distance_algorithms import (
+    get_distance_matrix_from_string_schedule,
+    unpack_distance_matrices,
+)
 from base.models import UninorteUser
 from base.serializers import UsersSerializer
 
@@ -73,6 +78,34 @@ class TestUsersSerializer(TestCase):
         self.assertFalse(users_serializers.is_valid())
         self.assertTrue("usernames" in users_serializers.errors)
 
+    def test_missing_users_message(self):
+
+        data = {"usernames": ["omy", "my_user_1", "my_user"]}
+
+        users_serializers = UsersSerializer(data=data)
+        self.assertFalse(users_serializers.is_valid())
+        self.assertListEqual(
+            users_serializers.errors["usernames"],
+            ["Los siguientes usuarios no se encontraron omy, my_user"],
+        )
+
+    def test_missing_users_with_other_errors(self):
+
+        data = {"usernames": ["omy", "my_user_1"], "limit": 1}
+
+        users_serializers = UsersSerializer(data=data)
+        self.assertFalse(users_serializers.is_valid())
+        self.assertSetEqual(set(users_serializers.errors), {"usernames", "limit"})
+
+    def test_users_are_fetched_once(self):
+
+        data = {"usernames": ["my_user_1", "my_user_2"]}
+
+        users_serializers = UsersSerializer(data=data)
+        with self.assertNumQueries(1):
+            self.assertTrue(users_serializers.is_valid())
+            users_serializers.save()
+
     def test_invalid_length_of_usernames(self):
 
         data = {"usernames": ["my_user_1"]}
@@ -246,3 +279,40 @@ class TestUsersSerializer(TestCase):
         found_gaps_indices = map(lambda e: e["day_index"], gaps)
         gaps_on_weekend = any(map(lambda e: e == 5 or e == 6, found_gaps_indices))
         self.assertFalse(gaps_on_weekend)
+
+    def test_distance_matrix_is_stored(self):
+
+        user = UninorteUser.objects.get(username="my_user_1")
+        stored_distance_matrix = unpack_distance_matrices([user.distance_matrix])[0]
+
+        self.assertTrue(
+            np.array_equal(
+                stored_distance_matrix,
+                get_distance_matrix_from_string_schedule(string_schedule1),
+            )
+        )
+
+    def test_packed_schedule_is_stored(self):
+
+        user = UninorteUser.objects.get(username="my_user_1")
+
+        self.assertEqual(len(user.packed_schedule), 13)
+        self.assertEqual(user.get_schedule().to_string(), string_schedule1)
+
+        user.packed_schedule = None
+        self.assertEqual(user.get_schedule().to_string(), string_schedule1)
+
+    def test_results_without_stored_distance_matrix(self):
+
+        UninorteUser.objects.filter(username="my_user_2").update(distance_matrix=None)
+
+        data = {
+            "usernames": ["my_user_1", "my_user_2"],
+        }
+
+        users_serializers = UsersSerializer(data=data)
+        self.assertTrue(users_serializers.is_valid())
+        gaps = users_serializers.save()["gaps"]
+        found_gaps_indices = set(map(lambda e: (e["hour_index"], e["day_index"]), gaps))
+
+        self.assertSetEqual(found_gaps_indices, KNOWN_GAPS)
@@ -38,6 +38,20 @@ def get_schedule_data_4(username, password):
 DATA_FUNC_TEMPLATE = "base.tests.test_utils.get_schedule_data_{0}"
 
 
+class FakeClock:
+
+    """
+    Clock of the caches and the circuit breaker that only moves when the
+    test changes now
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
 class TestsMixin:
     def init(self):
 
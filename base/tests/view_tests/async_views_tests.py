@@ -0,0 +1,302 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponseForbidden
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from rest_framework import status
+
+from base.asgi_handler import AsyncViewsASGIHandler
+from base.models import UninorteUser
+from base.tests.test_utils import DATA_FUNC_TEMPLATE, TestsMixin, get_schedule_data_1
+from base.urls import (
+    analyze_view_name,
+    batch_results_view_name,
+    register_view_name,
+    results_view_name,
+)
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+
+def reject_requests_middleware(get_response):
+    def middleware(request):
+        return HttpResponseForbidden()
+
+    return middleware
+
+
+def get_schedule_data_slowly(username, password):
+    time.sleep(0.3)
+    return get_schedule_data_1(username, password)
+
+
+async def send_asgi_request(
+    handler,
+    method,
+    path,
+    body=b"",
+    content_type=None,
+    query_string=b"",
+    messages=None,
+):
+    headers = [(b"content-length", str(len(body)).encode("ascii"))]
+    if content_type:
+        headers.append((b"content-type", content_type.encode("ascii")))
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "query_string": query_string,
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 5000),
+        "scheme": "http",
+    }
+    # the messages sent by the handler are kept in the list when it is given
+    messages = [] if messages is None else messages
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+
+    response_body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], response_body, time.monotonic()
+
+
+async def post_json(path, data):
+    return await send_asgi_request(
+        AsyncViewsASGIHandler(),
+        "POST",
+        path,
+        json.dumps(data).encode("utf-8"),
+        "application/json",
+    )
+
+
+@override_settings(RESULTS_CACHE=None)
+class TestAsyncViews(TestCase, TestsMixin):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def setUp(self):
+        self.init()
+
+    def assert_same_response(self, path, data, status_code, multipart=False):
+
+        """
+        The async handler must answer exactly like the sync views
+        """
+
+        if multipart:
+            async_status_code, async_body, _ = async_to_sync(send_asgi_request)(
+                AsyncViewsASGIHandler(),
+                "POST",
+                path,
+                encode_multipart(BOUNDARY, data),
+                MULTIPART_CONTENT,
+            )
+        else:
+            async_status_code, async_body, _ = async_to_sync(post_json)(path, data)
+
+        if multipart:
+            self.post(path, data=data, status_code=status_code, multipart=True)
+        else:
+            self.post(path, data=data, status_code=status_code)
+
+        self.assertEqual(async_status_code, status_code)
+        self.assertEqual(json.loads(async_body), self.json_response)
+
+    def test_results_view(self):
+
+        url = reverse(results_view_name)
+        self.assert_same_response(
+            url, {"usernames": ["my_user_1", "my_user_2"]}, status.HTTP_200_OK
+        )
+        self.assert_same_response(
+            url, {"usernames": ["my_user_1", "random"]}, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_batch_results_view(self):
+
+        url = reverse(batch_results_view_name)
+        group = {"name": "lab 1", "usernames": ["my_user_1", "my_user_2"]}
+        self.assert_same_response(url, {"groups": [group]}, status.HTTP_200_OK)
+        self.assert_same_response(
+            url,
+            {"groups": [{**group, "usernames": ["my_user_1", "random"]}]},
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_analyze_meeting_view(self):
+
+        url = reverse(analyze_view_name)
+        self.assert_same_response(
+            url,
+            {"extra_usernames": ["my_user_1", "my_user_2"]},
+            status.HTTP_200_OK,
+            multipart=True,
+        )
+        self.assert_same_response(
+            url, {"extra_usernames": ["my_user_1"]}, status.HTTP_400_BAD_REQUEST
+        )
+
+    @override_settings(SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(1))
+    def test_register_view(self):
+
+        status_code, body, _ = async_to_sync(post_json)(
+            reverse(register_view_name),
+            {
+                "username": "some_username",
+                "password": "password",
+                "password_confirmation": "password",
+            },
+        )
+
+        self.assertEqual(status_code, status.HTTP_201_CREATED)
+        user = UninorteUser.objects.get(username="some_username")
+        self.assertEqual(json.loads(body)["schedule"], user.schedule)
+
+    @override_settings(
+        SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(1),
+        MIDDLEWARE=[
+            "base.tests.view_tests.async_views_tests.reject_requests_middleware"
+        ],
+    )
+    def test_middleware_runs_before_the_view(self):
+
+        status_code, _, _ = async_to_sync(post_json)(
+            reverse(register_view_name),
+            {
+                "username": "some_username",
+                "password": "password",
+                "password_confirmation": "password",
+            },
+        )
+
+        self.assertEqual(status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(UninorteUser.objects.filter(username="some_username").exists())
+
+    def test_columnar_results(self):
+
+        url = reverse(results_view_name)
+        data = {"usernames": ["my_user_1", "my_user_2"]}
+
+        status_code, body, _ = async_to_sync(send_asgi_request)(
+            AsyncViewsASGIHandler(),
+            "POST",
+            url,
+            json.dumps(data).encode("utf-8"),
+            "application/json",
+            b"format=columnar",
+        )
+
+        self.post(f"{url}?format=columnar", data=data, status_code=status.HTTP_200_OK)
+
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(body), json.loads(self.response.content))
+
+    def test_malformed_request(self):
+
+        status_code, _, _ = async_to_sync(send_asgi_request)(
+            AsyncViewsASGIHandler(),
+            "POST",
+            reverse(results_view_name),
+            b"{",
+            "application/json",
+        )
+        self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_requests_use_the_sync_views(self):
+
+        status_code, body, _ = async_to_sync(send_asgi_request)(
+            AsyncViewsASGIHandler(), "GET", "/users/my_user_1"
+        )
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(body)["schedule"], string_schedule1)
+
+
+@override_settings(RESULTS_CACHE=None)
+class TestAsyncViewsConcurrency(TransactionTestCase):
+
+    """
+    asyncio.run instead of async_to_sync, so each request has its own sync
+    thread like under the ASGI server
+    """
+
+    def setUp(self):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    @override_settings(
+        SCHEDULE_DATA_FUNCTION="base.tests.view_tests.async_views_tests.get_schedule_data_slowly"
+    )
+    def test_slow_registration_does_not_block_results(self):
+        async def send_requests():
+            register_data = {
+                "username": "some_username",
+                "password": "password",
+                "password_confirmation": "password",
+            }
+            return await asyncio.gather(
+                post_json(reverse(register_view_name), register_data),
+                post_json(
+                    reverse(results_view_name),
+                    {"usernames": ["my_user_1", "my_user_2"]},
+                ),
+            )
+
+        register_response, results_response = asyncio.run(send_requests())
+
+        self.assertEqual(register_response[0], status.HTTP_201_CREATED)
+        self.assertEqual(results_response[0], status.HTTP_200_OK)
+        # the results are sent while the registration waits for the upstream
+        self.assertLess(results_response[2], register_response[2])
+
+    @override_settings(
+        SCHEDULE_DATA_FUNCTION="base.tests.view_tests.async_views_tests.get_schedule_data_slowly",
+        ASYNC_VIEWS_MAX_REQUESTS=1,
+    )
+    def test_max_requests(self):
+        handler = AsyncViewsASGIHandler()
+
+        async def send_requests():
+            register_data = {
+                "username": "some_username",
+                "password": "password",
+                "password_confirmation": "password",
+            }
+            register_request = send_asgi_request(
+                handler,
+                "POST",
+                reverse(register_view_name),
+                json.dumps(register_data).encode("utf-8"),
+                "application/json",
+            )
+            results_request = send_asgi_request(
+                handler,
+                "POST",
+                reverse(results_view_name),
+                json.dumps({"usernames": ["my_user_1", "my_user_2"]}).encode("utf-8"),
+                "application/json",
+            )
+            return await asyncio.gather(register_request, results_request)
+
+        register_response, results_response = asyncio.run(send_requests())
+
+        self.assertEqual(register_response[0], status.HTTP_201_CREATED)
+        self.assertEqual(results_response[0], status.HTTP_200_OK)
+        # the results wait until the registration frees the only thread
+        self.assertLess(register_response[2], results_response[2])
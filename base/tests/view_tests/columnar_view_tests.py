@@ -0,0 +1,115 @@
+import json
+import unittest
+
+import numpy as np
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from base.models import UninorteUser
+from base.renderers import ColumnarJSONRenderer, FastJSONRenderer
+from base.tests.test_utils import TestsMixin
+from base.urls import analyze_view_name, batch_results_view_name, results_view_name
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+
+class TestFastJSONRenderer(unittest.TestCase):
+    def test_render_numpy_values(self):
+
+        data = {
+            "ints": np.arange(3, dtype="int8"),
+            "floats": np.array([0.5, 1.0]),
+            "count": np.int64(2),
+            "avg": np.float32(0.25),
+        }
+
+        rendered_data = json.loads(FastJSONRenderer().render(data))
+
+        self.assertDictEqual(
+            rendered_data,
+            {"ints": [0, 1, 2], "floats": [0.5, 1.0], "count": 2, "avg": 0.25},
+        )
+        self.assertEqual(
+            FastJSONRenderer().render(data, renderer_context={"indent": 2}).decode(),
+            json.dumps(rendered_data, indent=2),
+        )
+
+
+@override_settings(RESULTS_CACHE=None)
+class TestColumnarViews(TestCase, TestsMixin):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def setUp(self):
+        self.init()
+        self.print_output = False
+
+    def assert_same_columns(self, rows, columns):
+        self.assertSetEqual(set(columns), set(rows[0]) - {"day", "hour"})
+        for name, column in columns.items():
+            self.assertEqual(len(column), len(rows))
+            self.assertListEqual(column, [row[name] for row in rows])
+
+    def test_results_view(self):
+
+        url = reverse(results_view_name)
+        data = {"usernames": ["my_user_1", "my_user_2"], "compute_sd": True}
+
+        self.post(url, data=data, status_code=status.HTTP_200_OK)
+        gaps = self.json_response["gaps"]
+
+        self.post(f"{url}?format=columnar", data=data, status_code=status.HTTP_200_OK)
+        columnar_response = json.loads(self.response.content)
+
+        self.assertEqual(self.response["Content-Type"], ColumnarJSONRenderer.media_type)
+        self.assertEqual(columnar_response["count"], len(gaps))
+        self.assert_same_columns(gaps, columnar_response["gaps"])
+
+    def test_batch_results_view(self):
+
+        url = reverse(batch_results_view_name)
+        data = {
+            "groups": [
+                {"name": "lab 1", "usernames": ["my_user_1", "my_user_2"]},
+                {"name": "lab 2", "usernames": ["my_user_2", "my_user_1"]},
+            ]
+        }
+
+        self.post(url, data=data, status_code=status.HTTP_200_OK)
+        groups_results = self.json_response["groups"]
+
+        self.post(f"{url}?format=columnar", data=data, status_code=status.HTTP_200_OK)
+        columnar_groups_results = json.loads(self.response.content)["groups"]
+
+        self.assertListEqual(list(columnar_groups_results), ["lab 1", "lab 2"])
+        for name, results in groups_results.items():
+            self.assert_same_columns(
+                results["gaps"], columnar_groups_results[name]["gaps"]
+            )
+
+    def test_analyze_meeting_view(self):
+
+        url = reverse(analyze_view_name)
+        data = {"extra_usernames": ["my_user_1", "my_user_2"]}
+
+        self.post(url, data=data, status_code=status.HTTP_200_OK)
+        meeting_data = self.json_response
+
+        self.post(
+            url,
+            data=data,
+            status_code=status.HTTP_200_OK,
+            HTTP_ACCEPT=ColumnarJSONRenderer.media_type,
+        )
+        columnar_meeting_data = json.loads(self.response.content)
+
+        self.assertEqual(
+            columnar_meeting_data["total_students"], meeting_data["total_students"]
+        )
+        self.assert_same_columns(
+            meeting_data["results"], columnar_meeting_data["results"]
+        )
@@ -0,0 +1,195 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from base import registration_jobs
+from base.models import RegistrationJob, UninorteUser
+from base.registration_jobs import (
+    get_executor,
+    run_registration_job,
+    touch_active_registration_jobs,
+)
+from base.tests.test_utils import DATA_FUNC_TEMPLATE, TestsMixin
+from base.urls import del_unverified_view_name, register_job_view_name
+
+DATA = {
+    "username": "some_username",
+    "password": "password",
+    "password_confirmation": "password",
+}
+
+
+def get_job_url(job_id):
+    return reverse("registrationjob-detail", kwargs={"job_id": job_id})
+
+
+@override_settings(REGISTRATION_JOBS_WORKERS=0)
+class TestRegisterJobView(TestCase, TestsMixin):
+    def setUp(self):
+        self.init()
+        self.register_job_url = reverse(register_job_view_name)
+
+    @override_settings(SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(1))
+    def test_successful_job(self):
+
+        self.post(
+            self.register_job_url, data=DATA, status_code=status.HTTP_202_ACCEPTED
+        )
+        job_id = self.json_response["job_id"]
+
+        self.get(get_job_url(job_id), status_code=status.HTTP_200_OK)
+        self.assertEqual(self.json_response["status"], RegistrationJob.SUCCEEDED)
+
+        user = UninorteUser.objects.get(username="some_username")
+        self.assertTrue(user.verified)
+        self.assertEqual(self.json_response["schedule"], user.schedule)
+        self.assertNotIn("password", self.json_response)
+
+    @override_settings(SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(2))
+    def test_failed_job(self):
+
+        self.post(
+            self.register_job_url, data=DATA, status_code=status.HTTP_202_ACCEPTED
+        )
+
+        self.get(
+            get_job_url(self.json_response["job_id"]), status_code=status.HTTP_200_OK
+        )
+        self.assertEqual(self.json_response["status"], RegistrationJob.FAILED)
+        self.assertEqual(
+            self.json_response["error_message"], "Usuario o contraseña incorrecta"
+        )
+        self.assertFalse(UninorteUser.objects.filter(username="some_username").exists())
+
+    def test_invalid_data(self):
+
+        self.post(
+            self.register_job_url,
+            data={**DATA, "password_confirmation": "other"},
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(RegistrationJob.objects.count(), 0)
+
+    def test_job_not_found(self):
+
+        self.get(
+            get_job_url("0c4fd0a1-6b14-4f5c-9d3b-2d0b9c2a7a11"),
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+
+@override_settings(
+    REGISTRATION_JOBS_STALE_AFTER=60,
+    REGISTRATION_JOBS_TTL=3600,
+    DEL_UNVERIFIED_SECRET_CODE="code",
+)
+class TestRegistrationJobsCleanup(TestCase, TestsMixin):
+    def setUp(self):
+        self.init()
+        self.print_output = False
+
+    def create_job(self, job_status, seconds_ago):
+        job = RegistrationJob.objects.create(
+            username="some_username", status=job_status
+        )
+        RegistrationJob.objects.filter(id=job.id).update(
+            updated_at=timezone.now() - timedelta(seconds=seconds_ago)
+        )
+        return job
+
+    def assert_status(self, job, job_status):
+        job.refresh_from_db()
+        self.assertEqual(job.status, job_status)
+
+    def test_queued_jobs_are_refreshed(self):
+
+        queued_job = self.create_job(RegistrationJob.PENDING, 120)
+        lost_job = self.create_job(RegistrationJob.PENDING, 120)
+        finished_job = self.create_job(RegistrationJob.SUCCEEDED, 120)
+
+        registration_jobs._active_job_ids.update([queued_job.id, finished_job.id])
+        try:
+            self.assertEqual(touch_active_registration_jobs(), 1)
+        finally:
+            registration_jobs._active_job_ids.clear()
+
+        self.assertEqual(registration_jobs.fail_stale_registration_jobs(), 1)
+        self.assert_status(queued_job, RegistrationJob.PENDING)
+        self.assert_status(lost_job, RegistrationJob.FAILED)
+        self.assert_status(finished_job, RegistrationJob.SUCCEEDED)
+
+    @override_settings(SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(1))
+    def test_failed_job_is_not_run(self):
+
+        job = self.create_job(RegistrationJob.FAILED, 120)
+
+        run_registration_job(job.id, "password")
+
+        self.assert_status(job, RegistrationJob.FAILED)
+        self.assertFalse(UninorteUser.objects.filter(username="some_username").exists())
+
+    def test_job_failed_while_running_is_not_overwritten(self):
+
+        job = self.create_job(RegistrationJob.PENDING, 1)
+
+        def fail_meanwhile(serializer):
+            registration_jobs.fail_stale_registration_jobs(stale_after=0)
+            return {"schedule": "0" * 98}
+
+        with patch(
+            "base.registration_jobs.RegisterSerializer.is_valid", return_value=True
+        ), patch("base.registration_jobs.RegisterSerializer.save", fail_meanwhile):
+            run_registration_job(job.id, "password")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RegistrationJob.FAILED)
+        self.assertEqual(job.schedule, "")
+
+    def test_cron_view(self):
+
+        stale_job = self.create_job(RegistrationJob.RUNNING, 120)
+        running_job = self.create_job(RegistrationJob.RUNNING, 1)
+        self.create_job(RegistrationJob.SUCCEEDED, 7200)
+        self.create_job(RegistrationJob.FAILED, 7200)
+        finished_job = self.create_job(RegistrationJob.FAILED, 1)
+
+        self.post(
+            reverse(del_unverified_view_name),
+            data={"secret_code": "code"},
+            status_code=status.HTTP_200_OK,
+        )
+
+        self.assertDictEqual(
+            self.json_response["registration_jobs"], {"failed": 1, "deleted": 2}
+        )
+        self.assert_status(stale_job, RegistrationJob.FAILED)
+        self.assert_status(running_job, RegistrationJob.RUNNING)
+        self.assertTrue(RegistrationJob.objects.filter(id=finished_job.id).exists())
+        self.assertEqual(RegistrationJob.objects.count(), 3)
+
+
+@override_settings(
+    REGISTRATION_JOBS_WORKERS=1,
+    SCHEDULE_DATA_FUNCTION=DATA_FUNC_TEMPLATE.format(1),
+)
+class TestRegisterJobViewWithWorkers(TransactionTestCase, TestsMixin):
+    def test_job_runs_in_background(self):
+
+        self.init()
+        self.post(
+            reverse(register_job_view_name),
+            data=DATA,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+        # with a single worker the job is done before the next task runs,
+        # reading the job meanwhile could lock the sqlite tables of the tests
+        get_executor().submit(int).result(timeout=5)
+
+        job = RegistrationJob.objects.get(id=self.json_response["job_id"])
+        self.assertEqual(job.status, RegistrationJob.SUCCEEDED)
+        self.assertTrue(UninorteUser.objects.filter(username="some_username").exists())
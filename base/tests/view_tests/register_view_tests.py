@@ -0,0 +1,40 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from base.models import UninorteUser
+from base.tests.test_utils import TestsMixin
+from base.urls import register_view_name
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+
+
+class TestRegisterView(TestCase, TestsMixin):
+    def setUp(self):
+        self.init()
+        self.register_url = reverse(register_view_name)
+        self.data = {
+            "username": "some_username",
+            "password": "password",
+            "password_confirmation": "password",
+        }
+
+    def test_register_string_schedule(self):
+
+        self.post(
+            self.register_url,
+            data={**self.data, "string_schedule": string_schedule1},
+            status_code=status.HTTP_201_CREATED,
+        )
+        user = UninorteUser.objects.get(username="some_username")
+        self.assertEqual(user.schedule, string_schedule1)
+
+    def test_invalid_string_schedule(self):
+
+        self.post(
+            self.register_url,
+            data={**self.data, "string_schedule": "0" * 97 + "2"},
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertTrue("string_schedule" in self.json_response)
+        self.assertFalse(UninorteUser.objects.exists())
@@ -0,0 +1,179 @@
+import contextvars
+import json
+import unittest
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from base.asgi_handler import AsyncViewsASGIHandler
+from base.models import UninorteUser
+from base.tests.test_utils import TestsMixin
+from base.tests.view_tests.async_views_tests import send_asgi_request
+from base.timing import (
+    RequestTimings,
+    collect_timings,
+    install_timed_execute,
+    set_request_timings,
+    stage,
+    timed_execute,
+)
+from base.urls import analyze_view_name, results_view_name
+
+string_schedule1 = "01000000100100001010001000000000000000000000000000000000011010001101001010000111000000000000000000"
+string_schedule2 = "01000000111100011100001010000001000000000000100000010000010100011010001100000000100000000000000000"
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+class TestRequestTimings(unittest.TestCase):
+    def test_stages(self):
+
+        clock_values = iter([0.0, 1.0, 1.5, 2.0, 2.25, 3.0])
+        timings = RequestTimings(clock=lambda: next(clock_values))
+
+        with timings.stage("compute"):
+            pass
+        with timings.stage("compute"):
+            pass
+
+        self.assertDictEqual(timings.stages, {"compute": 0.75})
+        self.assertEqual(timings.get_total_time(), 3.0)
+        self.assertEqual(
+            timings.to_header(3.0),
+            'compute;dur=750.00, db;desc="0 queries";dur=0.00, total;dur=3000.00',
+        )
+
+    def test_stage_without_timings(self):
+
+        # shared no-op when there is no request being measured
+        self.assertIs(stage("compute"), stage("find_gaps"))
+
+        timings = RequestTimings()
+        with collect_timings(timings):
+            with stage("compute"):
+                pass
+
+        self.assertListEqual(list(timings.stages), ["compute"])
+        with stage("compute"):
+            pass
+        self.assertEqual(len(timings.stages), 1)
+
+
+class TestTimedExecute(TestCase):
+    def test_overlapping_requests(self):
+
+        # two requests using the same connection, one after another
+        first_timings, second_timings = RequestTimings(), RequestTimings()
+        first_context = contextvars.copy_context()
+        first_context.run(set_request_timings, first_timings)
+        second_context = contextvars.copy_context()
+        second_context.run(set_request_timings, second_timings)
+
+        install_timed_execute(connection)
+        install_timed_execute(connection)
+        self.assertEqual(connection.execute_wrappers.count(timed_execute), 1)
+
+        try:
+            first_context.run(UninorteUser.objects.count)
+            second_context.run(UninorteUser.objects.count)
+            second_context.run(UninorteUser.objects.count)
+            first_context.run(UninorteUser.objects.count)
+            # outside of a request
+            UninorteUser.objects.count()
+        finally:
+            connection.execute_wrappers.remove(timed_execute)
+
+        self.assertEqual(first_timings.db_queries, 2)
+        self.assertEqual(second_timings.db_queries, 2)
+
+
+@override_settings(RESULTS_CACHE=None, SERVER_TIMING=True)
+class TestServerTimingMiddleware(TestCase, TestsMixin):
+    @classmethod
+    def setUpTestData(cls):
+        UninorteUser.objects.create(username="my_user_1", schedule=string_schedule1)
+        UninorteUser.objects.create(username="my_user_2", schedule=string_schedule2)
+
+    def setUp(self):
+        self.init()
+        self.print_output = False
+
+    def test_results_stages(self):
+
+        with self.assertNumQueries(1):
+            self.post(
+                reverse(results_view_name),
+                data={"usernames": ["my_user_1", "my_user_2"]},
+                status_code=status.HTTP_200_OK,
+            )
+
+        metrics = parse_server_timing(self.response["Server-Timing"])
+        self.assertListEqual(
+            list(metrics),
+            ["resolve", "unpack", "compute", "find_gaps", "format", "render"]
+            + ["db", "total"],
+        )
+        self.assertEqual(metrics["db"]["desc"], '"1 queries"')
+
+    def test_analyze_stages(self):
+
+        self.post(
+            reverse(analyze_view_name),
+            data={"extra_usernames": ["my_user_1", "my_user_2"]},
+            status_code=status.HTTP_200_OK,
+        )
+
+        metrics = parse_server_timing(self.response["Server-Timing"])
+        self.assertTrue({"count_slots", "meeting_data", "render"} <= set(metrics))
+
+    @override_settings(SERVER_TIMING_LOG=True)
+    def test_log(self):
+
+        with self.assertLogs("base.timing", level="INFO") as logs:
+            self.post(
+                reverse(results_view_name),
+                data={"usernames": ["my_user_1", "my_user_2"]},
+                status_code=status.HTTP_200_OK,
+            )
+
+        log = json.loads(logs.records[0].getMessage())
+        self.assertEqual(log["path"], reverse(results_view_name))
+        self.assertEqual(log["status"], status.HTTP_200_OK)
+        self.assertEqual(log["db_queries"], 1)
+        self.assertTrue("find_gaps" in log["stages_ms"])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self):
+
+        self.post(
+            reverse(results_view_name),
+            data={"usernames": ["my_user_1", "my_user_2"]},
+            status_code=status.HTTP_200_OK,
+        )
+        self.assertFalse(self.response.has_header("Server-Timing"))
+
+    def test_async_views(self):
+
+        messages = []
+        async_to_sync(send_asgi_request)(
+            AsyncViewsASGIHandler(),
+            "POST",
+            reverse(results_view_name),
+            json.dumps({"usernames": ["my_user_1", "my_user_2"]}).encode("utf-8"),
+            "application/json",
+            messages=messages,
+        )
+
+        headers = dict(messages[0]["headers"])
+        metrics = parse_server_timing(headers[b"Server-Timing"].decode())
+        self.assertTrue({"resolve", "find_gaps", "render"} <= set(metrics))
+        self.assertEqual(metrics["db"]["desc"], '"1 queries"')
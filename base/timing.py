@@ -0,0 +1,170 @@
+import contextlib
+import contextvars
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+_null_stage = contextlib.nullcontext()
+
+
+class RequestTimings:
+
+    """
+    Time spent by a request in each stage and in the database
+
+    The same stage can be measured many times (e.g. one group after
+    another), the durations are added up
+
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started_at = clock()
+        self.stages = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + self.clock() - start
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = self.clock()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += self.clock() - start
+
+    def get_total_time(self):
+        return self.clock() - self.started_at
+
+    def to_header(self, total_time):
+
+        """
+        Value of the Server-Timing header, the durations are in milliseconds
+        """
+
+        metrics = [
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()
+        ]
+        metrics.append(
+            f'db;desc="{self.db_queries} queries";dur={self.db_time * 1000:.2f}'
+        )
+        metrics.append(f"total;dur={total_time * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def to_dict(self, total_time):
+        return {
+            "stages_ms": {
+                name: round(seconds * 1000, 3) for name, seconds in self.stages.items()
+            },
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 3),
+            "total_ms": round(total_time * 1000, 3),
+        }
+
+
+def stage(name):
+
+    """
+    Measure the block as the stage name of the current request, when the
+    timings are disabled it is a shared no-op context manager
+    """
+
+    timings = _request_timings.get()
+    if timings is None:
+        return _null_stage
+    return timings.stage(name)
+
+
+def set_request_timings(timings):
+    return _request_timings.set(timings)
+
+
+def reset_request_timings(token):
+    _request_timings.reset(token)
+
+
+@contextlib.contextmanager
+def collect_timings(timings):
+    token = set_request_timings(timings)
+    try:
+        yield timings
+    finally:
+        reset_request_timings(token)
+
+
+def timed_execute(execute, sql, params, many, context):
+
+    """
+    Execute wrapper that stays in the connections, the queries are added to
+    the timings of the request that runs them. Under ASGI the requests can
+    share the connection of a thread, so the timings are looked up for each
+    query instead of wrapping the connection per request
+    """
+
+    timings = _request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def install_timed_execute(connection, **kwargs):
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+class ServerTimingMiddleware:
+
+    """
+    Add the Server-Timing header to every response and log the timings
+    when settings.SERVER_TIMING_LOG is set. Django drops the middleware
+    when settings.SERVER_TIMING is not set
+
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        # the connections opened by any thread from now on
+        connection_created.connect(install_timed_execute, dispatch_uid="server_timing")
+
+    def __call__(self, request):
+        # the connections of this thread may be open already
+        for connection in connections.all():
+            install_timed_execute(connection)
+
+        with collect_timings(RequestTimings()) as timings:
+            response = self.get_response(request)
+
+        total_time = timings.get_total_time()
+        response["Server-Timing"] = timings.to_header(total_time)
+
+        if settings.SERVER_TIMING_LOG:
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        **timings.to_dict(total_time),
+                    }
+                )
+            )
+
+        return response
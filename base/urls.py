@@ -3,12 +3,24 @@ from django.conf.urls import url
 from base import cron_views, views
 
 results_view_name = "results"
+batch_results_view_name = "batch_results"
 register_view_name = "register"
+register_job_view_name = "register_job"
 analyze_view_name = "analyze"
 manual_register_view_name = "manual"
 del_unverified_view_name = "del_unverified"
+cache_stats_view_name = "cache_stats"
 
 urlpatterns = [
+    # anchored and before "register", that pattern matches any path with it
+    url(r"^register/jobs$", views.register_job_view, name=register_job_view_name),
+    url(
+        r"^register/jobs/(?P<job_id>[0-9a-f-]+)$",
+        views.RegistrationJobDetail.as_view(),
+        name=views.RegistrationJobDetail.name,
+    ),
+    # anchored and before "results" for the same reason
+    url(r"^results/batch$", views.batch_results_view, name=batch_results_view_name),
     url(r"results", views.results_view, name=results_view_name),
     url(r"register", views.register_view, name=register_view_name),
     url(r"analyze", views.analyze_meeting_view, name=analyze_view_name),
@@ -17,6 +29,11 @@ urlpatterns = [
         cron_views.delete_unverified_users_view,
         name=del_unverified_view_name,
     ),
+    url(
+        r"cache_stats",
+        cron_views.cache_stats_view,
+        name=cache_stats_view_name,
+    ),
     url(
         r"manual",
         views.ManualRegisterView.as_view(),
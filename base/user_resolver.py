@@ -0,0 +1,116 @@
+from base.core.schedule import Schedule
+from base.models import UninorteUser
+from base.schedule_store import get_schedule_store
+from base.timing import stage
+
+
+class ResolvedUsers:
+
+    """
+    Users fetched by resolve_usernames, keeps the order of the request so
+    the users not found are reported in the same order they were sent
+    """
+
+    def __init__(self, usernames, rows):
+        self.usernames = list(usernames)
+        self.schedules = {}
+        self.distance_matrices = {}
+        for username, schedule, *distance_matrix in rows:
+            self.schedules[username] = schedule
+            if distance_matrix:
+                self.distance_matrices[username] = distance_matrix[0]
+
+        self.users_not_found = [
+            username for username in self.usernames if username not in self.schedules
+        ]
+
+    def get_schedules(self):
+        # string schedules or packed schedules, as they were fetched
+        return [
+            self.schedules[username]
+            for username in self.usernames
+            if username in self.schedules
+        ]
+
+    def get_string_schedules(self):
+        return [
+            self.get_string_schedule(username)
+            for username in self.usernames
+            if username in self.schedules
+        ]
+
+    def get_packed_distance_matrices(self):
+        packed_distance_matrices = []
+        for username in self.usernames:
+            if username not in self.schedules:
+                continue
+
+            packed_distance_matrix = self.distance_matrices.get(username)
+            # rows written without save (e.g. bulk operations) may not have it
+            if packed_distance_matrix is None:
+                with stage("distance_transform"):
+                    packed_distance_matrix = UninorteUser(
+                        username=username, schedule=self.get_string_schedule(username)
+                    ).compute_packed_distance_matrix()
+            packed_distance_matrices.append(packed_distance_matrix)
+
+        return packed_distance_matrices
+
+    def get_string_schedule(self, username):
+        schedule = self.schedules[username]
+        if isinstance(schedule, str):
+            return schedule
+        return Schedule.from_bytes(schedule).to_string()
+
+
+def resolve_usernames(usernames, with_distance_matrix=False, packed=False):
+
+    """
+    Fetch all the requested users with a single IN query that returns only
+    the username and the schedule (and the packed distance matrix if needed),
+    the schedule store answers first when it is enabled
+
+    With packed the 13 bytes of packed_schedule are read instead of the
+    string schedule, the few rows without it are read again as strings
+
+    The schedule store keeps the string schedule and the distance matrix of
+    every user, so when it is enabled both flags are ignored: the schedules
+    are strings and the distance matrices are always there. ResolvedUsers
+    reads both forms of the schedule
+    """
+
+    with stage("resolve"):
+        return _resolve_usernames(list(usernames), with_distance_matrix, packed)
+
+
+def _resolve_usernames(usernames, with_distance_matrix, packed):
+    schedule_store = get_schedule_store()
+    if schedule_store is not None:
+        users = schedule_store.get_many(usernames)
+        rows = [
+            (username, schedule, distance_matrix)
+            for username, (schedule, distance_matrix) in users.items()
+        ]
+        return ResolvedUsers(usernames, rows)
+
+    fields = ["username", "packed_schedule" if packed else "schedule"]
+    if with_distance_matrix:
+        fields.append("distance_matrix")
+
+    rows = list(
+        UninorteUser.objects.filter(username__in=set(usernames)).values_list(*fields)
+    )
+
+    unpacked_usernames = [row[0] for row in rows if row[1] is None]
+    if unpacked_usernames:
+        string_schedules = dict(
+            UninorteUser.objects.filter(username__in=unpacked_usernames).values_list(
+                "username", "schedule"
+            )
+        )
+        rows = [
+            (row[0], string_schedules[row[0]], *row[2:]) if row[1] is None else row
+            for row in rows
+        ]
+
+    return ResolvedUsers(usernames, rows)
@@ -1,13 +1,20 @@
+from django.http import Http404
 from rest_framework import generics, status, views
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 
-from base.models import UninorteUser
+from base.models import RegistrationJob, UninorteUser
+from base.registration_jobs import submit_registration_job
+from base.renderers import COLUMNAR_RENDERER_CLASSES, is_columnar_request
+from base.schedule_store import get_schedule_store
 from base.serializers import (
+    BatchResultsSerializer,
     ManualRegisterSerializer,
     MeetingSerializer,
+    RegisterJobSerializer,
     RegisterSerializer,
+    RegistrationJobSerializer,
     UninorteUserSerializer,
     UsersSerializer,
 )
@@ -31,6 +38,30 @@ def register_view(request):
 
 
 @api_view(["POST"])
+def register_job_view(request):
+
+    """
+    Enqueue the registration of an uninorte user, the job id is used to
+    follow the registration in the job detail
+
+    """
+
+    register_job_serializer = RegisterJobSerializer(data=request.data)
+
+    if register_job_serializer.is_valid():
+        job = register_job_serializer.save()
+        submit_registration_job(job, register_job_serializer.validated_data["password"])
+        return Response(
+            {"job_id": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED
+        )
+    else:
+        return Response(
+            register_job_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+@api_view(["POST"])
+@renderer_classes(COLUMNAR_RENDERER_CLASSES)
 def results_view(request):
 
     """
@@ -38,7 +69,9 @@ def results_view(request):
 
     """
 
-    users_serializers = UsersSerializer(data=request.data)
+    users_serializers = UsersSerializer(
+        data=request.data, context={"columnar": is_columnar_request(request)}
+    )
 
     if users_serializers.is_valid():
         results = users_serializers.save()
@@ -48,13 +81,39 @@ def results_view(request):
 
 
 @api_view(["POST"])
+@renderer_classes(COLUMNAR_RENDERER_CLASSES)
+def batch_results_view(request):
+
+    """
+    Return the gaps of many groups of users, the results are keyed by the
+    name of the group
+
+    """
+
+    batch_results_serializer = BatchResultsSerializer(
+        data=request.data, context={"columnar": is_columnar_request(request)}
+    )
+
+    if batch_results_serializer.is_valid():
+        results = batch_results_serializer.save()
+        return Response(results, status=status.HTTP_200_OK)
+    else:
+        return Response(
+            batch_results_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+@api_view(["POST"])
+@renderer_classes(COLUMNAR_RENDERER_CLASSES)
 def analyze_meeting_view(request):
 
     """
     Return all availability information about the hours of the schedule
     """
 
-    meeting_serializer = MeetingSerializer(data=request.data)
+    meeting_serializer = MeetingSerializer(
+        data=request.data, context={"columnar": is_columnar_request(request)}
+    )
 
     if meeting_serializer.is_valid():
         results = meeting_serializer.save()
@@ -81,9 +140,31 @@ class ManualRegisterView(views.APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class RegistrationJobDetail(generics.RetrieveAPIView):
+
+    queryset = RegistrationJob.objects.all()
+    serializer_class = RegistrationJobSerializer
+    name = "registrationjob-detail"
+    lookup_field = "id"
+    lookup_url_kwarg = "job_id"
+
+
 class UninorteUserDetail(generics.RetrieveAPIView):
 
     queryset = UninorteUser.objects.all()
     serializer_class = UninorteUserSerializer
     name = "uninorteuser-detail"
     lookup_field = "username"
+
+    def get_object(self):
+        schedule_store = get_schedule_store()
+        if schedule_store is None:
+            return super().get_object()
+
+        username = self.kwargs[self.lookup_field]
+        user = schedule_store.get(username)
+        if user is None:
+            raise Http404
+
+        schedule, _ = user
+        return UninorteUser(username=username, schedule=schedule)
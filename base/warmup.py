@@ -0,0 +1,50 @@
+import time
+
+from base.core.analyze_meetings import MeetingAccumulator
+from base.core.distance_algorithms import (
+    get_distance_matrices_from_string_schedules,
+    get_distance_table,
+)
+from base.core.finder import DistanceMatrixComputer, GapFinder
+from base.core.schedule_generator import generate_string_schedules
+
+WARM_UP_COHORT_SIZE = 30
+
+
+def build_shared_state():
+
+    """
+    Build the state that every worker reads, it must run before forking so
+    the workers share the pages instead of building their own copy
+    """
+
+    get_distance_table()
+
+
+def warm_up():
+
+    """
+    Run the distance, finder and analyze code once with generated schedules
+    so the first request doesn't pay for the lazy initialization, returns
+    the seconds it took
+    """
+
+    start = time.perf_counter()
+
+    build_shared_state()
+    string_schedules = generate_string_schedules(WARM_UP_COHORT_SIZE)
+
+    for compute_sd in (False, True):
+        distance_matrix_computer = DistanceMatrixComputer(
+            get_distance_matrices_from_string_schedules(string_schedules),
+            options={"compute_sd": compute_sd, "no_classes_day": True},
+        )
+        gap_finder = GapFinder(distance_matrix_computer, limit=5, days_to_filter=[0])
+        gap_finder.find_gaps()
+        gap_finder.get_results()
+
+    meeting_accumulator = MeetingAccumulator()
+    meeting_accumulator.add(string_schedules)
+    meeting_accumulator.get_meeting_data(string_schedules[0])
+
+    return time.perf_counter() - start
@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "find_your_gap_api.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "find_your_gap_api.settings.production")
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# the async versions of results, analyze and register (see base.asgi_handler)
+from base.asgi_handler import AsyncViewsASGIHandler  # noqa: E402
+
+application = AsyncViewsASGIHandler()
@@ -28,6 +28,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "base.timing.ServerTimingMiddleware",
 ]
 
 ROOT_URLCONF = "find_your_gap_api.urls"
@@ -79,6 +80,10 @@ STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": (
+        "base.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_THROTTLE_CLASSES": ("rest_framework.throttling.AnonRateThrottle",),
     "DEFAULT_THROTTLE_RATES": {
         "anon": "500/hour",
@@ -86,5 +91,83 @@ REST_FRAMEWORK = {
     },
 }
 
-# Make it env-var
-UNINORTE_SCHEDULE_API = "https://mihorario.herokuapp.com/api/v1/authentications"
+# .npy file shared by all workers with the distances of every possible day,
+# if it is not provided each process builds its own copy on first use
+DISTANCE_TABLE_PATH = config("DISTANCE_TABLE_PATH", default=None)
+
+# cache of the gaps of the groups, set it to None to disable it.
+# base.results_cache.DjangoResultsCacheBackend shares it between processes
+RESULTS_CACHE = {
+    "BACKEND": "base.results_cache.LRUResultsCacheBackend",
+    "OPTIONS": {"max_size": 512, "ttl": 300},
+}
+
+# in-process store of the schedules in front of the database, for example
+# {"max_size": 10_000}. It is disabled by default, see production.py. The
+# other processes only see a registration when "versions_cache" names a
+# cache shared by them (memcached, redis...), otherwise after the "ttl"
+SCHEDULE_STORE = None
+
+# time spent by each request in the main stages (resolve the users, compute
+# the gaps, render...) and in the database, sent in the Server-Timing
+# header. With SERVER_TIMING_LOG there is also a JSON log line per request
+SERVER_TIMING = config("SERVER_TIMING", cast=bool, default=False)
+SERVER_TIMING_LOG = config("SERVER_TIMING_LOG", cast=bool, default=False)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"base.timing": {"handlers": ["console"], "level": "INFO"}},
+}
+
+# groups accepted by a request of the batch results endpoint
+BATCH_RESULTS_MAX_GROUPS = 50
+
+# the file of usernames sent to analyze is read line by line and the
+# usernames are resolved in chunks, so big files do not need much memory
+ANALYZE_MAX_FILE_SIZE = config("ANALYZE_MAX_FILE_SIZE", cast=int, default=2_000_000)
+ANALYZE_USERNAMES_CHUNK_SIZE = 1_000
+
+# "database" counts the class hours of each hour with a single query when
+# the database is Postgres, "python" reads the schedules and counts them here
+ANALYZE_AGGREGATION_BACKEND = config("ANALYZE_AGGREGATION_BACKEND", default="database")
+
+# point it to the mock_upstream command to load test the registration
+UNINORTE_SCHEDULE_API = config(
+    "UNINORTE_SCHEDULE_API",
+    default="https://mihorario.herokuapp.com/api/v1/authentications",
+)
+
+# bounded thread pools of the async views (see base.asgi_handler), compute
+# runs the NumPy work and upstream waits for the university API
+ASYNC_VIEWS_WORKERS = {"compute": 4, "upstream": 32}
+
+# requests handled at the same time by each ASGI worker, each one holds a
+# sync thread until it is answered and the rest wait for a free one
+ASYNC_VIEWS_MAX_REQUESTS = config("ASYNC_VIEWS_MAX_REQUESTS", cast=int, default=64)
+
+# threads that run the registrations sent to /register/jobs, with 0 the
+# registration runs inside the request (used by the tests)
+REGISTRATION_JOBS_WORKERS = config("REGISTRATION_JOBS_WORKERS", cast=int, default=4)
+
+# each process refreshes its queued and running jobs every HEARTBEAT
+# seconds. A pending or running job without updates in STALE_AFTER seconds
+# is taken as lost (its process was restarted) and marked as failed, and the
+# finished jobs are kept TTL seconds. The del_unverified cron view cleans them
+REGISTRATION_JOBS_HEARTBEAT = 60
+REGISTRATION_JOBS_STALE_AFTER = 10 * 60
+REGISTRATION_JOBS_TTL = 24 * 60 * 60
+
+# timeouts in seconds, the circuit is opened after failure_threshold
+# consecutive failures and it is tried again after reset_timeout seconds.
+# Without pool_size the pool keeps a connection for each thread that can
+# call the upstream (see base.core.register_user.get_upstream_pool_size)
+UPSTREAM_CLIENT = {
+    "connect_timeout": 3.05,
+    "read_timeout": 10,
+    "max_retries": 2,
+    "backoff_factor": 0.3,
+    "failure_threshold": 5,
+    "reset_timeout": 30,
+}
@@ -9,9 +9,17 @@ DEBUG = False
 
 MIDDLEWARE.insert(2, "whitenoise.middleware.WhiteNoiseMiddleware")
 
-db_from_env = dj_database_url.config(conn_max_age=600)
+# each ASGI request has its own thread (see base.asgi_handler), persistent
+# connections would be left open by the threads
+db_from_env = dj_database_url.config(
+    conn_max_age=config("DATABASE_CONN_MAX_AGE", default=0, cast=int)
+)
 
 DATABASES = {"default": db_from_env}
 
 SCHEDULE_DATA_FUNCTION = "base.core.register_user.get_schedule_data_from_uni_api"
 DEL_UNVERIFIED_SECRET_CODE = config("DEL_UNVERIFIED_SECRET_CODE")
+
+# there is no cache shared by the gunicorn workers, so a registration
+# reaches the stores of the other workers when the entries expire
+SCHEDULE_STORE = {"max_size": 50_000, "ttl": 30}
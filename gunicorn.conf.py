@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration of the production server, run-prod.sh uses it
+
+The values can be changed with the GUNICORN_* environment variables
+"""
+
+import os
+
+
+def get_cpu_count():
+    # the CPUs this process can use, it may be less than the machine has
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+cpu_count = get_cpu_count()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8080")
+
+# run-prod.sh serves find_your_gap_api.asgi, the async views wait for the
+# university API on the event loop of each worker. The sync views of
+# find_your_gap_api.wsgi can still be served with GUNICORN_WORKER_CLASS=gthread
+workers = int(os.environ.get("GUNICORN_WORKERS", cpu_count * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+# only used by the gthread workers
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+
+# load Django, NumPy and base.core once in the master, the workers share
+# those pages copy-on-write
+preload_app = True
+
+# recycle the workers to bound the memory they can take
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = "-"
+
+
+def when_ready(server):
+    from base.warmup import build_shared_state
+
+    # built in the master before forking, so it is shared by all the workers
+    build_shared_state()
+
+
+def post_fork(server, worker):
+    from base.warmup import warm_up
+
+    elapsed_time = warm_up()
+    server.log.info(f"Worker {worker.pid} warmed up in {elapsed_time * 1000:.1f} ms")